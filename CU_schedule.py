@@ -1,17 +1,110 @@
 import requests
-from bs4 import BeautifulSoup
 import pymysql
 import datetime
 import calendar
 import schedule
 import time
 import logging
+import http_client
+import extract
+import event_store
+import crawl_metrics
+import checkpoint
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # 로그 설정 (로그 파일에 기록)
 logging.basicConfig(filename='/home/ubuntu/market/CU_schedule.log', 
-                    level=logging.DEBUG, 
+                    level=logging.INFO, 
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
+# idx 탐색 설정
+BASE_URL = "https://cu.bgfretail.com/brand_info/news_view.do?category=brand_info&depth2=5&idx="
+PROBE_WORKERS = 8      # 동시에 요청할 개수
+PROBE_WINDOW = 32      # 아직 확인 안 된 idx 중 앞서서 요청해 둘 범위
+MAX_GAP = 20           # 연속으로 이만큼 비어 있으면 더 이상 공지가 없다고 판단 (삭제된 공지 건너뛰기)
+FLUSH_EVERY = 50       # 새 공지를 이만큼 모을 때마다 DB 에 저장하고 checkpoint 기록
+MISSING_STATUS = {404, 410}  # 없는 공지로 보는 응답 코드 (그 밖의 200 이 아닌 응답은 일시 오류)
+# 마지막으로 공지를 찾은 idx 다음 값 (checkpoint 파일, 지우지 않음)
+# 이미 있는 공지(content_hash 중복)는 저장되지 않아 MAX(idx) 가 그대로이므로, 이 값이 없으면 매번 같은 범위를 다시 탐색함
+CHECKPOINT_NAME = "CU"
+
+# 공지 페이지 → (이벤트 제목, 이미지 URL), 유효하지 않으면 None
+def parse_notice(html):
+    notice = extract.extract_one(html, extract.CU_NEWS_VIEW)
+    if not notice["event_title"] or not notice["img_url"]:
+        return None
+    return notice["event_title"], notice["img_url"]
+
+# 요청이 실패해서 공지가 있는지 알 수 없는 idx (http_client 재시도 후에도 타임아웃 / 5xx / 429)
+FETCH_FAILED = object()
+
+# idx 하나 요청 → (이벤트 제목, 이미지 URL), 없는 공지면 None, 확인하지 못했으면 FETCH_FAILED
+def fetch_notice(idx):
+    try:
+        response = http_client.get(BASE_URL + str(idx))
+    except requests.RequestException as e:
+        logging.warning(f"idx {idx} 요청 실패: {e}")
+        return FETCH_FAILED
+    crawl_metrics.add_pages()
+    if response.status_code in MISSING_STATUS:
+        return None
+    if response.status_code != 200:
+        logging.warning(f"idx {idx} 응답 오류: HTTP {response.status_code}")
+        return FETCH_FAILED
+    return parse_notice(response.text)
+
+# start_idx 부터 앞쪽 idx 를 동시에 요청하면서 새 공지를 찾음
+# 결과는 idx 순서대로 확인해서 (idx, 제목, 이미지 URL) 을 하나씩 yield, 연속 max_gap 개가 비면 멈춤
+# 확인하지 못한 idx(FETCH_FAILED)를 만나면 그 앞에서 멈춤 → checkpoint 가 그 idx 를 넘지 않아 다음 실행에서 다시 확인
+# (찾은 공지를 쌓아 두지 않으므로 메모리는 window 크기만큼만 사용)
+def probe_new_notices(start_idx, workers=PROBE_WORKERS, window=PROBE_WINDOW, max_gap=MAX_GAP):
+    results = {}       # idx -> 결과 (순서대로 확인하기 전까지 보관)
+    pending = {}       # future -> idx
+    next_idx = start_idx  # 다음에 요청할 idx
+    check_idx = start_idx  # 다음에 확인할 idx
+    gap = 0
+    failed = False
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while gap < max_gap and not failed:
+            while next_idx < check_idx + window and len(pending) < window:
+                pending[executor.submit(crawl_metrics.propagate(fetch_notice), next_idx)] = next_idx
+                next_idx += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+
+            while check_idx in results and gap < max_gap:
+                notice = results.pop(check_idx)
+                if notice is FETCH_FAILED:
+                    failed = True
+                    break
+                if notice:
+                    gap = 0
+                    print(f"새로운 데이터 발견: idx {check_idx}, {notice[0]}, img_url: {notice[1]}")
+                    yield (check_idx, *notice)
+                else:
+                    gap += 1
+                check_idx += 1
+
+        for future in pending:
+            future.cancel()
+
+    if failed:
+        logging.warning(f"idx {check_idx} 를 확인하지 못해 탐색 중단 (다음 실행에서 다시 확인)")
+        print(f"idx {start_idx}~{check_idx - 1} 확인, idx {check_idx} 요청 실패로 탐색 중단")
+    else:
+        print(f"idx {start_idx}~{check_idx - 1} 확인, 연속 {max_gap}개가 비어 있어 탐색 종료")
+
+# 모은 공지를 DB 에 저장하고, 다음에 탐색을 시작할 idx 를 checkpoint 로 남김 (중복이라 저장 안 된 공지 포함)
+def flush_notices(conn, batch, next_idx):
+    saved = event_store.save_events(conn, batch)
+    crawl_metrics.add_items(len(saved))  # 중복이라 저장하지 않은 공지는 빼고 셈
+    checkpoint.save(CHECKPOINT_NAME, {"next_idx": next_idx})
+    print(f"{len(saved)}개의 새로운 데이터를 삽입했습니다. (다음 idx {next_idx})")
+    batch.clear()
+
 # 스크립트 실행 함수
 def run_script():
     # 1. DB 연결
@@ -23,9 +116,10 @@ def run_script():
         charset="utf8mb4"
     )
     cursor = conn.cursor()
+    event_store.check_schema(conn)  # 마이그레이션 전이면 탐색하기 전에 멈춤
 
     # 2. DB에서 가장 최근 idx 가져오기 (기본값 없이 사용)
-    cursor.execute("SELECT MAX(idx) FROM event_img")
+    cursor.execute("SELECT MAX(idx) FROM event_img WHERE store_type = 'CU'")  # 다른 편의점은 idx 에 자기 사이트 id 를 저장
     latest_idx = cursor.fetchone()[0]  # 가장 최근 idx (None일 수도 있음)
 
     # 데이터가 아예 없으면 크롤링 중지
@@ -35,73 +129,46 @@ def run_script():
 
     print(f"DB에서 가장 최근 idx: {latest_idx}")
 
-    # 3. 크롤링할 URL 설정
-    base_url = "https://cu.bgfretail.com/brand_info/news_view.do?category=brand_info&depth2=5&idx="
+    # 지난 실행에서 찾은 마지막 공지 다음부터 (중복 공지로 저장되지 않은 idx 까지 다시 보지 않도록)
+    start_idx = latest_idx + 1
+    state = checkpoint.load(CHECKPOINT_NAME)
+    if state and state.get("next_idx", 0) > start_idx:
+        start_idx = state["next_idx"]
+        print(f"♻️ checkpoint 에서 이어서 탐색: idx {start_idx}")
 
-    # 4. 오늘 날짜 및 해당 월의 마지막 날짜 계산
+    # 3. 오늘 날짜 및 해당 월의 마지막 날짜 계산
     today = datetime.date.today()
     start_date = today.strftime("%Y-%m-%d")
     last_day_of_month = calendar.monthrange(today.year, today.month)[1]
     end_date = today.replace(day=last_day_of_month).strftime("%Y-%m-%d")
 
-    # 5. 새로운 데이터 크롤링
-    new_data = []
-    idx = latest_idx + 1  # DB에 있는 가장 최신 idx의 다음 값부터 크롤링 시작
-
-    while True:
-        url = base_url + str(idx)
-        response = requests.get(url)
-
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # 이벤트 제목
-            event_tag = soup.find("thead").find("tr").find("th")
-            event_title = event_tag.get_text(strip=True) if event_tag else None
-
-            # 이미지 URL
-            img_tag = soup.select_one('td[colspan="2"] img[border="0"]')
-            img_url = img_tag["src"] if img_tag else None
-
-            # 편의점 종류 (CU로 고정)
-            store_type = "CU"
-
-            # 데이터가 유효한지 체크 (NULL 값일 경우 종료)
-            if not event_title or not img_url:
-                print("유효하지 않은 데이터 발견. 크롤링 중지.")
-                break
-
-            # 새로운 데이터 저장
-            new_data.append((idx, img_url, start_date, end_date, event_title, store_type))
-            print(f"새로운 데이터 추가: idx {idx}, {event_title}, img_url: {img_url}")
-
-        else:
-            print("더 이상 유효한 데이터를 찾을 수 없습니다.")
-            break
-
-        idx += 1  # 다음 idx로 이동
-
-    # 6. 새 데이터 DB 저장
-    if new_data:
-        insert_sql = """
-        INSERT INTO event_img (idx, img_url, start_date, end_date, event_title, store_type)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        cursor.executemany(insert_sql, new_data)
-        conn.commit()
-        print(f"{len(new_data)}개의 새로운 데이터를 삽입했습니다.")
-
-    # 7. 종료
+    # 4. 새로운 데이터 크롤링 (DB에 있는 가장 최신 idx의 다음 값부터, 중간에 빈 idx 가 있어도 계속 탐색)
+    # 5. FLUSH_EVERY 개마다 DB 저장 (이미 있는 제목 + 이미지는 content_hash 로 거름)
+    # 편의점 종류 (CU로 고정)
+    store_type = "CU"
+    batch = []
+    for idx, event_title, img_url in probe_new_notices(start_idx):
+        batch.append({"idx": idx, "img_url": img_url, "start_date": start_date, "end_date": end_date,
+                      "event_title": event_title, "store_type": store_type})
+        if len(batch) >= FLUSH_EVERY:
+            flush_notices(conn, batch, idx + 1)
+    if batch:
+        flush_notices(conn, batch, batch[-1]["idx"] + 1)
+    # checkpoint 는 끝까지 탐색해도 지우지 않음 (다음 실행도 이미 확인한 공지 다음부터)
+
+    # 6. 종료
     cursor.close()
     conn.close()
 
-# 매일 자정(00:00)에 실행되도록 설정
-schedule.every().day.at("13:22").do(run_script)
+# 단독 실행할 때만 자체 스케줄 루프 사용 (평소에는 scheduler.py 가 run_script 를 실행)
+if __name__ == "__main__":
+    # 매일 자정(00:00)에 실행되도록 설정
+    schedule.every().day.at("13:22").do(run_script)
 
-# 주기적으로 실행
-while True:
-    schedule.run_pending()  # 예약된 작업을 확인하고 실행
-    time.sleep(60)  # 1분마다 확인 (이렇게 해야 계속 실행될 수 있어)
+    # 주기적으로 실행
+    while True:
+        schedule.run_pending()  # 예약된 작업을 확인하고 실행
+        time.sleep(60)  # 1분마다 확인 (이렇게 해야 계속 실행될 수 있어)
 
 # # 스케줄링 없이 강제로 함수 실행
 # run_script()  # 여기를 강제로 호출하면 즉시 실행
@@ -1,29 +1,26 @@
 import schedule
 import time
+import re
 import pymysql
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 import logging
+import requests
+import http_client
+import extract
+import event_store
+import browser_pool
+import crawl_metrics
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 
 # 로그 설정 (로그 파일에 기록)
-logging.basicConfig(filename='/home/ubuntu/market/CU_schedule.log', 
-                    level=logging.DEBUG, 
+logging.basicConfig(filename='/home/ubuntu/market/GS25_schedule.log', 
+                    level=logging.INFO, 
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Chrome WebDriver 경로 설정
-CHROMEDRIVER_PATH = "/home/ubuntu/chromedriver-linux64/chromedriver"
-
-# Headless 옵션 설정
-chrome_options = Options()
-chrome_options.add_argument("--headless")  # GUI 없이 실행
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-chrome_options.add_argument("--disable-gpu")
-
-service = Service(CHROMEDRIVER_PATH)
-driver = webdriver.Chrome(service=service, options=chrome_options)  # Headless 모드 적용
+# 상세 페이지 동시 요청 수
+DETAIL_WORKERS = 4
 
 # MariaDB 연결 설정
 DB_CONFIG = {
@@ -40,58 +37,37 @@ base_url = "http://gs25.gsretail.com/gscvs/en/customer-engagement/event/current-
 def connect_db():
     return pymysql.connect(**DB_CONFIG)
 
-def is_event_exists(event_info):
-    """이미 저장된 이벤트인지 확인"""
-    conn = connect_db()
-    cursor = conn.cursor()
-    query = """
-    SELECT COUNT(*) FROM event_img 
-    WHERE img_url = %s AND start_date = %s AND end_date = %s 
-          AND event_title = %s AND store_type = %s
-    """
-    cursor.execute(query, (
-        event_info["이미지 주소"],
-        event_info["이벤트 시작 날짜"],
-        event_info["이벤트 끝 날짜"],
-        event_info["이벤트 제목"],
-        event_info["편의점"]
-    ))
-    count = cursor.fetchone()[0]
-    cursor.close()
-    conn.close()
-    return count > 0
-
-def save_to_db(event_info):
-    """데이터 저장"""
-    if is_event_exists(event_info):
-        print(f"⏭ 이미 존재하는 이벤트: {event_info['이벤트 제목']}, 저장 생략")
+def save_to_db(event_infos):
+    """데이터 저장 (이미 저장된 이벤트는 content_hash 로 한 번에 걸러냄)"""
+    crawl_metrics.add_items(len(event_infos))
+    if not event_infos:
+        print("⚠ 저장할 이벤트 없음")
         return
 
+    events = [{
+        "img_url": event_info["이미지 주소"],
+        "start_date": event_info["이벤트 시작 날짜"],
+        "end_date": event_info["이벤트 끝 날짜"],
+        "event_title": event_info["이벤트 제목"],
+        "store_type": event_info["편의점"],
+    } for event_info in event_infos]
+
     conn = connect_db()
-    cursor = conn.cursor()
-    insert_sql = """
-    INSERT INTO event_img (img_url, start_date, end_date, event_title, store_type, idx)
-    VALUES (%s, %s, %s, %s, %s, 0)
-    """
-    cursor.execute(insert_sql, (
-        event_info["이미지 주소"],
-        event_info["이벤트 시작 날짜"],
-        event_info["이벤트 끝 날짜"],
-        event_info["이벤트 제목"],
-        event_info["편의점"]
-    ))
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print(f"✅ 이벤트 저장 완료: {event_info['이벤트 제목']}")
-
-def scrape_event_page():
-    """이벤트 상세 페이지 크롤링"""
     try:
+        saved = event_store.save_events(conn, events)
+    finally:
+        conn.close()
+    for event in saved:
+        print(f"✅ 이벤트 저장 완료: {event['event_title']}")
+    print(f"⏭ 이미 존재하는 이벤트 {len(events) - len(saved)}개, 저장 생략")
+
+def scrape_event_page(driver):
+    """이벤트 상세 페이지 크롤링 (Selenium)"""
+    try:
+        image_url = browser_pool.wait_css(driver, ".event-web-contents img").get_attribute("src")
         title = driver.find_element(By.CSS_SELECTOR, ".tit_sect h3.tit strong").text
         start_date = driver.find_element(By.ID, "event-start-date").text
         end_date = driver.find_element(By.ID, "event-end-date").text
-        image_url = driver.find_element(By.CSS_SELECTOR, ".event-web-contents img").get_attribute("src")
 
         event_info = {
             "이벤트 제목": title,
@@ -100,54 +76,148 @@ def scrape_event_page():
             "이미지 주소": image_url,
             "편의점": "GS25"
         }
-
-        save_to_db(event_info)  # DB 저장
+        return event_info
     except Exception as e:
         print("Error scraping event page:", e)
+        return None
 
-def scrape_gs25_events():
-    """GS25 이벤트 첫 페이지 크롤링 (한 페이지만)"""
-    driver.get(base_url)
-    time.sleep(3)
-
-    event_list = driver.find_elements(By.CSS_SELECTOR, ".tblwrap tbody tr")
-    
-    if not event_list:
-        print("⚠ 이벤트 없음. 크롤링 종료")
-        return
-    
-    for i in range(len(event_list)):
-        try:
+def scrape_gs25_events_selenium(rows=None):
+    """목록에서 행을 클릭해 들어가는 Selenium 방식 (rows: 처리할 행 번호, None 이면 전체) → 이벤트 정보 리스트"""
+    event_infos = []
+    with browser_pool.lease() as driver:
+        with crawl_metrics.timed("fetch"):
             driver.get(base_url)
-            time.sleep(3)
-
-            event_list = driver.find_elements(By.CSS_SELECTOR, ".tblwrap tbody tr")
-
-            # 특정 행에 링크가 없으면 건너뛰기
-            event_links = event_list[i].find_elements(By.CSS_SELECTOR, "td.ft_lt a")  
-            if not event_links:
-                print(f"⚠ {i+1}번째 이벤트에 링크가 없음, 건너뜀")
-                continue  
+        try:
+            browser_pool.wait_css(driver, ".tblwrap tbody tr")
+        except TimeoutException:
+            print("⚠ 이벤트 없음. 크롤링 종료")
+            return event_infos
+
+        event_count = len(driver.find_elements(By.CSS_SELECTOR, ".tblwrap tbody tr"))
+        for i in (rows if rows is not None else range(event_count)):
+            try:
+                with crawl_metrics.timed("fetch"):
+                    driver.get(base_url)
+                browser_pool.wait_css(driver, ".tblwrap tbody tr")
+
+                event_list = driver.find_elements(By.CSS_SELECTOR, ".tblwrap tbody tr")
+
+                # 특정 행에 링크가 없으면 건너뛰기
+                event_links = event_list[i].find_elements(By.CSS_SELECTOR, "td.ft_lt a")
+                if not event_links:
+                    print(f"⚠ {i+1}번째 이벤트에 링크가 없음, 건너뜀")
+                    continue
+
+                event_links[0].click()  # 첫 번째 링크 클릭
+                browser_pool.wait_stale(driver, event_list[i])  # 상세 페이지로 넘어갈 때까지 대기
+
+                event_info = scrape_event_page(driver)  # 데이터 크롤링
+                crawl_metrics.add_pages()
+                if event_info:
+                    event_infos.append(event_info)
+
+            except Exception as e:
+                print(f"❌ Error processing event {i+1}: {e}")
+    return event_infos
+
+def detail_url(href):
+    """목록의 링크 → 상세 페이지 URL (javascript: 링크처럼 바로 열 수 없으면 None)"""
+    if not href or href.startswith(("javascript:", "#")):
+        return None
+    return urljoin(base_url, href)
+
+def list_dates(row_text):
+    """목록 행의 기간 (YYYY.MM.DD ~ YYYY.MM.DD) → (시작, 끝)"""
+    dates = re.findall(r"\d{4}[.-]\d{2}[.-]\d{2}", row_text or "")
+    return (dates[0], dates[1]) if len(dates) >= 2 else (None, None)
+
+def fetch_event(url, start_date, end_date):
+    """상세 페이지를 HTTP 로 받아 이벤트 정보 dict 반환 (파싱 실패 시 None)"""
+    try:
+        response = http_client.get(url)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"❌ 상세 페이지 요청 실패: {url} ({e})")
+        return None
+    crawl_metrics.add_pages()
+
+    detail = extract.extract_one(response.text, extract.GS25_EVENT_DETAIL)
+    start_date = detail["start_date"] or start_date
+    end_date = detail["end_date"] or end_date
+    if not detail["title"] or not detail["img_url"] or not start_date or not end_date:
+        return None
+
+    return {
+        "이벤트 제목": detail["title"],
+        "이벤트 시작 날짜": start_date,
+        "이벤트 끝 날짜": end_date,
+        "이미지 주소": urljoin(url, detail["img_url"]),
+        "편의점": "GS25"
+    }
 
-            event_link = event_links[0]  # 첫 번째 링크 클릭
-            event_link.click()
-            time.sleep(3)
+def scrape_gs25_events():
+    """GS25 이벤트 첫 페이지 크롤링 (한 페이지만)
 
-            scrape_event_page()  # 데이터 크롤링 및 저장
+    목록 페이지를 한 번 받아 상세 URL 과 기간을 뽑고, 상세 페이지는 HTTP 로 동시에 받는다.
+    HTML 만으로 파싱이 안 되는 행만 Selenium 으로 처리한다.
+    """
+    # 마이그레이션 전이면 크롤링하기 전에 멈춤
+    conn = connect_db()
+    try:
+        event_store.check_schema(conn)
+    finally:
+        conn.close()
 
-            driver.back()
-            time.sleep(3)
+    try:
+        response = http_client.get(base_url)
+        response.raise_for_status()
+        crawl_metrics.add_pages()
+        # (목록에서의 행 번호, 행) — 행 번호는 Selenium 으로 넘길 때 사용
+        rows = [(i, row) for i, row in enumerate(extract.extract_items(response.text, extract.GS25_EVENT_LIST))
+                if row["href"]]
+    except requests.RequestException as e:
+        print(f"❌ 목록 페이지 요청 실패: {e}")
+        rows = []
+
+    if not rows:
+        print("⚠ 목록을 HTML 로 읽지 못함. Selenium 으로 크롤링")
+        save_to_db(scrape_gs25_events_selenium())
+        print("✅ 크롤링 완료.")
+        return
 
-        except Exception as e:
-            print(f"❌ Error processing event {i+1}: {e}")
+    fallback_rows = []  # Selenium 으로 다시 처리할 행 번호
+    targets = []
+    for i, row in rows:
+        url = detail_url(row["href"])
+        if url:
+            targets.append((i, url, *list_dates(row["row_text"])))
+        else:
+            fallback_rows.append(i)
+
+    with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as executor:
+        results = list(executor.map(crawl_metrics.propagate(lambda target: fetch_event(*target[1:])), targets))
+
+    event_infos = []
+    for (i, url, _, _), event_info in zip(targets, results):
+        if event_info:
+            event_infos.append(event_info)
+        else:
+            fallback_rows.append(i)
+
+    if fallback_rows:
+        print(f"⚠ {len(fallback_rows)}개 이벤트는 Selenium 으로 처리")
+        event_infos.extend(scrape_gs25_events_selenium(sorted(fallback_rows)))
+
+    save_to_db(event_infos)  # DB 저장 (한 번에)
     print("✅ 크롤링 완료.")
 
 # 1️⃣ 강제 실행 (테스트용)
 # scrape_gs25_events()
 
-# # 2️⃣ 자동 실행 (매일 밤 12시)
-schedule.every().day.at("11:30").do(scrape_gs25_events)
+# # 2️⃣ 자동 실행 (매일 밤 12시) — 단독 실행할 때만 (평소에는 scheduler.py 가 실행)
+if __name__ == "__main__":
+    schedule.every().day.at("11:30").do(scrape_gs25_events)
 
-while True:
-    schedule.run_pending()
-    time.sleep(60)  # 1분마다 스케줄 확인
\ No newline at end of file
+    while True:
+        schedule.run_pending()
+        time.sleep(60)  # 1분마다 스케줄 확인
\ No newline at end of file
@@ -1,52 +1,147 @@
-from flask import Flask, jsonify, render_template, request
+import csv
+import io
+import json
+
+from flask import Flask, Response, jsonify, render_template, request, stream_with_context
 from routes import register_blueprints
-from db import get_db_connection
+from db import get_db_connection, get_pool_stats
+from metrics import init_metrics, render_prometheus
+from encoders import data_response, negotiate_format, UnsupportedFormat
+from sale_cache import cached_sale_response, cache_stats
+from sale_rollup import fetch_summary
+from sale_query import fetch_sale_page, iter_sale_rows, parse_columns, parse_filters, SaleQueryError
 
 app = Flask(__name__)
 
 register_blueprints(app)
+init_metrics(app)
 
 @app.route("/sale")
+@cached_sale_response
 def get_sale_data():
+    """all_sale 조회
+
+    파라미터 (모두 선택):
+      store_type  : 편의점 종류 (여러 개는 콤마로 구분, 예: CU,GS25)
+      start_date  : 조회 시작일 (YYYY-MM-DD, 포함)
+      end_date    : 조회 종료일 (YYYY-MM-DD, 포함)
+      columns     : 반환할 컬럼 (콤마로 구분, 기본값: 전체)
+      limit       : 페이지 크기 (기본 1000, 최대 10000)
+      cursor      : 이전 응답의 next_cursor (다음 페이지 조회)
+      format      : json | columnar | msgpack | arrow (없으면 Accept 헤더로 결정)
+
+    all_sale 이 바뀌지 않았으면 캐시된 응답을 주고, If-None-Match 요청에는 304 로 응답한다.
+    """
     conn = get_db_connection()
     if conn:
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT * FROM all_sale;")
-                sale_data = cursor.fetchall()
-
-                # 데이터 형식 변경 (기존 값은 그대로 반환)
-                sale_list = []
-                for row in sale_data:
-                    sale_list.append({
-                        "id_sale": row[0],
-                        "sale_date": row[1],
-                        "store_count": row[2],
-                        "sum_amount": row[3],
-                        "store_type": row[4],
-                        "man10": row[5],
-                        "man20": row[6],
-                        "man30": row[7],
-                        "man40": row[8],
-                        "man50": row[9],
-                        "man60": row[10],
-                        "woman10": row[11],
-                        "woman20": row[12],
-                        "woman30": row[13],
-                        "woman40": row[14],
-                        "woman50": row[15],
-                        "woman60": row[16],
-                        "day": row[17],
-                        "kind_day": row[18]
-                    })
-                
-                return jsonify({"status": "success", "sale_data": sale_list})
+            fmt = negotiate_format()
+            columns, rows, next_cursor = fetch_sale_page(conn, request.args)
+            meta = {"status": "success", "next_cursor": next_cursor}
+            return data_response(fmt, meta, "sale_data", columns, rows)
+        except UnsupportedFormat as e:
+            return jsonify({"status": "error", "message": str(e)}), 406
+        except SaleQueryError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
         except Exception as e:
-            return jsonify({"status": "error", "message": str(e)})
+            # 오류 응답이 캐시되지 않도록 200 이 아닌 상태 코드로 반환
+            return jsonify({"status": "error", "message": str(e)}), 500
         finally:
             conn.close()
     else:
-        return jsonify({"status": "error", "message": "Database connection failed"})
+        return jsonify({"status": "error", "message": "Database connection failed"}), 503
+
+
+@app.route("/sale/summary")
+@cached_sale_response
+def get_sale_summary():
+    """일/주/월 단위 편의점별 매출 · 성별/연령별 합계 (sale_rollup 집계 테이블에서 조회)
+
+    파라미터: period (day | week | month, 기본 week), store_type, start_date, end_date, columns, format
+    """
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({"status": "error", "message": "Database connection failed"}), 503
+    try:
+        # 집계는 scheduler.py 의 rollup 작업이 갱신하고, 여기서는 읽기만 함
+        fmt = negotiate_format()
+        columns, rows = fetch_summary(conn, request.args)
+        meta = {"status": "success", "period": request.args.get("period", "week")}
+        return data_response(fmt, meta, "summary", columns, rows)
+    except UnsupportedFormat as e:
+        return jsonify({"status": "error", "message": str(e)}), 406
+    except SaleQueryError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+    finally:
+        conn.close()
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export_lines(fmt, columns, batches):
+    """행 묶음을 NDJSON / CSV 텍스트 덩어리로 변환"""
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(columns)
+        yield buf.getvalue()
+        for rows in batches:
+            buf.seek(0)
+            buf.truncate()
+            writer.writerows(rows)
+            yield buf.getvalue()
+    else:
+        for rows in batches:
+            yield "".join(
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + "\n"
+                for row in rows
+            )
+
+
+@app.route("/sale/export")
+def export_sale_data():
+    """all_sale 전체(또는 필터 결과)를 NDJSON / CSV 로 스트리밍
+
+    파라미터: format (ndjson | csv, 기본 ndjson), store_type, start_date, end_date, columns
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"status": "error", "message": f"지원하지 않는 format 입니다: {fmt}"}), 400
+    try:
+        columns = parse_columns(request.args.get("columns"))
+        filters = parse_filters(request.args)
+    except SaleQueryError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    # 스트리밍을 시작하면 상태 코드를 바꿀 수 없으므로 연결 실패는 미리 503 으로 응답
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({"status": "error", "message": "Database connection failed"}), 503
+
+    def generate():
+        finished = False
+        try:
+            yield from _export_lines(fmt, columns, iter_sale_rows(conn, columns, filters))
+            finished = True
+        finally:
+            # 클라이언트가 중간에 끊으면 읽다 만 결과가 남은 커넥션은 재사용하지 않음
+            if finished:
+                conn.close()
+            else:
+                conn.invalidate()
+
+    filename = f"all_sale.{fmt}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 
 @app.route("/test-db")
@@ -65,5 +160,13 @@ def test_db():
     else:
         return jsonify({"status": "error", "message": "Database connection failed"})
 
+@app.route("/db-pool")
+def db_pool_stats():
+    return jsonify({"status": "success", "pool": get_pool_stats(), "sale_cache": cache_stats()})
+
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=5000)
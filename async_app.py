@@ -0,0 +1,121 @@
+# 비동기(ASGI) 서빙 모드
+#
+# app.py 와 같은 API(/sale, /test-db, /api/user/*)를 Quart + aiomysql 풀로 제공한다.
+# DB 를 기다리는 동안 워커 스레드를 붙잡지 않는다. 동기 모드와의 처리량 차이는 아직 측정하지 않았다
+# (benchmarks/async_bench.py 를 로컬 DB 에 돌려서 확인).
+#
+# 실행: hypercorn async_app:app --bind 0.0.0.0:5000
+import aiomysql
+from quart import Quart, Response, jsonify, render_template, request
+
+from db import DB_CONFIG, POOL_CONFIG
+from encoders import encode_rows, negotiate_format, UnsupportedFormat
+from sale_query import finish_page, prepare_page_query, SaleQueryError
+
+app = Quart(__name__)
+
+# 비동기 풀은 스레드가 아니라 코루틴이 나눠 쓴다
+ASYNC_POOL_SIZE = POOL_CONFIG["max_size"] * 2
+
+
+@app.before_serving
+async def create_pool():
+    app.pool = await aiomysql.create_pool(
+        host=DB_CONFIG["host"],
+        port=DB_CONFIG["port"],
+        user=DB_CONFIG["user"],
+        password=DB_CONFIG["password"],
+        db=DB_CONFIG["database"],
+        charset=DB_CONFIG["charset"],
+        minsize=0,
+        maxsize=ASYNC_POOL_SIZE,
+        pool_recycle=POOL_CONFIG["max_lifetime"],
+        # 조회 핸들러는 commit / rollback 을 하지 않음. 트랜잭션이 열린 채 반납된 커넥션은
+        # aiomysql 이 닫아 버리므로 (매 요청 새 연결) 조회는 autocommit 으로 실행
+        autocommit=True,
+    )
+
+
+@app.after_serving
+async def close_pool():
+    app.pool.close()
+    await app.pool.wait_closed()
+
+
+@app.route("/")
+async def home():
+    return await render_template("index.html")
+
+
+@app.route("/save-user")
+async def save_user():
+    return await render_template("save-user.html")
+
+
+@app.route("/sale")
+async def get_sale_data():
+    try:
+        fmt = negotiate_format(request)
+        columns, sql, params, limit = prepare_page_query(request.args)
+    except UnsupportedFormat as e:
+        return jsonify({"status": "error", "message": str(e)}), 406
+    except SaleQueryError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    try:
+        async with app.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(sql, params)
+                rows = await cursor.fetchall()
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    rows, next_cursor = finish_page(columns, rows, limit)
+    body, mimetype = encode_rows(fmt, {"status": "success", "next_cursor": next_cursor}, "sale_data", columns, rows)
+    return Response(body, mimetype=mimetype)
+
+
+@app.route("/test-db")
+async def test_db():
+    try:
+        async with app.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SHOW TABLES;")
+                tables = await cursor.fetchall()
+        return jsonify({"status": "success", "tables": tables})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)})
+
+
+#회원 추가
+@app.route("/api/user/add-user", methods=["POST"])
+async def add_user():
+    data = await request.get_json()
+
+    query = """
+      INSERT INTO user
+      (id,pw,nick,type,address,created_date)
+      VALUES
+      (%s,md5(%s),%s,%s,%s,sysdate())
+    """
+    async with app.pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            await cursor.execute(query, (data.get('id'), data.get('pw'), data.get('nick'),
+                                         data.get('type'), data.get('addr')))
+        await conn.commit()
+
+    return jsonify({"message": "ok"})
+
+
+#회원 조회
+@app.route("/api/user/detail-user")
+async def detail_user():
+    user_idx = request.args.get('user_idx')
+    try:
+        async with app.pool.acquire() as conn:
+            async with conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute("SELECT * FROM user WHERE user_idx=%s", (user_idx,))
+                user = await cursor.fetchone()
+        return jsonify(user)
+    except Exception as e:
+        return jsonify({"error": str(e)})
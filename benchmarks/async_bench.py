@@ -0,0 +1,59 @@
+# 동기(app.py) vs 비동기(async_app.py) 서빙 모드 처리량 비교
+#
+# 로컬 MySQL 호환 DB 를 DB_* 환경변수로 지정해서 실행:
+#   DB_HOST=127.0.0.1 DB_PORT=3307 DB_NAME=bench python benchmarks/async_bench.py --seed
+import argparse
+import json
+import sys
+
+from common import async_server_cmd, run_load, start_server, stop_server, summarize, sync_server_cmd
+from seed import UnsafeSeedTarget, check_target, seed
+
+PATHS = ["/sale?limit=100", "/test-db", "/api/user/detail-user?user_idx=1"]
+
+
+def bench_server(name, cmd, port, concurrency_levels, total):
+    proc = start_server(cmd, port)
+    results = []
+    try:
+        for path in PATHS:
+            url = f"http://127.0.0.1:{port}{path}"
+            run_load(lambda i: ("GET", url, None), 8, 50)  # 워밍업
+            for concurrency in concurrency_levels:
+                stats = summarize(*run_load(lambda i: ("GET", url, None), concurrency, total))
+                results.append({"server": name, "path": path, "concurrency": concurrency, **stats})
+                print(f"{name:5} {path:40} c={concurrency:<4} {stats['rps']:>8} rps  p99 {stats['p99_ms']} ms")
+    finally:
+        stop_server(proc)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동기 / 비동기 서빙 모드 벤치마크")
+    parser.add_argument("--seed", action="store_true", help="실행 전에 가짜 데이터 생성")
+    parser.add_argument("--sale-rows", type=int, default=30000)
+    parser.add_argument("--concurrency", default="16,64,256")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    # --seed 여부와 관계없이 운영 DB 를 대상으로 부하를 주지 않음
+    try:
+        check_target()
+    except UnsafeSeedTarget as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.seed:
+        seed(args.sale_rows, 1000)
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    results = bench_server("sync", sync_server_cmd(5101), 5101, levels, args.requests)
+    results += bench_server("async", async_server_cmd(5102), 5102, levels, args.requests)
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
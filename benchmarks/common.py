@@ -0,0 +1,107 @@
+# 벤치마크 공용 함수: 서버 실행, 부하 발생, 지연 시간 통계
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def start_server(cmd, port, env=None, timeout=30):
+    """서버 프로세스를 띄우고 포트가 열릴 때까지 기다림"""
+    proc = subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, **(env or {})},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버가 시작하지 못했습니다: {' '.join(cmd)}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{timeout}초 안에 {port} 포트가 열리지 않았습니다.")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def sync_server_cmd(port):
+    """app.py (Flask, 스레드 모드)"""
+    return [sys.executable, "-c",
+            f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True)"]
+
+
+def async_server_cmd(port):
+    """async_app.py (Quart, ASGI)"""
+    return [sys.executable, "-m", "hypercorn", "async_app:app", "--bind", f"127.0.0.1:{port}"]
+
+
+async def _worker(session, make_request, queue, latencies, errors):
+    while True:
+        try:
+            i = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        method, url, body = make_request(i)
+        start = time.perf_counter()
+        try:
+            async with session.request(method, url, json=body) as resp:
+                await resp.read()
+                if resp.status >= 400:
+                    errors.append(resp.status)
+                    continue
+        except aiohttp.ClientError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def _run_load(make_request, concurrency, total):
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    latencies, errors = [], []
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(_worker(session, make_request, queue, latencies, errors)
+                               for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def run_load(make_request, concurrency, total):
+    """make_request(i) -> (method, url, json_body) 로 total 개 요청을 concurrency 동시성으로 보냄"""
+    return asyncio.run(_run_load(make_request, concurrency, total))
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    k = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    ms = lambda v: round(v * 1000, 2) if v is not None else None  # noqa: E731
+    return {
+        "requests": len(values) + len(errors),
+        "errors": len(errors),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(values) / elapsed, 1) if elapsed else 0,
+        "p50_ms": ms(percentile(values, 50)),
+        "p95_ms": ms(percentile(values, 95)),
+        "p99_ms": ms(percentile(values, 99)),
+    }
@@ -0,0 +1,112 @@
+# 웹 API 부하 테스트
+#
+# 로컬 MySQL 호환 DB 에 가짜 데이터를 채우고 앱을 띄운 뒤, 주요 엔드포인트를 동시성 단계별로 호출해서
+# p50 / p95 / p99 지연 시간과 RPS 를 JSON 으로 남긴다. 커밋별 결과 파일을 비교해서 성능 회귀를 확인한다.
+#
+#   DB_HOST=127.0.0.1 DB_PORT=3307 DB_NAME=bench \
+#     python benchmarks/load_test.py --seed --sale-rows 100000 --user-rows 5000 --output bench_output.json
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+
+from common import ROOT, async_server_cmd, run_load, start_server, stop_server, summarize, sync_server_cmd
+from seed import UnsafeSeedTarget, check_target, seed
+
+
+def scenarios(base_url, user_rows):
+    """시나리오 이름 → make_request(i) 함수"""
+    rnd = random.Random(7)
+    run_id = uuid.uuid4().hex[:8]
+
+    def get(path):
+        return lambda i: ("GET", base_url + path, None)
+
+    def detail_user(i):
+        return ("GET", f"{base_url}/api/user/detail-user?user_idx={rnd.randint(1, max(user_rows, 1))}", None)
+
+    def add_user(i):
+        body = {"id": f"load-{run_id}-{i}", "pw": "pw", "nick": f"부하{i}", "type": "백엔드", "addr": "서울"}
+        return ("POST", f"{base_url}/api/user/add-user", body)
+
+    return {
+        "sale_page": get("/sale?limit=100"),
+        "sale_store_90d": get("/sale?store_type=CU&start_date=2020-01-01&end_date=2020-03-31&limit=1000"),
+        "detail_user": detail_user,
+        "add_user": add_user,
+        "home": get("/"),
+        "save_user_page": get("/save-user"),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="웹 API 부하 테스트")
+    parser.add_argument("--seed", action="store_true", help="실행 전에 가짜 데이터 생성 (기존 데이터 삭제)")
+    parser.add_argument("--sale-rows", type=int, default=30000)
+    parser.add_argument("--user-rows", type=int, default=1000)
+    parser.add_argument("--server", choices=["sync", "async"], default="sync")
+    parser.add_argument("--port", type=int, default=5100)
+    parser.add_argument("--concurrency", default="1,16,64")
+    parser.add_argument("--requests", type=int, default=1000, help="시나리오 · 동시성 단계별 요청 수")
+    parser.add_argument("--only", help="실행할 시나리오 (콤마로 구분)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    # 부하 시나리오도 DB 에 쓰기를 하므로 --seed 여부와 관계없이 운영 DB 로는 띄우지 않음
+    try:
+        check_target()
+    except UnsafeSeedTarget as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.seed:
+        seed(args.sale_rows, args.user_rows)
+
+    cmd = sync_server_cmd(args.port) if args.server == "sync" else async_server_cmd(args.port)
+    levels = [int(c) for c in args.concurrency.split(",")]
+    selected = args.only.split(",") if args.only else None
+
+    report = {
+        "commit": git_commit(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "server": args.server,
+        "sale_rows": args.sale_rows,
+        "user_rows": args.user_rows,
+        "requests_per_level": args.requests,
+        "results": [],
+    }
+
+    proc = start_server(cmd, args.port)
+    try:
+        for name, make_request in scenarios(f"http://127.0.0.1:{args.port}", args.user_rows).items():
+            if selected and name not in selected:
+                continue
+            run_load(make_request, 4, 20)  # 워밍업 (커넥션 풀, 템플릿 캐시)
+            for concurrency in levels:
+                stats = summarize(*run_load(make_request, concurrency, args.requests))
+                report["results"].append({"scenario": name, "concurrency": concurrency, **stats})
+                print(f"{name:16} c={concurrency:<4} {stats['rps']:>8} rps  "
+                      f"p50 {stats['p50_ms']} / p95 {stats['p95_ms']} / p99 {stats['p99_ms']} ms  "
+                      f"errors {stats['errors']}")
+    finally:
+        stop_server(proc)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ 결과 저장: {args.output}")
+    else:
+        print(output)
@@ -0,0 +1,142 @@
+# 벤치마크용 로컬 DB 에 all_sale / user 가짜 데이터를 채움
+#
+# 운영 DB 가 아니라 로컬 MySQL 호환 DB(MySQL / MariaDB 컨테이너 등)에 연결해서 써야 한다.
+# 기존 데이터를 TRUNCATE 하므로 DB_NAME 을 직접 지정하지 않았거나 운영 DB(crawling)면 실행을 거부한다.
+#   DB_HOST=127.0.0.1 DB_PORT=3307 DB_NAME=bench python benchmarks/seed.py --sale-rows 100000
+import argparse
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from db import get_db_connection  # noqa: E402
+
+# 가짜 데이터를 넣으면 안 되는 DB 이름 (db.DB_CONFIG 의 기본값 = 운영 DB)
+PROTECTED_DATABASES = {"crawling"}
+
+STORE_TYPES = ["CU", "GS25", "seven"]
+AGE_COLUMNS = ["man10", "man20", "man30", "man40", "man50", "man60",
+               "woman10", "woman20", "woman30", "woman40", "woman50", "woman60"]
+
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS all_sale (
+        id_sale INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        sale_date DATE NOT NULL,
+        store_count INT,
+        sum_amount BIGINT,
+        store_type VARCHAR(20),
+    """ + "".join(f"        {c} BIGINT,\n" for c in AGE_COLUMNS) + """
+        day VARCHAR(10),
+        kind_day VARCHAR(10),
+        sum_amount_growth DOUBLE,
+        avg_sum_amount_growth DOUBLE,
+        growth_deviation DOUBLE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user (
+        user_idx INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        id VARCHAR(50),
+        pw VARCHAR(64),
+        nick VARCHAR(50),
+        type VARCHAR(20),
+        address VARCHAR(200),
+        created_date DATETIME
+    )
+    """,
+]
+
+DAY_NAMES = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def sale_rows(count, start=date(2020, 1, 1)):
+    rnd = random.Random(42)
+    for i in range(count):
+        day = start + timedelta(days=i // len(STORE_TYPES))
+        ages = [rnd.randint(1_000_000, 50_000_000) for _ in AGE_COLUMNS]
+        yield (day, rnd.randint(4000, 18000), sum(ages), STORE_TYPES[i % len(STORE_TYPES)], *ages,
+               DAY_NAMES[day.weekday()], "주말" if day.weekday() >= 5 else "평일",
+               rnd.uniform(-3, 3), rnd.uniform(-2, 2), rnd.uniform(-2, 2))
+
+
+def user_rows(count):
+    for i in range(count):
+        yield (f"bench{i}", f"pw{i}", f"닉네임{i}", "백엔드", f"서울시 {i}번지")
+
+
+def insert_chunks(conn, sql, rows, chunk_size=5000):
+    chunk = []
+    total = 0
+    with conn.cursor() as cursor:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                cursor.executemany(sql, chunk)
+                conn.commit()
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            cursor.executemany(sql, chunk)
+            conn.commit()
+            total += len(chunk)
+    return total
+
+
+class UnsafeSeedTarget(RuntimeError):
+    """운영 DB 에 가짜 데이터를 넣거나 부하 테스트를 하려고 함"""
+
+
+def check_target():
+    """DB_NAME 을 직접 지정했고 운영 DB 가 아닐 때만 통과 → DB 이름"""
+    name = os.environ.get("DB_NAME")
+    if not name:
+        raise UnsafeSeedTarget("DB_NAME 환경변수로 벤치마크용 DB 를 지정해야 합니다. (기본값은 운영 DB)")
+    if name in PROTECTED_DATABASES:
+        raise UnsafeSeedTarget(f"운영 DB({name})에는 가짜 데이터를 넣을 수 없습니다.")
+    return name
+
+
+def seed(sale_count, user_count, reset=True):
+    check_target()  # load_test.py / async_bench.py 는 --seed 가 없어도 시작할 때 따로 확인
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("DB 연결 실패")
+    try:
+        with conn.cursor() as cursor:
+            for sql in CREATE_TABLES:
+                cursor.execute(sql)
+            if reset:
+                cursor.execute("TRUNCATE TABLE all_sale")
+                cursor.execute("TRUNCATE TABLE user")
+        conn.commit()
+
+        columns = ["sale_date", "store_count", "sum_amount", "store_type"] + AGE_COLUMNS + \
+                  ["day", "kind_day", "sum_amount_growth", "avg_sum_amount_growth", "growth_deviation"]
+        sale_sql = (f"INSERT INTO all_sale ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(['%s'] * len(columns))})")
+        user_sql = ("INSERT INTO user (id, pw, nick, type, address, created_date) "
+                    "VALUES (%s, md5(%s), %s, %s, %s, sysdate())")
+
+        inserted_sales = insert_chunks(conn, sale_sql, sale_rows(sale_count))
+        inserted_users = insert_chunks(conn, user_sql, user_rows(user_count))
+        return inserted_sales, inserted_users
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 가짜 데이터 생성")
+    parser.add_argument("--sale-rows", type=int, default=30000)
+    parser.add_argument("--user-rows", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="기존 데이터를 지우지 않고 추가")
+    args = parser.parse_args()
+
+    try:
+        sales, users = seed(args.sale_rows, args.user_rows, reset=not args.keep)
+    except UnsafeSeedTarget as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ all_sale {sales}행, user {users}행 생성 완료")
@@ -0,0 +1,205 @@
+# 크롤러 공용 headless Chrome 풀
+#
+# - lease() 로 처음 빌릴 때 드라이버를 띄우고, 반납한 드라이버는 풀에 남겨 재사용 (매번 Chrome 을 새로 띄우지 않음)
+#   필요하면 warm() 으로 미리 띄워 둘 수도 있음
+# - page_load_strategy = eager : DOMContentLoaded 까지만 기다림
+# - 이미지 / 폰트 / CSS 요청은 막음 (크롤링에는 DOM 만 필요)
+# - 고정 sleep 대신 wait_css / wait_ready 같은 조건 대기 사용
+# - 드라이버 하나에서 탭 여러 개를 동시에 로딩 (open_tabs)
+#
+#   with browser_pool.lease() as driver:
+#       driver.get(url)
+#       browser_pool.wait_css(driver, "#listUl li a")
+#
+# 조건 대기에 걸린 시간은 crawl_metrics 에 wait 시간으로 기록한다.
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+import crawl_metrics
+
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "/home/ubuntu/chromedriver-linux64/chromedriver")
+# 풀에 둘 드라이버 수 / 조건 대기 최대 시간(초)
+POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 2))
+WAIT_TIMEOUT = 10
+
+# 로딩하지 않을 리소스
+BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+                "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.css"]
+
+
+def _options():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")  # GUI 없이 실행
+    options.add_argument("--disable-gpu")  # GPU 사용 안 함 (Linux 서버에서 필수)
+    options.add_argument("--no-sandbox")  # 보안 모드 비활성화 (일부 환경에서 필요)
+    options.add_argument("--disable-dev-shm-usage")  # /dev/shm 파티션 문제 해결
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+    })
+    return options
+
+
+def block_resources(driver):
+    """현재 탭에서 이미지 / 폰트 / CSS 요청을 막음 (CDP 설정은 탭마다 따로 해야 함)"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+
+
+def _launch():
+    driver = webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=_options())
+    block_resources(driver)
+    return driver
+
+
+def _alive(driver):
+    try:
+        driver.current_window_handle
+        return True
+    except WebDriverException:
+        return False
+
+
+class BrowserPool:
+    """headless Chrome 드라이버 풀 (스레드 안전)"""
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._all = []
+
+    def warm(self, count=None):
+        """드라이버를 미리 띄워 둠 (기본: 풀 크기만큼)"""
+        with self._lock:
+            missing = min(count or self.size, self.size) - len(self._all)
+        for _ in range(max(missing, 0)):
+            driver = _launch()
+            with self._lock:
+                self._all.append(driver)
+            self._idle.put(driver)
+
+    def _checkout(self):
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = None
+        if driver is not None and not _alive(driver):
+            self._discard(driver)
+            driver = None
+        if driver is None:
+            driver = _launch()
+            with self._lock:
+                self._all.append(driver)
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def _reset(self, driver):
+        """다음 사용자를 위해 탭을 하나만 남기고 빈 페이지로 돌림"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+
+    def _release(self, driver):
+        try:
+            self._reset(driver)
+        except WebDriverException:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def lease(self):
+        """드라이버를 빌림. 반납할 때 탭을 정리하고, 드라이버가 죽었으면 버림"""
+        self._slots.acquire()
+        try:
+            driver = self._checkout()
+            try:
+                yield driver
+            finally:
+                self._release(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            drivers, self._all = self._all, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        self._idle = queue.LifoQueue()
+
+
+pool = BrowserPool()
+atexit.register(pool.close)
+
+
+def lease():
+    return pool.lease()
+
+
+def wait_for(driver, condition, timeout=WAIT_TIMEOUT):
+    with crawl_metrics.timed("wait"):
+        return WebDriverWait(driver, timeout).until(condition)
+
+
+def wait_ready(driver, timeout=WAIT_TIMEOUT):
+    """DOM 을 쓸 수 있을 때까지 대기 (eager 로딩 기준)"""
+    wait_for(driver, lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"), timeout)
+
+
+def wait_css(driver, selector, timeout=WAIT_TIMEOUT):
+    """selector 요소가 생길 때까지 대기 → 요소"""
+    return wait_for(driver, EC.presence_of_element_located((By.CSS_SELECTOR, selector)), timeout)
+
+
+def wait_stale(driver, element, timeout=WAIT_TIMEOUT):
+    """페이지가 바뀌어서 element 가 문서에서 사라질 때까지 대기"""
+    wait_for(driver, EC.staleness_of(element), timeout)
+
+
+def open_tabs(driver, urls):
+    """urls 를 각각 새 탭에서 로딩 시작 (기다리지 않음) → 탭 핸들 리스트
+
+    탭을 switch_to.window 로 옮긴 뒤 wait_css 등으로 필요한 요소를 기다려서 사용한다.
+    """
+    handles = []
+    for url in urls:
+        driver.switch_to.new_window("tab")
+        block_resources(driver)
+        driver.execute_script("window.location.href = arguments[0];", url)
+        handles.append(driver.current_window_handle)
+    return handles
+
+
+def close_tabs(driver, handles, back_to):
+    """handles 탭을 닫고 back_to 탭으로 돌아감"""
+    for handle in handles:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(back_to)
@@ -0,0 +1,94 @@
+# 정적 파일 빌드: 내용 해시를 붙인 파일명 + gzip / brotli 압축본 생성
+#
+# 실행: python build_assets.py
+# 결과: static/dist/ 아래에 css/style.<해시>.css, .gz, .br 파일과 manifest.json
+# 템플릿에서는 {{ asset_url('css/style.css') }} 로 해시가 붙은 주소를 씀 (routes/asset_route.py)
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+
+try:
+    import brotli
+except ImportError:  # brotli 가 없으면 gzip 압축본만 만듦
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+# 빌드할 파일 확장자
+ASSET_EXTENSIONS = (".css", ".js")
+
+
+def find_assets():
+    for root, dirs, files in os.walk(STATIC_DIR):
+        if os.path.abspath(root).startswith(DIST_DIR):
+            continue
+        for name in sorted(files):
+            if name.endswith(ASSET_EXTENSIONS):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+
+
+CSS_URL = re.compile(rb"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+
+
+def rewrite_css_urls(content, rel_path):
+    """빌드된 CSS 는 /assets 아래로 옮겨지므로 url(../font/..) 같은 상대 경로를 /static 기준 절대 경로로 바꿈"""
+    base = posixpath.dirname(rel_path)
+
+    def replace(match):
+        quote, url = match.group(1), match.group(2).decode()
+        if url.startswith(("/", "data:", "http:", "https:", "#")):
+            return match.group(0)
+        absolute = "/static/" + posixpath.normpath(posixpath.join(base, url))
+        return b"url(" + quote + absolute.encode() + quote + b")"
+
+    return CSS_URL.sub(replace, content)
+
+
+def build_asset(rel_path):
+    with open(os.path.join(STATIC_DIR, rel_path), "rb") as f:
+        content = f.read()
+    if rel_path.endswith(".css"):
+        content = rewrite_css_urls(content, rel_path)
+
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    base, ext = os.path.splitext(rel_path)
+    hashed = f"{base}.{digest}{ext}"
+    target = os.path.join(DIST_DIR, hashed)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    with open(target, "wb") as f:
+        f.write(content)
+    # mtime=0: 같은 내용이면 압축 결과도 항상 같게
+    with open(target + ".gz", "wb") as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(target + ".br", "wb") as f:
+            f.write(brotli.compress(content, quality=11))
+
+    return hashed
+
+
+def build():
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+
+    manifest = {rel_path: build_asset(rel_path) for rel_path in find_assets()}
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    manifest = build()
+    for source, hashed in manifest.items():
+        print(f"✅ {source} → dist/{hashed}")
+    if brotli is None:
+        print("⚠️ brotli 가 설치되어 있지 않아 .br 파일은 만들지 않았습니다.")
@@ -0,0 +1,59 @@
+# 크롤러 재시작 지점(checkpoint) 저장
+#
+# 긴 크롤링이 중간에 죽어도 이미 DB 에 넣은 부분부터 이어서 할 수 있도록
+# 크롤러가 batch 를 DB 에 commit 할 때마다 다음에 시작할 위치를 JSON 파일로 남긴다.
+#   - 임시 파일에 쓰고 fsync 한 뒤 os.replace → 파일은 항상 이전 값 또는 새 값 중 하나 (반쯤 쓰인 파일 없음)
+#   - 크롤링이 끝까지 가면 clear() 로 지움
+#
+#   state = checkpoint.load("plus_CU")      # 없으면 None
+#   checkpoint.save("plus_CU", {"next_page": 81, ...})
+#   checkpoint.clear("plus_CU")
+import json
+import logging
+import os
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CHECKPOINT_DIR = os.environ.get("CRAWL_CHECKPOINT_DIR", os.path.join(ROOT, "checkpoints"))
+
+log = logging.getLogger("crawl.checkpoint")
+
+
+def _path(name):
+    return os.path.join(CHECKPOINT_DIR, f"{name}.json")
+
+
+def load(name):
+    """저장된 상태 dict (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(_path(name), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        log.warning("checkpoint %s 를 읽지 못해 처음부터 실행: %s", name, e)
+        return None
+
+
+def save(name, state):
+    """state 를 원자적으로 저장 (fsync 후 rename, 디렉터리도 fsync)"""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = _path(name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**state, "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    dir_fd = os.open(CHECKPOINT_DIR, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def clear(name):
+    try:
+        os.remove(_path(name))
+    except FileNotFoundError:
+        pass
@@ -1,8 +1,8 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 
 url = "https://pyony.com/brands/cu/202412/?event_type=&category=&item=100&sort=&price=&q="  # 크롤링할 웹 페이지 URL
-req = requests.get(url)  # 웹 페이지 요청
+req = http_client.get(url)  # 웹 페이지 요청
 
 if req.status_code == 200:  # 요청 성공 여부 확인
     soup = BeautifulSoup(req.content, "html.parser")
@@ -0,0 +1,222 @@
+# 크롤러 공용 실행 지표
+#
+# 작업 한 번 실행(run) 동안 아래 값을 모아서, 끝날 때 요약을 출력하고 CRAWL_METRICS_FILE 에 JSON 한 줄로 남긴다.
+#   - 호스트별 요청 수 / 지연 시간 (p50, p95, 최대) / 받은 바이트 / 304 수 / 오류 수
+#   - 처리한 페이지 수, 항목 수 (초당 처리량)
+#   - fetch(요청) / parse(HTML 추출) / wait(브라우저 대기) / sleep(재시도 대기) 시간
+# 누적 히스토그램은 CRAWL_METRICS_PROM 에 Prometheus 텍스트 형식으로 함께 쓴다 (node_exporter textfile 용).
+#
+#   with crawl_metrics.job_run("CU"):
+#       ...
+#   executor.submit(crawl_metrics.propagate(fetch), url)  # 스레드에서도 같은 run 에 기록
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import BYTE_BUCKETS, LATENCY_BUCKETS, Counter, Histogram
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CRAWL_METRICS_FILE = os.environ.get("CRAWL_METRICS_FILE", os.path.join(ROOT, "crawl_metrics.jsonl"))
+CRAWL_METRICS_PROM = os.environ.get("CRAWL_METRICS_PROM", os.path.join(ROOT, "crawl_metrics.prom"))
+
+# 시간을 나눠 기록하는 구간
+PHASES = ("fetch", "parse", "wait", "sleep")
+
+log = logging.getLogger("crawl.metrics")
+
+# 프로세스 전체 누적 (작업 이름, 호스트) 라벨
+request_duration = Histogram("crawl_request_duration_seconds", "크롤러 HTTP 요청 시간", ("job", "host"), LATENCY_BUCKETS)
+response_bytes = Histogram("crawl_response_bytes", "크롤러 응답 본문 크기", ("job", "host"), BYTE_BUCKETS)
+phase_seconds = Counter("crawl_phase_seconds_total", "구간별 누적 시간", ("job", "phase"))
+pages_total = Counter("crawl_pages_total", "처리한 페이지 수", ("job",))
+items_total = Counter("crawl_items_total", "처리한 항목 수", ("job",))
+runs_total = Counter("crawl_runs_total", "작업 실행 수", ("job", "status"))
+_collectors = [request_duration, response_bytes, phase_seconds, pages_total, items_total, runs_total]
+
+_current_run = contextvars.ContextVar("crawl_run", default=None)
+
+
+class Run:
+    """작업 한 번 실행 동안의 지표 (여러 스레드에서 함께 기록)"""
+
+    def __init__(self, job):
+        self.job = job
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.pages = 0
+        self.items = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.hosts = {}  # host -> {"latencies": [...], "bytes", "not_modified", "errors"}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        entry = self.hosts.get(host)
+        if entry is None:
+            entry = self.hosts[host] = {"latencies": [], "bytes": 0, "not_modified": 0, "errors": 0}
+        return entry
+
+    def summary(self, status="ok"):
+        elapsed = time.perf_counter() - self._start
+        with self._lock:
+            hosts = {}
+            for host, entry in self.hosts.items():
+                latencies = sorted(entry["latencies"])
+                hosts[host] = {
+                    "requests": len(latencies),
+                    "p50_ms": _percentile_ms(latencies, 50),
+                    "p95_ms": _percentile_ms(latencies, 95),
+                    "max_ms": round(latencies[-1] * 1000, 1) if latencies else None,
+                    "bytes": entry["bytes"],
+                    "not_modified": entry["not_modified"],
+                    "errors": entry["errors"],
+                }
+            return {
+                "job": self.job,
+                "status": status,
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "elapsed_seconds": round(elapsed, 3),
+                "pages": self.pages,
+                "items": self.items,
+                "pages_per_second": round(self.pages / elapsed, 3) if elapsed else None,
+                "items_per_second": round(self.items / elapsed, 3) if elapsed else None,
+                "bytes": sum(h["bytes"] for h in hosts.values()),
+                # 스레드별 시간을 더한 값이라 동시에 실행하면 elapsed 보다 클 수 있음
+                "phase_seconds": {phase: round(seconds, 3) for phase, seconds in self.phases.items()},
+                "hosts": hosts,
+            }
+
+
+def _percentile_ms(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return round(sorted_values[index] * 1000, 1)
+
+
+def current_run():
+    return _current_run.get()
+
+
+def _job():
+    run = current_run()
+    return run.job if run else "-"
+
+
+def propagate(fn):
+    """지금 run 을 다른 스레드에서도 쓰도록 감싼 함수 (ThreadPoolExecutor.submit / map 에 넘김)"""
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+def observe_request(host, seconds, nbytes=0, not_modified=False, error=False):
+    job = _job()
+    request_duration.observe(seconds, job, host)
+    phase_seconds.inc(job, "fetch", amount=seconds)
+    if not error:
+        response_bytes.observe(nbytes, job, host)
+    run = current_run()
+    if run is not None:
+        with run._lock:
+            entry = run._host(host)
+            entry["latencies"].append(seconds)
+            entry["bytes"] += nbytes
+            entry["not_modified"] += int(not_modified)
+            entry["errors"] += int(error)
+            run.phases["fetch"] += seconds
+
+
+def add_time(phase, seconds):
+    phase_seconds.inc(_job(), phase, amount=seconds)
+    run = current_run()
+    if run is not None:
+        with run._lock:
+            run.phases[phase] += seconds
+
+
+@contextmanager
+def timed(phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - start)
+
+
+def sleep(seconds):
+    """time.sleep 대신 쓰면 sleep 시간으로 기록"""
+    time.sleep(seconds)
+    add_time("sleep", seconds)
+
+
+def add_pages(count=1):
+    pages_total.inc(_job(), amount=count)
+    run = current_run()
+    if run is not None:
+        with run._lock:
+            run.pages += count
+
+
+def add_items(count):
+    items_total.inc(_job(), amount=count)
+    run = current_run()
+    if run is not None:
+        with run._lock:
+            run.items += count
+
+
+def format_summary(summary):
+    phases = " ".join(f"{k} {v:.1f}s" for k, v in summary["phase_seconds"].items())
+    hosts = ", ".join(f"{host} {h['requests']}건 p50 {h['p50_ms']}ms p95 {h['p95_ms']}ms"
+                      for host, h in summary["hosts"].items())
+    return (f"📊 [{summary['job']}] {summary['status']} {summary['elapsed_seconds']:.1f}s | "
+            f"페이지 {summary['pages']} ({summary['pages_per_second'] or 0:.2f}/s) | "
+            f"항목 {summary['items']} ({summary['items_per_second'] or 0:.2f}/s) | "
+            f"{summary['bytes'] / 1024:.1f}KB | {phases}" + (f" | {hosts}" if hosts else ""))
+
+
+def render_prometheus():
+    lines = []
+    for collector in _collectors:
+        lines.extend(collector.render())
+    return "\n".join(lines) + "\n"
+
+
+def _write(summary):
+    with open(CRAWL_METRICS_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+    tmp = CRAWL_METRICS_PROM + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, CRAWL_METRICS_PROM)
+
+
+@contextmanager
+def job_run(job):
+    """작업 한 번 실행 구간. 끝나면 요약을 출력하고 지표 파일에 기록"""
+    run = Run(job)
+    token = _current_run.set(run)
+    status = "ok"
+    try:
+        yield run
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _current_run.reset(token)
+        runs_total.inc(job, status)
+        summary = run.summary(status)
+        print(format_summary(summary))
+        log.info(format_summary(summary))
+        try:
+            _write(summary)
+        except OSError as e:
+            log.warning("크롤링 지표 파일 기록 실패: %s", e)
@@ -1,4 +1,4 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import csv
 import re
@@ -22,7 +22,7 @@ with open(csv_file, mode="w", newline="", encoding="utf-8") as file:
 
     for idx in range(start_idx, end_idx + 1):
         url = base_url + str(idx)
-        response = requests.get(url)
+        response = http_client.get(url)
 
         if response.status_code == 200:
             soup = BeautifulSoup(response.text, "html.parser")
@@ -0,0 +1,19 @@
+# Slack 봇(final.py, sale_slack.py) 이 함께 쓰는 날짜 도우미
+from datetime import datetime, timedelta
+
+
+# 🟦 하루치 날짜 구간 [date, date + 1일)
+# LIKE '{date}%' 는 인덱스를 못 타므로 (store_type, 날짜) 인덱스를 쓸 수 있는 범위 조건으로 조회
+# 2024-02-30 처럼 없는 날짜면 ValueError
+def day_range(date):
+    start = datetime.strptime(date, "%Y-%m-%d")
+    return start.strftime("%Y-%m-%d"), (start + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+# 🟦 사용자가 입력한 날짜가 실제로 있는 날짜인지
+def is_valid_date(date):
+    try:
+        day_range(date)
+    except ValueError:
+        return False
+    return True
@@ -1,16 +1,256 @@
+import os
+import queue
+import threading
+import time
+
 import pymysql
 
+import metrics
+
+# 환경변수로 덮어쓸 수 있음 (벤치마크용 로컬 DB 등)
+DB_CONFIG = {
+    "host": os.environ.get("DB_HOST", "127.0.0.1"),
+    "port": int(os.environ.get("DB_PORT", 3306)),
+    "user": os.environ.get("DB_USER", "root"),
+    "password": os.environ.get("DB_PASSWORD", "0614"),
+    "database": os.environ.get("DB_NAME", "crawling"),
+    "charset": "utf8mb4"
+}
+
+# 커넥션 풀 설정
+POOL_CONFIG = {
+    "max_size": 10,            # 프로세스 전체에서 동시에 열 수 있는 최대 커넥션 수
+    "checkout_timeout": 5,     # 풀이 가득 찼을 때 빈 커넥션을 기다리는 최대 시간(초)
+    "max_lifetime": 1800,      # 이 시간(초)이 지난 커넥션은 반납 시 폐기하고 새로 만듦
+    "ping_interval": 30,       # 이 시간(초) 이상 놀고 있던 커넥션은 꺼낼 때 ping 으로 확인
+}
+
+
+class TimedCursor:
+    """쿼리 실행 시간과 읽은 행 수를 metrics 에 기록하는 커서 래퍼"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _timed(self, method, query, args):
+        start = time.perf_counter()
+        try:
+            return method(query, args)
+        finally:
+            metrics.observe_query(query, time.perf_counter() - start)
+
+    def execute(self, query, args=None):
+        return self._timed(self._cursor.execute, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(self._cursor.executemany, query, args)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            metrics.observe_rows(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        metrics.observe_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        metrics.observe_rows(len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+
+class PooledConnection:
+    """풀에서 빌려준 pymysql 커넥션
+
+    기존 코드처럼 conn.cursor(), conn.commit() 을 그대로 쓰면 되고,
+    conn.close() 를 호출하면 실제로 끊지 않고 풀에 반납된다.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, cursor=None):
+        return TimedCursor(self._raw.cursor(cursor))
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._pool._release(self._raw, self._created_at)
+
+    def invalidate(self):
+        """결과를 다 읽지 않은 스트리밍 커서처럼 상태를 알 수 없는 커넥션은 풀에 돌려보내지 않고 폐기"""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool._invalidate(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """스레드 안전한 고정 크기 MySQL 커넥션 풀"""
+
+    def __init__(self, db_config, max_size=10, checkout_timeout=5, max_lifetime=1800, ping_interval=30):
+        self.db_config = db_config
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+
+        self._idle = queue.LifoQueue()  # 가장 최근에 쓴(따뜻한) 커넥션부터 재사용
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,
+            "ping_failed": 0,
+            "checkout_timeouts": 0,
+            "in_use": 0,
+        }
+
+    def _count(self, key, n=1):
+        with self._lock:
+            self._stats[key] += n
+
+    def _connect(self):
+        raw = pymysql.connect(**self.db_config)
+        self._count("created")
+        return raw, time.monotonic()
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        start = time.perf_counter()
+        try:
+            return self._acquire()
+        finally:
+            metrics.observe_checkout(time.perf_counter() - start)
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            self._count("checkout_timeouts")
+            raise pymysql.OperationalError(
+                f"커넥션 풀 대기 시간 초과 ({self.checkout_timeout}초, 최대 {self.max_size}개 사용 중)"
+            )
+
+        try:
+            raw, created_at = self._checkout_idle()
+            if raw is None:
+                raw, created_at = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._count("in_use")
+        return PooledConnection(self, raw, created_at)
+
+    def _checkout_idle(self):
+        now = time.monotonic()
+        while True:
+            try:
+                raw, created_at, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return None, None
+
+            if now - created_at > self.max_lifetime:
+                self._count("recycled")
+                self._discard(raw)
+                continue
+
+            if now - released_at > self.ping_interval:
+                try:
+                    raw.ping(reconnect=False)
+                except Exception:
+                    self._count("ping_failed")
+                    self._discard(raw)
+                    continue
+
+            self._count("reused")
+            return raw, created_at
+
+    def _release(self, raw, created_at):
+        try:
+            if raw.open and time.monotonic() - created_at <= self.max_lifetime:
+                # 다음 사용자에게 끝나지 않은 트랜잭션이 넘어가지 않도록 정리
+                raw.rollback()
+                self._idle.put((raw, created_at, time.monotonic()))
+            else:
+                self._count("recycled")
+                self._discard(raw)
+        except Exception:
+            self._discard(raw)
+        finally:
+            self._count("in_use", -1)
+            self._slots.release()
+
+    def _invalidate(self, raw):
+        """빌려준 커넥션을 반납하지 않고 폐기 (recycled 로 세지 않음)"""
+        try:
+            self._discard(raw)
+        finally:
+            self._count("in_use", -1)
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["idle"] = self._idle.qsize()
+        stats["max_size"] = self.max_size
+        return stats
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+                metrics.register_gauges("db_pool", "커넥션 풀 상태", _pool.stats)
+    return _pool
+
+
 def get_db_connection():
     try:
-        connection = pymysql.connect(
-            host='127.0.0.1',
-            port=3306,
-            user='root',
-            password='0614',
-            database='crawling',
-            charset='utf8mb4'
-        )
-        return connection
+        return get_pool().acquire()
     except pymysql.MySQLError as e:
         print(f"Connection failed: {e}")
         return None
+
+
+def get_pool_stats():
+    return get_pool().stats()
@@ -0,0 +1,125 @@
+import datetime
+import decimal
+import json
+
+from flask import Response, request
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 으로 동작
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# format 파라미터 값 → Content-Type
+FORMATS = {
+    "json": "application/json",
+    "columnar": "application/vnd.market.columnar+json",
+    "msgpack": "application/msgpack",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+_MIMETYPE_TO_FORMAT = {mimetype: fmt for fmt, mimetype in FORMATS.items()}
+_MIMETYPE_TO_FORMAT["application/x-msgpack"] = "msgpack"
+
+
+class UnsupportedFormat(Exception):
+    """요청한 응답 형식을 만들 수 없음 (알 수 없는 형식이거나 라이브러리 미설치)"""
+
+
+def negotiate_format(req=None):
+    """?format= 파라미터가 있으면 우선, 없으면 Accept 헤더로 응답 형식 결정
+
+    req 를 넘기지 않으면 현재 Flask 요청을 사용 (Quart 요청 객체도 같은 방식으로 동작)
+    """
+    req = req if req is not None else request
+    fmt = req.args.get("format")
+    if fmt:
+        if fmt not in FORMATS:
+            raise UnsupportedFormat(f"지원하지 않는 format 입니다: {fmt}")
+    else:
+        best = req.accept_mimetypes.best_match(list(_MIMETYPE_TO_FORMAT), default="application/json")
+        fmt = _MIMETYPE_TO_FORMAT[best]
+
+    if fmt == "msgpack" and msgpack is None:
+        raise UnsupportedFormat("msgpack 이 설치되어 있지 않습니다.")
+    if fmt == "arrow" and pa is None:
+        raise UnsupportedFormat("pyarrow 가 설치되어 있지 않습니다.")
+    return fmt
+
+
+def _json_default(o):
+    # Flask 기본 JSON 과 같은 형태로 직렬화 (기존 클라이언트 호환)
+    if isinstance(o, datetime.date):
+        return http_date(o)
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_json(obj):
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _msgpack_default(o):
+    if isinstance(o, (datetime.date, datetime.datetime)):
+        return o.isoformat()
+    if isinstance(o, decimal.Decimal):
+        return float(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not msgpack serializable")
+
+
+def encode_rows(fmt, meta, rows_key, columns, rows):
+    """행 데이터를 요청한 형식으로 직렬화 → (body bytes, Content-Type)
+
+    meta     : status, next_cursor 처럼 행 외에 함께 보낼 값
+    rows_key : 행 데이터를 담을 키 (예: "sale_data")
+    columns  : 컬럼 이름 리스트
+    rows     : columns 순서의 튜플 리스트
+    """
+    if fmt == "json":
+        # 기존 형식: 행마다 {컬럼: 값} 객체
+        body = dict(meta)
+        body[rows_key] = [dict(zip(columns, row)) for row in rows]
+        return dumps_json(body), FORMATS[fmt]
+
+    # 열 단위(struct of arrays): 키 문자열을 행마다 반복하지 않음
+    data = {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+
+    if fmt == "columnar":
+        body = dict(meta)
+        body["columns"] = columns
+        body[rows_key] = data
+        return dumps_json(body), FORMATS[fmt]
+
+    if fmt == "msgpack":
+        body = dict(meta)
+        body["columns"] = columns
+        body[rows_key] = data
+        return msgpack.packb(body, default=_msgpack_default, use_bin_type=True), FORMATS[fmt]
+
+    # Arrow IPC 스트림: meta 는 스키마 메타데이터로 전달
+    table = pa.table(data) if rows else pa.table({name: pa.array([], pa.null()) for name in columns})
+    table = table.replace_schema_metadata({k: str(v) for k, v in meta.items() if v is not None})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes(), FORMATS[fmt]
+
+
+def data_response(fmt, meta, rows_key, columns, rows):
+    """encode_rows 결과를 Flask 응답으로 감쌈"""
+    body, mimetype = encode_rows(fmt, meta, rows_key, columns, rows)
+    return Response(body, mimetype=mimetype)
@@ -0,0 +1,241 @@
+# 이벤트 이미지 캐시 (event_img.img_url → 로컬 원본 / 썸네일)
+#
+# - 아직 받지 않은 img_url 을 동시에 내려받아 내용 SHA-256 이름으로 저장 (같은 이미지는 한 번만 저장)
+#     IMAGE_DIR/originals/ab/abcd...  (원본)
+#     IMAGE_DIR/thumbs/ab/abcd....jpg (썸네일, routes/image_route.py 가 /images/thumb/<sha256>.jpg 로 제공)
+# - 썸네일 생성과 perceptual hash(dHash) 계산은 프로세스 풀에서 실행 (이미지 디코딩은 CPU 작업)
+#   스케줄러 데몬처럼 스레드가 여럿인 프로세스에서 fork 하면 다른 스레드가 잡고 있던 lock 을 물려받아 멈출 수 있으므로 spawn 사용
+# - dHash 가 DHASH_DISTANCE 비트 이하로 다르면 같은 배너로 보고 먼저 저장된 이미지를 duplicate_of 에 기록
+# - 결과는 event_image 테이블 (migrations/0003_event_image.sql)
+#
+#   python event_images.py            # 새 이미지 처리
+#   python event_images.py --limit 50
+import argparse
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pymysql
+import requests
+
+import crawl_metrics
+import http_client
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 가 없으면 경로 함수만 사용 가능 (route 용), run() 은 실패
+    Image = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.environ.get("EVENT_IMAGE_DIR", os.path.join(ROOT, "image_cache"))
+
+# 한 번에 처리할 URL 수 / 동시 다운로드 수 / 썸네일 프로세스 수
+BATCH_LIMIT = 500
+DOWNLOAD_WORKERS = 8
+THUMB_PROCESSES = int(os.environ.get("EVENT_IMAGE_PROCESSES", os.cpu_count() or 1))
+
+# 썸네일 최대 크기(px) / JPEG 품질
+THUMB_SIZE = (320, 320)
+THUMB_QUALITY = 80
+# 이보다 큰 파일은 받지 않음
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+# dHash 해밍 거리가 이 값 이하면 비슷한 이미지
+DHASH_DISTANCE = 6
+# 실패한 URL 은 이 시간(시간)이 지나면 다시 시도
+RETRY_ERROR_HOURS = 24
+
+DB_CONFIG = {
+    "host": "3.35.236.56",
+    "user": "jsh",
+    "password": "0929",
+    "database": "crawling",
+    "charset": "utf8mb4"
+}
+
+
+def url_hash(img_url):
+    """DB 의 SHA1(img_url) 와 같은 값"""
+    return hashlib.sha1(img_url.encode("utf-8")).hexdigest()
+
+
+def original_path(sha256):
+    return os.path.join(IMAGE_DIR, "originals", sha256[:2], sha256)
+
+
+def thumb_path(sha256):
+    return os.path.join(IMAGE_DIR, "thumbs", sha256[:2], sha256 + ".jpg")
+
+
+def _write_once(path, data):
+    """path 가 없을 때만 임시 파일에 쓰고 rename (내용 주소 저장이라 있으면 같은 파일)"""
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def pending_urls(conn, limit=BATCH_LIMIT):
+    """아직 받지 않았거나, 실패한 지 RETRY_ERROR_HOURS 가 지난 img_url"""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT DISTINCT e.img_url FROM event_img e "
+            "LEFT JOIN event_image i ON i.url_hash = SHA1(e.img_url) "
+            "WHERE e.img_url LIKE 'http%%' AND (i.url_hash IS NULL OR "
+            "(i.status = 'error' AND i.fetched_at < NOW() - INTERVAL %s HOUR)) "
+            "LIMIT %s", (RETRY_ERROR_HOURS, limit))
+        return [row[0] for row in cursor.fetchall()]
+
+
+def download(img_url):
+    """이미지를 받아 원본 저장 → event_image 행 dict (실패하면 status 'error')"""
+    row = {"url_hash": url_hash(img_url), "img_url": img_url, "sha256": None, "bytes": None,
+           "content_type": None, "status": "error"}
+    try:
+        # 이미지 본문은 http_client 의 조건부 요청 캐시(sqlite)에 넣지 않음
+        response = http_client.get(img_url, conditional=False)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"❌ 이미지 요청 실패: {img_url} ({e})")
+        return row
+    crawl_metrics.add_pages()
+
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+    data = response.content
+    if not content_type.startswith("image/") or len(data) > MAX_IMAGE_BYTES:
+        print(f"⚠️ 이미지가 아니거나 너무 큼: {img_url} ({content_type}, {len(data)} bytes)")
+        return row
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    _write_once(original_path(sha256), data)
+    row.update(sha256=sha256, bytes=len(data), content_type=content_type, status="ok")
+    return row
+
+
+def dhash(image, size=8):
+    """difference hash: (size+1) x size 흑백으로 줄여 옆 픽셀끼리 밝기 비교 → size*size 비트 정수"""
+    pixels = image.convert("L").resize((size + 1, size), Image.LANCZOS).tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def make_thumbnail(sha256):
+    """(프로세스 풀에서 실행) 원본 → 썸네일 저장 → (sha256, width, height, dhash), 읽을 수 없으면 None"""
+    try:
+        with Image.open(original_path(sha256)) as image:
+            image.seek(0)  # 움직이는 GIF 는 첫 프레임
+            width, height = image.size
+            value = dhash(image)
+            if not os.path.exists(thumb_path(sha256)):
+                thumb = image.convert("RGBA")
+                background = Image.new("RGB", thumb.size, (255, 255, 255))
+                background.paste(thumb, mask=thumb.getchannel("A"))
+                background.thumbnail(THUMB_SIZE, Image.LANCZOS)
+                buffer = io.BytesIO()
+                background.save(buffer, "JPEG", quality=THUMB_QUALITY, optimize=True, progressive=True)
+                _write_once(thumb_path(sha256), buffer.getvalue())
+    except (OSError, Image.DecompressionBombError):
+        return None
+    return sha256, width, height, value
+
+
+def make_thumbnails(digests):
+    """digests 의 썸네일 / dHash 를 프로세스 풀에서 만듦 → {sha256: (width, height, dhash)}"""
+    with crawl_metrics.timed("parse"), ProcessPoolExecutor(
+            max_workers=THUMB_PROCESSES, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return {r[0]: r[1:] for r in executor.map(make_thumbnail, digests, chunksize=4) if r}
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def load_hashes(conn):
+    """이미 저장된 이미지의 [(sha256, dhash)] (먼저 받은 순) — 실행마다 한 번만 읽어서 파이썬에서 비교"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT sha256, dhash FROM event_image WHERE dhash IS NOT NULL "
+                       "GROUP BY sha256, dhash ORDER BY MIN(fetched_at)")
+        return [(sha256, int(value)) for sha256, value in cursor.fetchall()]
+
+
+def find_duplicate(known, sha256, value):
+    """known 중 dHash 가 비슷한 (다른 파일인) 이미지의 sha256, 없으면 None"""
+    return next((s for s, v in known if s != sha256 and hamming(v, value) <= DHASH_DISTANCE), None)
+
+
+def save_rows(conn, rows):
+    """event_image 에 저장 (다시 시도한 URL 은 덮어씀)"""
+    columns = ["url_hash", "img_url", "sha256", "dhash", "width", "height", "bytes", "content_type",
+               "duplicate_of", "status"]
+    sql = (f"INSERT INTO event_image ({', '.join(columns)}, fetched_at) "
+           f"VALUES ({', '.join(['%s'] * len(columns))}, NOW()) ON DUPLICATE KEY UPDATE "
+           + ", ".join(f"{c} = VALUES({c})" for c in columns[1:]) + ", fetched_at = VALUES(fetched_at)")
+    try:
+        with conn.cursor() as cursor:
+            cursor.executemany(sql, [[row.get(c) for c in columns] for row in rows])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def run(limit=BATCH_LIMIT):
+    """새 이벤트 이미지를 받아 썸네일 / dHash 를 만들고 event_image 에 저장 (scheduler.py 에서 호출)"""
+    if Image is None:
+        raise RuntimeError("이벤트 이미지 처리에는 Pillow 가 필요합니다. (pip install Pillow)")
+
+    conn = pymysql.connect(**DB_CONFIG)
+    try:
+        urls = pending_urls(conn, limit)
+        print(f"🖼️ 새 이미지 {len(urls)}개")
+        if not urls:
+            return
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            rows = list(executor.map(crawl_metrics.propagate(download), urls))
+
+        # 같은 파일은 한 번만 처리
+        digests = sorted({row["sha256"] for row in rows if row["sha256"]})
+        results = make_thumbnails(digests)
+
+        # 비슷한 이미지: DB 에 이미 있는 이미지 → 이번에 처리한 것 중 앞선 이미지 순으로 찾음
+        known = load_hashes(conn)  # [(sha256, dhash)]
+        duplicates = {}
+        for sha256 in digests:
+            if sha256 not in results:
+                continue
+            value = results[sha256][2]
+            duplicates[sha256] = find_duplicate(known, sha256, value)
+            known.append((sha256, value))
+
+        for row in rows:
+            if row["sha256"] in results:
+                row["width"], row["height"], row["dhash"] = results[row["sha256"]]
+                row["duplicate_of"] = duplicates.get(row["sha256"])
+            elif row["status"] == "ok":
+                row["status"] = "error"  # 이미지로 읽을 수 없는 파일
+        save_rows(conn, rows)
+
+        ok = sum(row["status"] == "ok" for row in rows)
+        crawl_metrics.add_items(ok)
+        print(f"✅ 이미지 {ok}개 저장 (실패 {len(rows) - ok}개, 비슷한 배너 "
+              f"{sum(1 for row in rows if row.get('duplicate_of'))}개)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이벤트 이미지 캐시")
+    parser.add_argument("--limit", type=int, default=BATCH_LIMIT, help="한 번에 처리할 URL 수")
+    args = parser.parse_args()
+    with crawl_metrics.job_run("images"):
+        run(args.limit)
@@ -0,0 +1,142 @@
+# 크롤러 공용 event_img 저장 모듈
+#
+# 이벤트마다 content_hash(store_type + event_title + img_url 의 SHA1)를 만들고,
+# (DATED_STORES 의 편의점은 시작일 / 종료일까지 넣음 — 같은 배너로 기간만 바꿔 다시 여는 이벤트가 있음)
+# 새 이벤트의 해시만 IN (...) 으로 한 번에 조회해서 중복을 거른 뒤 여러 행 INSERT ... ON DUPLICATE KEY 로 저장한다.
+# (테이블 전체를 읽지 않으므로 비용은 새로 들어온 이벤트 수에 비례)
+#
+# content_hash 컬럼과 unique 인덱스는 migrations/0002_event_img_content_hash.py 로 추가하고,
+# 날짜를 넣는 해시는 migrations/0006_event_img_dated_hash.py 로 다시 계산한다.
+# 마이그레이션이 적용되지 않은 DB 에 저장하려 하면 처음 저장할 때 SchemaNotReady 로 바로 멈춘다.
+import hashlib
+
+import pymysql
+
+# 이벤트 한 건: {"img_url", "start_date", "end_date", "event_title", "store_type", "idx"(선택)}
+EVENT_COLUMNS = ["img_url", "start_date", "end_date", "event_title", "store_type", "idx"]
+QUERY_CHUNK_SIZE = 1000
+INSERT_CHUNK_SIZE = 500
+# 시작일 / 종료일까지 같아야 같은 이벤트로 보는 편의점 (migrations/0006 의 DATED_STORES 와 같아야 함)
+DATED_STORES = {"GS25"}
+# save_events 가 기대하는 event_img 스키마를 만드는 마이그레이션 (schema_migrations.version)
+REQUIRED_MIGRATION = "0006"
+
+_checked_migrations = set()
+
+
+class SchemaNotReady(RuntimeError):
+    """필요한 마이그레이션이 적용되지 않음"""
+
+
+def check_schema(conn, version=REQUIRED_MIGRATION):
+    """마이그레이션 version 이 적용됐는지 확인 (프로세스마다 한 번), 아니면 SchemaNotReady"""
+    if version in _checked_migrations:
+        return
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (version,))
+            applied = cursor.fetchone() is not None
+        except pymysql.err.ProgrammingError as e:
+            if e.args[0] != 1146:  # schema_migrations 테이블 없음 = 마이그레이션을 한 번도 안 함
+                raise
+            applied = False
+    if not applied:
+        raise SchemaNotReady(f"필요한 마이그레이션 {version} 이 적용되지 않았습니다. "
+                             "먼저 'python migrate.py up' 을 실행하세요.")
+    _checked_migrations.add(version)
+
+
+def _day(value):
+    """날짜 → YYYY-MM-DD (DB 의 REPLACE(LEFT(date, 10), '.', '-') 와 같은 값)"""
+    return None if value is None else str(value)[:10].replace(".", "-")
+
+
+def content_hash(store_type, event_title, img_url, start_date=None, end_date=None):
+    """DB 의 SHA1(CONCAT_WS(CHAR(31), store_type, event_title, img_url[, 시작일, 종료일])) 와 같은 값"""
+    values = [store_type, event_title, img_url]
+    if store_type in DATED_STORES:
+        values += [_day(start_date), _day(end_date)]
+    return hashlib.sha1("\x1f".join(str(v) for v in values if v is not None).encode("utf-8")).hexdigest()
+
+
+def event_hash(event):
+    return content_hash(event["store_type"], event["event_title"], event["img_url"],
+                        event.get("start_date"), event.get("end_date"))
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def find_existing_hashes(conn, hashes):
+    existing = set()
+    hashes = list(hashes)
+    with conn.cursor() as cursor:
+        for chunk in _chunks(hashes, QUERY_CHUNK_SIZE):
+            placeholders = ",".join(["%s"] * len(chunk))
+            cursor.execute(f"SELECT content_hash FROM event_img WHERE content_hash IN ({placeholders})", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+
+def filter_new(conn, events):
+    """아직 저장되지 않은 이벤트만 반환 (요청 안에서 중복된 이벤트도 하나만 남김)"""
+    by_hash = {}
+    for event in events:
+        by_hash.setdefault(event_hash(event), event)
+    existing = find_existing_hashes(conn, by_hash)
+    return [event for h, event in by_hash.items() if h not in existing]
+
+
+def find_stored_ids(conn, store_type, ids):
+    """idx 에 사이트 쪽 이벤트 id 를 저장하는 크롤러용: ids 중 이미 저장된 것"""
+    stored = set()
+    ids = list(ids)
+    with conn.cursor() as cursor:
+        for chunk in _chunks(ids, QUERY_CHUNK_SIZE):
+            placeholders = ",".join(["%s"] * len(chunk))
+            cursor.execute(f"SELECT idx FROM event_img WHERE store_type = %s AND idx IN ({placeholders})",
+                           [store_type, *chunk])
+            stored.update(str(row[0]) for row in cursor.fetchall())
+    return stored
+
+
+def find_stored_periods(conn, store_type, titles):
+    """titles 중 이미 저장된 (event_title, start_date, end_date) 집합"""
+    stored = set()
+    titles = list(set(titles))
+    with conn.cursor() as cursor:
+        for chunk in _chunks(titles, QUERY_CHUNK_SIZE):
+            placeholders = ",".join(["%s"] * len(chunk))
+            cursor.execute("SELECT event_title, start_date, end_date FROM event_img "
+                           f"WHERE store_type = %s AND event_title IN ({placeholders})", [store_type, *chunk])
+            stored.update((title, str(start), str(end)) for title, start, end in cursor.fetchall())
+    return stored
+
+
+def save_events(conn, events, chunk_size=INSERT_CHUNK_SIZE):
+    """새 이벤트만 chunk 단위 INSERT ... ON DUPLICATE KEY 로 저장 → 저장한 이벤트 리스트
+
+    동시에 다른 프로세스가 같은 이벤트를 넣어도 unique 인덱스에 걸려 무시된다.
+    """
+    check_schema(conn)
+    new_events = filter_new(conn, events)
+    row_sql = "(" + ",".join(["%s"] * (len(EVENT_COLUMNS) + 1)) + ")"
+    try:
+        with conn.cursor() as cursor:
+            for chunk in _chunks(new_events, chunk_size):
+                sql = (f"INSERT INTO event_img ({', '.join(EVENT_COLUMNS)}, content_hash) VALUES "
+                       + ",".join([row_sql] * len(chunk)) +
+                       " ON DUPLICATE KEY UPDATE content_hash = content_hash")
+                params = []
+                for event in chunk:
+                    params.extend(event.get(column, 0) if column == "idx" else event[column]
+                                  for column in EVENT_COLUMNS)
+                    params.append(event_hash(event))
+                cursor.execute(sql, params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return new_events
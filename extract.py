@@ -0,0 +1,215 @@
+# 크롤러 공용 HTML 추출 모듈
+#
+# 사이트별 선언형 spec 으로 필요한 값만 뽑는다. 페이지 전체를 BeautifulSoup 트리로 만들지 않는다.
+#   - lxml 이 있으면 C 파서로 읽고 spec 을 미리 컴파일한 XPath 로 조회
+#   - 없으면 SoupStrainer 로 필요한 부분만 html.parser 로 파싱한 뒤 CSS 선택자로 조회
+#
+#   items = extract.extract_items(html, extract.pyony_card_spec("CU"))
+#   notice = extract.extract_one(html, extract.CU_NEWS_VIEW)
+#
+# 추출에 걸린 시간은 crawl_metrics 에 parse 시간으로 기록한다.
+import hashlib
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+import crawl_metrics
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml 이 없으면 BeautifulSoup(html.parser) 로 동작
+    lxml = None
+
+# spec 형식
+#   item   : 항목 하나에 해당하는 태그까지의 [step, ...], None 이면 페이지 전체가 항목 하나
+#   fields : {필드 이름: ([step, ...], 가져올 값)} — step 이 없으면 항목 태그 자신
+#            step = (태그 이름, {속성: 값}) — 태그 이름 "*" 는 아무 태그, class 는 공백으로 구분한 클래스를 모두 가진 태그
+#            가져올 값 = "text" (태그 글자) | "tail" (태그 바로 뒤 글자) | 속성 이름 (예: "src")
+
+# pyony 상품 카드의 브랜드별 이벤트 배지 클래스
+PYONY_BADGE_CLASSES = {
+    "GS25": "bg-gs25",
+    "CU": "bg-cu",
+    "Seven": "bg-seven",
+}
+
+
+def pyony_card_spec(brand):
+    """pyony.com 상품 목록 페이지의 카드(div.col-md-6) spec"""
+    return _compile({
+        "item": [("div", {"class": "col-md-6"})],
+        "fields": {
+            "update_date": ([("small", {"class": "float-right text-white mr-3"})], "text"),
+            "title": ([("strong", {})], "text"),
+            "price": ([("i", {"class": "fa-coins"})], "tail"),
+            "event_price": ([("span", {"class": "text-muted small"})], "text"),
+            "plus_type": ([("span", {"class": f"badge {PYONY_BADGE_CLASSES[brand]} text-white"})], "text"),
+        },
+    })
+
+
+def _css_step(tag, attrs):
+    css = tag
+    for name, value in attrs.items():
+        if name == "class":
+            css += "".join("." + c for c in value.split())
+        else:
+            css += f'[{name}="{value}"]'
+    return css
+
+
+def _xpath_step(tag, attrs):
+    xpath = tag
+    for name, value in attrs.items():
+        if name == "class":
+            xpath += "".join(f"[contains(concat(' ', normalize-space(@class), ' '), ' {c} ')]" for c in value.split())
+        else:
+            xpath += f"[@{name}='{value}']"
+    return xpath
+
+
+def _compile(spec):
+    """spec 에 백엔드별 조회식을 미리 만들어 붙임"""
+    fields = spec["fields"]
+    # html.parser 로 파싱할 때 남길 부분: 항목의 가장 바깥 태그, 없으면 각 필드의 첫 태그 ("*" 가 있으면 전체)
+    first_steps = [spec["item"][0]] if spec["item"] else [steps[0] for steps, _ in fields.values() if steps]
+    if any(tag == "*" for tag, _ in first_steps):
+        spec["strainer"] = None
+    elif spec["item"]:
+        spec["strainer"] = SoupStrainer(first_steps[0][0], attrs=first_steps[0][1])
+    else:
+        spec["strainer"] = SoupStrainer(sorted({tag for tag, _ in first_steps}))
+    spec["css"] = {name: " ".join(_css_step(*step) for step in steps) for name, (steps, _) in fields.items()}
+    if spec["item"]:
+        spec["item_css"] = " ".join(_css_step(*step) for step in spec["item"])
+
+    if lxml is not None:
+        spec["xpath"] = {name: etree.XPath(".//" + "//".join(_xpath_step(*step) for step in steps) if steps else ".")
+                         for name, (steps, _) in fields.items()}
+        if spec["item"]:
+            # 같은 항목 태그 안에 중첩된 항목 태그는 따로 세지 않음
+            last = _xpath_step(*spec["item"][-1])
+            spec["item_xpath"] = etree.XPath("//" + "//".join(_xpath_step(*step) for step in spec["item"]) +
+                                             f"[not(ancestor::{last})]")
+    return spec
+
+
+# CU 공지 상세 (news_view.do) : 제목은 thead 첫 th, 이벤트 이미지는 td[colspan=2] 안의 img
+CU_NEWS_VIEW = _compile({
+    "item": None,
+    "fields": {
+        "event_title": ([("thead", {}), ("tr", {}), ("th", {})], "text"),
+        "img_url": ([("td", {"colspan": "2"}), ("img", {"border": "0"})], "src"),
+    },
+})
+
+
+# GS25 이벤트 목록 (current-events) : 행마다 상세 링크와 진행 기간
+GS25_EVENT_LIST = _compile({
+    "item": [("div", {"class": "tblwrap"}), ("tbody", {}), ("tr", {})],
+    "fields": {
+        "href": ([("td", {"class": "ft_lt"}), ("a", {})], "href"),
+        "title": ([("td", {"class": "ft_lt"}), ("a", {})], "text"),
+        "row_text": ([], "text"),
+    },
+})
+
+# GS25 이벤트 상세
+GS25_EVENT_DETAIL = _compile({
+    "item": None,
+    "fields": {
+        "title": ([("div", {"class": "tit_sect"}), ("h3", {"class": "tit"}), ("strong", {})], "text"),
+        "start_date": ([("*", {"id": "event-start-date"})], "text"),
+        "end_date": ([("*", {"id": "event-end-date"})], "text"),
+        "img_url": ([("*", {"class": "event-web-contents"}), ("img", {})], "src"),
+    },
+})
+
+
+# 세븐일레븐 이벤트 상세
+SEVEN_EVENT_DETAIL = _compile({
+    "item": None,
+    "fields": {
+        "img_url": ([("*", {"class": "event_wrap_view"}), ("img", {})], "src"),
+    },
+})
+
+
+def _lxml_root(html):
+    try:
+        return lxml.html.fromstring(html)
+    except etree.ParserError:  # 빈 문서 (그 밖의 입력 오류는 빈 결과로 숨기지 않고 그대로 올림)
+        return None
+
+
+def _lxml_record(node, spec):
+    record = {}
+    for name, (_, kind) in spec["fields"].items():
+        found = spec["xpath"][name](node) if node is not None else []
+        if not found:
+            record[name] = None
+        elif kind == "text":
+            record[name] = "".join(s.strip() for s in found[0].itertext())
+        elif kind == "tail":
+            record[name] = found[0].tail.strip() if found[0].tail is not None else None
+        else:
+            record[name] = found[0].get(kind)
+    return record
+
+
+def _soup_record(node, spec):
+    record = {}
+    for name, (_, kind) in spec["fields"].items():
+        tag = node.select_one(spec["css"][name]) if spec["css"][name] else node
+        if tag is None:
+            record[name] = None
+        elif kind == "text":
+            record[name] = tag.get_text(strip=True)
+        elif kind == "tail":
+            sibling = tag.next_sibling
+            record[name] = str(sibling).strip() if sibling is not None else None
+        else:
+            record[name] = tag.get(kind)
+    return record
+
+
+def extract_items(html, spec):
+    """항목(item)마다 {필드: 값} dict 를 만들어 리스트로 반환 (값이 없으면 None)"""
+    with crawl_metrics.timed("parse"):
+        return _extract_items(html, spec)
+
+
+def _extract_items(html, spec):
+    if lxml is not None:
+        root = _lxml_root(html)
+        if root is None:
+            return []
+        return [_lxml_record(node, spec) for node in spec["item_xpath"](root)]
+
+    soup = BeautifulSoup(html, "html.parser", parse_only=spec["strainer"])
+    nodes = soup.select(spec["item_css"])
+    matched = {id(node) for node in nodes}
+    return [_soup_record(node, spec) for node in nodes
+            if not any(id(parent) in matched for parent in node.parents)]
+
+
+def extract_one(html, spec):
+    """페이지 전체를 항목 하나로 보고 {필드: 값} 반환"""
+    with crawl_metrics.timed("parse"):
+        return _extract_one(html, spec)
+
+
+def _extract_one(html, spec):
+    if lxml is not None:
+        return _lxml_record(_lxml_root(html), spec)
+    return _soup_record(BeautifulSoup(html, "html.parser", parse_only=spec["strainer"]), spec)
+
+
+def fingerprint(items):
+    """추출한 항목들의 값으로 만든 해시 (같은 목록이 다시 나왔는지 비교용)"""
+    digest = hashlib.sha1()
+    for item in items:
+        for value in item.values():
+            digest.update(b"\x1f" + (value or "").encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
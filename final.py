@@ -16,6 +16,7 @@ from matplotlib import rc
 from tensorflow.keras.models import load_model
 from tensorflow.keras.losses import MeanSquaredError
 import re
+from date_utils import day_range, is_valid_date
 
 
 # ✅ 한글 폰트 설정 (운영체제별 자동 적용)
@@ -186,12 +187,14 @@ ANOMALY_THRESHOLDS = {
 
 # 🟦 특정 날짜의 유튜브 및 네이버 뉴스 기사 조회 (최대 3개만 먼저 반환)
 def get_ytb_links_by_date_and_store(date, store_type):
-    query = f"""
+    if not date or not store_type:
+        return []
+    query = """
         SELECT video_url FROM ytb_video
-        WHERE store_type = '{store_type}' AND published_at LIKE '{date}%';
+        WHERE store_type = %s AND published_at >= %s AND published_at < %s;
     """
     cursor = conn.cursor(dictionary=True)
-    cursor.execute(query)
+    cursor.execute(query, (store_type, *day_range(date)))
     data = cursor.fetchall()
     cursor.close()
     
@@ -200,13 +203,15 @@ def get_ytb_links_by_date_and_store(date, store_type):
 
 # 🟦 특정 날짜의 네이버 뉴스 기사 조회 (최대 3개만 먼저 반환)
 def get_news_links_by_date_and_store(date, store_type):
-    query = f"""
+    if not date or not store_type:
+        return []
+    query = """
         SELECT news_url FROM news_search
-        WHERE store_type = '{store_type}' AND news_date LIKE '{date}%'
+        WHERE store_type = %s AND news_date >= %s AND news_date < %s
         ORDER BY news_start DESC;
     """
     cursor = conn.cursor(dictionary=True)
-    cursor.execute(query)
+    cursor.execute(query, (store_type, *day_range(date)))
     data = cursor.fetchall()
     cursor.close()
     
@@ -286,13 +291,13 @@ def detect_sales_anomalies():
 
     print(f"🔍 [LOG] {today_str} 매출 이상 감지 체크 중...")
 
-    query = f"""
+    query = """
         SELECT sale_date, store_type, sum_amount, growth_deviation
         FROM all_sale
-        WHERE sale_date = '{today_str}';
+        WHERE sale_date >= %s AND sale_date < %s;
     """
     cursor = conn.cursor(dictionary=True)
-    cursor.execute(query)
+    cursor.execute(query, day_range(today_str))
     data = cursor.fetchall()
     cursor.close()
 
@@ -366,13 +371,13 @@ def schedule_test_check():
 
 # 🟦 매출 데이터 조회 함수
 def get_sales_data(date, store_type):
-    query = f"""
+    query = """
         SELECT sum_amount, sum_amount_growth, avg_sum_amount_growth, growth_deviation
         FROM all_sale
-        WHERE sale_date = '{date}' AND store_type = '{store_type}';
+        WHERE store_type = %s AND sale_date >= %s AND sale_date < %s;
     """
     cursor = conn.cursor(dictionary=True)
-    cursor.execute(query)
+    cursor.execute(query, (store_type, *day_range(date)))
     data = cursor.fetchone()
     cursor.close()
     return data
@@ -414,6 +419,11 @@ def handle_mention(event, say, client):
     date = date_match.group(0) if date_match else None
     store_type = store_match.group(0) if store_match else None
 
+    # 🔹 2024-02-30 처럼 형식은 맞지만 없는 날짜
+    if date and not is_valid_date(date):
+        say(f"⚠️ {date} 는 없는 날짜입니다. 올바른 날짜를 `2024-10-02` 형식으로 입력해주세요.")
+        return
+
     # ✅ 매출 예측 실행
     if channel_id == PREV_CHANNEL_ID:
         date_match = re.search(r"\d{4}-\d{2}-\d{2}", text)
@@ -0,0 +1,233 @@
+# 크롤러 공용 HTTP 요청 모듈
+#
+# - 호스트별 Session(keep-alive 커넥션 풀) 재사용, 호스트별 동시 요청 수 제한
+# - 기본 timeout, 연결 오류 / 429 / 5xx 는 지터를 넣은 지수 백오프로 재시도
+# - ETag / Last-Modified 를 sqlite 에 저장해 두고 다음 요청에 If-None-Match / If-Modified-Since 로 보냄
+#   → 바뀌지 않은 페이지는 304 로 받고 저장해 둔 본문을 돌려줌 (response.not_modified == True)
+#   → CACHE_TTL_DAYS 동안 쓰지 않은 항목과 최근에 쓴 CACHE_MAX_ENTRIES 개 밖의 항목은 지움
+#
+#   import http_client
+#   response = http_client.get(url, headers=headers)
+#
+# 요청마다 호스트별 지연 시간 / 받은 바이트를 crawl_metrics 에 기록한다.
+import os
+import random
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import crawl_metrics
+
+# (연결, 읽기) timeout 초
+DEFAULT_TIMEOUT = (5, 20)
+# 재시도 (첫 요청 제외) / 백오프 기본값 · 최대값(초)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 호스트별 커넥션 풀 크기 / 동시 요청 수
+POOL_MAXSIZE = 10
+MAX_PER_HOST = int(os.environ.get("HTTP_MAX_PER_HOST", 8))
+
+# 조건부 요청용 메타데이터 저장 위치
+CACHE_DB = os.environ.get("HTTP_CACHE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "http_cache.sqlite3"))
+# 저장해 둘 최대 URL 수 / 이 기간(일) 동안 요청하지 않은 URL 은 삭제 / put 몇 번마다 정리할지
+CACHE_MAX_ENTRIES = int(os.environ.get("HTTP_CACHE_MAX_ENTRIES", 20000))
+CACHE_TTL_DAYS = float(os.environ.get("HTTP_CACHE_TTL_DAYS", 30))
+PRUNE_EVERY = 200
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+class MetadataStore:
+    """URL 별 ETag / Last-Modified / 본문을 보관하는 sqlite 저장소 (스레드 안전)
+
+    fetched_at 은 저장하거나 304 로 다시 쓸 때마다 갱신되므로, 오래된 순으로 지우면 LRU 가 된다.
+    """
+
+    def __init__(self, path, max_entries=CACHE_MAX_ENTRIES, ttl_days=CACHE_TTL_DAYS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_days = ttl_days
+        self._lock = threading.Lock()
+        self._conn = None
+        self._puts = 0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    encoding TEXT,
+                    body BLOB,
+                    fetched_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_fetched_at ON http_cache (fetched_at)")
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url):
+        """(etag, last_modified, encoding, body) 또는 None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT etag, last_modified, encoding, body FROM http_cache WHERE url = ?", (url,)).fetchone()
+        return row
+
+    def put(self, url, etag, last_modified, encoding, body):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR REPLACE INTO http_cache (url, etag, last_modified, encoding, body, fetched_at) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", (url, etag, last_modified, encoding, body, time.time()))
+            conn.commit()
+            self._puts += 1
+            if self._puts % PRUNE_EVERY == 0:
+                self._prune_locked(conn)
+
+    def touch(self, url):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE http_cache SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+
+    def _prune_locked(self, conn):
+        expired = conn.execute("DELETE FROM http_cache WHERE fetched_at < ?",
+                               (time.time() - self.ttl_days * 86400,)).rowcount
+        evicted = conn.execute("DELETE FROM http_cache WHERE url IN (SELECT url FROM http_cache "
+                               "ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)).rowcount
+        conn.commit()
+        return expired + evicted
+
+    def prune(self):
+        """오래된 항목 / max_entries 를 넘는 항목 삭제 → 지운 행 수"""
+        with self._lock:
+            return self._prune_locked(self._connect())
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+metadata_store = MetadataStore(CACHE_DB)
+
+_sessions = {}    # host -> Session
+_host_slots = {}  # host -> BoundedSemaphore
+_host_limits = {}  # host -> 동시 요청 수 (MAX_PER_HOST 대신 쓸 값)
+_lock = threading.Lock()
+
+
+def _host(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def session_for(url):
+    """호스트별로 하나씩 만든 Session (커넥션 풀 공유)"""
+    host = _host(url)
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+            _host_slots[host] = threading.BoundedSemaphore(_host_limits.get(host, MAX_PER_HOST))
+        return session, _host_slots[host]
+
+
+def set_host_limit(url, limit):
+    """url 호스트의 동시 요청 수를 limit 로 제한 (첫 요청 전에 호출해야 적용됨)"""
+    with _lock:
+        _host_limits[_host(url)] = limit
+
+
+def _backoff(attempt, response=None):
+    """재시도 전 대기 시간: Retry-After 가 있으면 따르고, 없으면 full jitter 지수 백오프"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def request(method, url, headers=None, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, **kwargs):
+    """재시도를 포함한 요청 → requests.Response (마지막 시도의 응답, 끝까지 연결 실패면 예외)"""
+    session, slots = session_for(url)
+    host = urlsplit(url).netloc
+    for attempt in range(retries + 1):
+        try:
+            with slots:
+                start = time.perf_counter()
+                response = session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            crawl_metrics.observe_request(host, time.perf_counter() - start, error=True)
+            if attempt == retries:
+                raise
+            crawl_metrics.sleep(_backoff(attempt))
+            continue
+
+        # stream=True 면 본문을 아직 읽지 않았으므로 Content-Length 로 셈
+        nbytes = (int(response.headers.get("Content-Length") or 0) if kwargs.get("stream")
+                  else len(response.content))
+        crawl_metrics.observe_request(host, time.perf_counter() - start, nbytes,
+                                      not_modified=response.status_code == 304,
+                                      error=response.status_code >= 400)
+        if response.status_code in RETRY_STATUS and attempt < retries:
+            response.close()
+            crawl_metrics.sleep(_backoff(attempt, response))
+            continue
+        return response
+
+
+def get(url, headers=None, conditional=True, **kwargs):
+    """GET 요청. conditional=True 면 저장해 둔 ETag / Last-Modified 로 재검증
+
+    304 를 받으면 저장된 본문을 채워서 status_code 200, not_modified=True 인 응답으로 돌려준다.
+    """
+    cached = metadata_store.get(url) if conditional else None
+    request_headers = dict(headers or {})
+    if cached:
+        etag, last_modified, _, _ = cached
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+    response = request("GET", url, headers=request_headers, **kwargs)
+    response.not_modified = False
+
+    if cached and response.status_code == 304:
+        _, _, encoding, body = cached
+        response.status_code = 200
+        response._content = body
+        response.encoding = encoding
+        response.not_modified = True
+        metadata_store.touch(url)
+    elif conditional and response.status_code == 200:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            metadata_store.put(url, etag, last_modified, response.encoding, response.content)
+    return response
+
+
+def close_all():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _host_slots.clear()
+    metadata_store.close()
@@ -0,0 +1,186 @@
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+
+# 이 시간(ms) 이상 걸린 쿼리는 slow query 로그에 남김
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+
+# 지연 시간 히스토그램 구간(초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# 행 수 / 바이트 수 히스토그램 구간
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+slow_query_log = logging.getLogger("db.slow_query")
+
+# 지금 처리 중인 요청의 라우트 (DB 지표에 라벨로 붙임)
+_current_route = contextvars.ContextVar("current_route", default="-")
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for labels, series in items:
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_join(base, bound)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_join(base, '+Inf')} {series[-1]}")
+            lines.append(f"{self.name}_sum{_wrap(base)} {series[-2]}")
+            lines.append(f"{self.name}_count{_wrap(base)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._series.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_wrap(_format_labels(self.label_names, labels))} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values):
+    return ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+
+
+def _join(base, bound):
+    le = f'le="{bound}"'
+    return "{" + (base + "," if base else "") + le + "}"
+
+
+def _wrap(base):
+    return "{" + base + "}" if base else ""
+
+
+request_duration = Histogram("http_request_duration_seconds", "HTTP 요청 처리 시간",
+                             ("blueprint", "route", "method", "status"), LATENCY_BUCKETS)
+response_bytes = Histogram("http_response_bytes", "HTTP 응답 본문 크기",
+                           ("blueprint", "route"), BYTE_BUCKETS)
+db_checkout_duration = Histogram("db_checkout_duration_seconds", "커넥션 풀에서 커넥션을 받기까지 걸린 시간",
+                                 ("route",), LATENCY_BUCKETS)
+db_query_duration = Histogram("db_query_duration_seconds", "쿼리 실행 시간",
+                              ("route",), LATENCY_BUCKETS)
+db_rows_returned = Histogram("db_rows_returned", "쿼리 한 번에 읽은 행 수",
+                             ("route",), ROW_BUCKETS)
+db_slow_queries = Counter("db_slow_queries_total", f"SLOW_QUERY_MS({SLOW_QUERY_MS:g}ms) 이상 걸린 쿼리 수",
+                          ("route",))
+
+_collectors = [request_duration, response_bytes, db_checkout_duration,
+               db_query_duration, db_rows_returned, db_slow_queries]
+_gauge_callbacks = []  # (이름, 설명, 값 dict 를 돌려주는 함수)
+
+
+def register_gauges(name_prefix, help_text, callback):
+    """/metrics 를 그릴 때마다 callback() 의 {이름: 값} 을 gauge 로 출력"""
+    _gauge_callbacks.append((name_prefix, help_text, callback))
+
+
+def current_route():
+    return _current_route.get()
+
+
+def observe_checkout(seconds):
+    db_checkout_duration.observe(seconds, current_route())
+
+
+def observe_query(sql, seconds):
+    route = current_route()
+    db_query_duration.observe(seconds, route)
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        db_slow_queries.inc(route)
+        slow_query_log.warning("slow query %.1fms [%s] %s", seconds * 1000, route, " ".join(str(sql).split())[:500])
+
+
+def observe_rows(count):
+    db_rows_returned.observe(count, current_route())
+
+
+def render_prometheus():
+    lines = []
+    for collector in _collectors:
+        lines.extend(collector.render())
+    for prefix, help_text, callback in _gauge_callbacks:
+        try:
+            values = callback()
+        except Exception:
+            continue
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                name = f"{prefix}_{key}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def init_metrics(app):
+    """Flask 앱의 모든 라우트(블루프린트 포함)에 지연 시간 / 응답 크기 측정을 붙임"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+        g._metrics_route = _current_route.set(request.url_rule.rule if request.url_rule else "<unmatched>")
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            route = current_route()
+            blueprint = request.blueprint or "app"
+            request_duration.observe(time.perf_counter() - start, blueprint, route,
+                                     request.method, str(response.status_code))
+            if response.content_length is not None:
+                response_bytes.observe(response.content_length, blueprint, route)
+        return response
+
+    @app.teardown_request
+    def _reset_route(exc):
+        token = g.pop("_metrics_route", None)
+        if token is not None:
+            try:
+                _current_route.reset(token)
+            except ValueError:
+                pass
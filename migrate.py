@@ -0,0 +1,214 @@
+# 스키마 마이그레이션
+#
+# migrations/ 아래의 NNNN_이름.sql / NNNN_이름.py 를 번호 순서대로 한 번씩 적용하고 schema_migrations 에 기록한다.
+#   .sql : ';' 로 구분한 문장을 차례로 실행
+#   .py  : upgrade(conn) 함수를 호출 (데이터 채우기처럼 SQL 만으로 어려운 작업)
+#
+# 적용 전/후로 날짜 조회 쿼리의 EXPLAIN 과 실행 시간을 재서 JSON 리포트로 남긴다.
+#
+#   python migrate.py status
+#   python migrate.py up --report migration_report.json --date 2024-10-01
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+
+import pymysql
+
+from db import get_db_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+
+# 이미 있는 인덱스 / 테이블 / 컬럼을 다시 만들려는 오류 → 적용된 것으로 보고 넘어감
+ALREADY_EXISTS_ERRORS = {1050, 1060, 1061}
+
+# 적용 전/후로 EXPLAIN 과 시간을 비교할 쿼리 (이름, SQL, 파라미터를 만드는 함수)
+PROBE_QUERIES = [
+    ("ytb_video_like", "SELECT video_url FROM ytb_video WHERE store_type = %s AND published_at LIKE %s",
+     lambda day, next_day: ("CU", day + "%")),
+    ("ytb_video_range", "SELECT video_url FROM ytb_video WHERE store_type = %s AND published_at >= %s AND published_at < %s",
+     lambda day, next_day: ("CU", day, next_day)),
+    ("news_search_like", "SELECT news_url FROM news_search WHERE store_type = %s AND news_date LIKE %s",
+     lambda day, next_day: ("CU", day + "%")),
+    ("news_search_range", "SELECT news_url FROM news_search WHERE store_type = %s AND news_date >= %s AND news_date < %s",
+     lambda day, next_day: ("CU", day, next_day)),
+    ("all_sale_day", "SELECT sale_date, store_type, sum_amount, growth_deviation FROM all_sale "
+                     "WHERE sale_date >= %s AND sale_date < %s",
+     lambda day, next_day: (day, next_day)),
+    ("all_sale_store_day", "SELECT sum_amount, sum_amount_growth, avg_sum_amount_growth, growth_deviation FROM all_sale "
+                           "WHERE store_type = %s AND sale_date >= %s AND sale_date < %s",
+     lambda day, next_day: ("CU", day, next_day)),
+]
+PROBE_REPEAT = 3
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(10) NOT NULL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at DATETIME NOT NULL,
+        duration_ms INT NOT NULL
+    )
+"""
+
+
+def discover():
+    """migrations/ 의 파일 → [(version, name, path)] (번호 순)"""
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            found.append((match.group(1), filename, os.path.join(MIGRATIONS_DIR, filename)))
+    versions = [version for version, _, _ in found]
+    duplicated = {v for v in versions if versions.count(v) > 1}
+    if duplicated:
+        raise RuntimeError(f"같은 번호의 마이그레이션이 있습니다: {', '.join(sorted(duplicated))}")
+    return found
+
+
+def applied_versions(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(CREATE_TABLE)
+        cursor.execute("SELECT version FROM schema_migrations")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def split_statements(sql):
+    """주석 줄을 빼고 ';' 기준으로 문장 분리"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def _run_sql_file(conn, path):
+    with open(path, encoding="utf-8") as f:
+        statements = split_statements(f.read())
+    with conn.cursor() as cursor:
+        for stmt in statements:
+            try:
+                cursor.execute(stmt)
+            except pymysql.err.MySQLError as e:
+                if e.args and e.args[0] in ALREADY_EXISTS_ERRORS:
+                    print(f"  ⚠️ 이미 적용됨: {e.args[1]}")
+                    continue
+                raise
+
+
+def _run_py_file(conn, path):
+    spec = importlib.util.spec_from_file_location(f"migration_{os.path.basename(path)[:-3]}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.upgrade(conn)
+
+
+def apply(conn, version, name, path):
+    start = time.perf_counter()
+    try:
+        if path.endswith(".sql"):
+            _run_sql_file(conn, path)
+        else:
+            _run_py_file(conn, path)
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        with conn.cursor() as cursor:
+            cursor.execute("INSERT INTO schema_migrations (version, name, applied_at, duration_ms) "
+                           "VALUES (%s, %s, NOW(), %s)", (version, name, duration_ms))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return duration_ms
+
+
+def migrate(conn):
+    """아직 적용 안 된 마이그레이션을 순서대로 적용 → 적용한 파일 이름 리스트"""
+    done = applied_versions(conn)
+    applied = []
+    for version, name, path in discover():
+        if version in done:
+            continue
+        print(f"▶ {name} 적용 중...")
+        duration_ms = apply(conn, version, name, path)
+        print(f"✅ {name} ({duration_ms}ms)")
+        applied.append(name)
+    return applied
+
+
+def _explain(cursor, sql, params):
+    cursor.execute("EXPLAIN " + sql, params)
+    names = [d[0] for d in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def probe(conn, day):
+    """PROBE_QUERIES 의 EXPLAIN 과 실행 시간(PROBE_REPEAT 번 중 최소) 측정"""
+    next_day = (datetime.datetime.strptime(day, "%Y-%m-%d") + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+    results = {}
+    with conn.cursor() as cursor:
+        for name, sql, make_params in PROBE_QUERIES:
+            params = make_params(day, next_day)
+            try:
+                plan = _explain(cursor, sql, params)
+                timings = []
+                for _ in range(PROBE_REPEAT):
+                    start = time.perf_counter()
+                    cursor.execute(sql, params)
+                    rows = len(cursor.fetchall())
+                    timings.append((time.perf_counter() - start) * 1000)
+            except pymysql.err.MySQLError as e:
+                results[name] = {"error": str(e)}
+                continue
+            results[name] = {"rows": rows, "best_ms": round(min(timings), 3), "explain": plan}
+    conn.commit()
+    return results
+
+
+def print_probe(title, results):
+    print(f"\n📊 {title}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"  {name:<22} ❌ {result['error']}")
+            continue
+        plan = result["explain"][0] if result["explain"] else {}
+        print(f"  {name:<22} {result['best_ms']:>9.3f}ms  rows={result['rows']:<6} "
+              f"type={plan.get('type')} key={plan.get('key')} examined={plan.get('rows')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션")
+    parser.add_argument("command", nargs="?", choices=["up", "status"], default="up")
+    parser.add_argument("--report", help="적용 전/후 EXPLAIN · 실행 시간을 저장할 JSON 파일")
+    parser.add_argument("--date", default=(datetime.date.today() - datetime.timedelta(days=1)).isoformat(),
+                        help="비교 쿼리에 쓸 날짜 (기본: 어제)")
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    if not conn:
+        sys.exit(1)
+    try:
+        if args.command == "status":
+            done = applied_versions(conn)
+            for version, name, _ in discover():
+                print(f"{'✅' if version in done else '⏳'} {name}")
+            return
+
+        before = probe(conn, args.date) if args.report else None
+        applied = migrate(conn)
+        if not applied:
+            print("✅ 적용할 마이그레이션이 없습니다.")
+        if args.report:
+            after = probe(conn, args.date)
+            print_probe("적용 전", before)
+            print_probe("적용 후", after)
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump({"date": args.date, "applied": applied, "before": before, "after": after},
+                          f, ensure_ascii=False, indent=2, default=str)
+            print(f"\n📝 리포트 저장: {args.report}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+-- 날짜 범위 조회용 복합 인덱스
+-- published_at / news_date / sale_date 를 LIKE 'YYYY-MM-DD%' 대신 [date, date + 1일) 범위로 조회하도록 바꾸면서 추가
+
+CREATE INDEX idx_ytb_video_store_published ON ytb_video (store_type, published_at);
+
+CREATE INDEX idx_news_search_store_date ON news_search (store_type, news_date);
+
+-- 하루치 전체 매장 조회 (detect_sales_anomalies)
+CREATE INDEX idx_all_sale_date_store ON all_sale (sale_date, store_type);
+
+-- 매장별 기간 조회 (get_sales_data, /sale?store_type=...&start_date=...)
+CREATE INDEX idx_all_sale_store_date ON all_sale (store_type, sale_date, id_sale);
@@ -0,0 +1,40 @@
+# event_img 에 content_hash(store_type + event_title + img_url 의 SHA1) 컬럼과 unique 인덱스 추가
+#
+# 기존 행은 SQL 로 한 번에 채우고, 같은 해시가 여러 행이면 가장 이른 시작일 행 하나만 해시를 남긴다
+# (나머지는 NULL → unique 인덱스에 걸리지 않음). 해시 계산식은 event_store.content_hash 와 같아야 한다.
+import pymysql
+
+BACKFILL_BATCH = 5000
+
+
+def upgrade(conn):
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute("ALTER TABLE event_img ADD COLUMN content_hash CHAR(40) NULL")
+        except pymysql.err.MySQLError as e:
+            if e.args[0] != 1060:  # 이미 컬럼이 있음
+                raise
+
+        while True:
+            cursor.execute(
+                "UPDATE event_img SET content_hash = SHA1(CONCAT_WS(CHAR(31), store_type, event_title, img_url)) "
+                f"WHERE content_hash IS NULL LIMIT {BACKFILL_BATCH}")
+            conn.commit()
+            if cursor.rowcount < BACKFILL_BATCH:
+                break
+
+        cursor.execute("SELECT content_hash, COUNT(*) FROM event_img WHERE content_hash IS NOT NULL "
+                       "GROUP BY content_hash HAVING COUNT(*) > 1")
+        duplicates = cursor.fetchall()
+        for content_hash, count in duplicates:
+            cursor.execute("UPDATE event_img SET content_hash = NULL WHERE content_hash = %s "
+                           f"ORDER BY start_date DESC LIMIT {count - 1}", (content_hash,))
+        conn.commit()
+        if duplicates:
+            print(f"  ⚠️ 중복 이벤트 {sum(count - 1 for _, count in duplicates)}개 행은 해시 없이 남겨 둠")
+
+        try:
+            cursor.execute("CREATE UNIQUE INDEX uq_event_img_content_hash ON event_img (content_hash)")
+        except pymysql.err.MySQLError as e:
+            if e.args[0] != 1061:  # 이미 인덱스가 있음
+                raise
@@ -0,0 +1,20 @@
+-- 이벤트 이미지 로컬 캐시 (event_images.py)
+-- url_hash   : SHA1(img_url) — event_img 와 이 값으로 연결
+-- sha256     : 원본 파일 내용의 SHA-256 (저장 경로 이름, 같은 이미지는 한 번만 저장)
+-- dhash      : 64비트 perceptual hash (difference hash), 다른 비트 수(해밍 거리)가 작으면 비슷한 이미지
+-- duplicate_of : 먼저 저장된 비슷한 이미지의 sha256 (다시 올라온 같은 배너), 없으면 NULL
+
+CREATE TABLE event_image (
+    url_hash CHAR(40) NOT NULL PRIMARY KEY,
+    img_url VARCHAR(1024) NOT NULL,
+    sha256 CHAR(64) NULL,
+    dhash BIGINT UNSIGNED NULL,
+    width INT NULL,
+    height INT NULL,
+    bytes INT NULL,
+    content_type VARCHAR(64) NULL,
+    duplicate_of CHAR(64) NULL,
+    status VARCHAR(16) NOT NULL,
+    fetched_at DATETIME NOT NULL,
+    KEY idx_event_image_sha256 (sha256)
+) DEFAULT CHARSET = utf8mb4;
@@ -0,0 +1,11 @@
+-- 테이블 변경 카운터 (sale_cache 의 응답 버전)
+-- 새 행은 MAX(id_sale) 로 알 수 있지만 기존 행 수정 / 삭제는 알 수 없으므로,
+-- 그런 작업을 한 쪽에서 version 을 올린다 (sale_cache.bump_table_version)
+
+CREATE TABLE IF NOT EXISTS table_version (
+    name VARCHAR(50) NOT NULL PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO table_version (name, version) VALUES ('all_sale', 0);
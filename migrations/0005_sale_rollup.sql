@@ -0,0 +1,32 @@
+-- 일 / 주 / 월 매출 집계 테이블 (sale_rollup.py)
+-- 예전에는 /sale/summary 요청 안에서 CREATE TABLE 했지만, 조회 요청은 읽기만 하도록 여기로 옮김
+-- 집계 갱신은 scheduler.py 의 rollup 작업 (또는 python sale_rollup.py)
+
+CREATE TABLE IF NOT EXISTS sale_rollup (
+    period VARCHAR(10) NOT NULL,
+    period_start DATE NOT NULL,
+    store_type VARCHAR(20) NOT NULL,
+    days INT NOT NULL DEFAULT 0,
+    store_count DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    sum_amount DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    man10 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    man20 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    man30 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    man40 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    man50 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    man60 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    woman10 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    woman20 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    woman30 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    woman40 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    woman50 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    woman60 DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, store_type, period_start)
+);
+
+CREATE TABLE IF NOT EXISTS sale_rollup_state (
+    name VARCHAR(50) NOT NULL PRIMARY KEY,
+    last_id_sale BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT IGNORE INTO sale_rollup_state (name, last_id_sale) VALUES ('all_sale', 0);
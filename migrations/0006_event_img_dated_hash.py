@@ -0,0 +1,40 @@
+# GS25 이벤트의 content_hash 에 시작일 / 종료일을 포함
+#
+# GS25 는 같은 제목 · 같은 이미지로 기간만 바꿔 다시 여는 이벤트가 있어서, 예전 크롤러는 기간까지 비교해 중복을 걸렀다.
+# 0002 의 (store_type, event_title, img_url) 해시로는 재개된 이벤트가 중복으로 버려지므로
+# event_store.DATED_STORES 에 있는 편의점은 날짜(YYYY-MM-DD)까지 넣어 다시 계산한다.
+# 해시 계산식은 event_store.content_hash 와 같아야 한다.
+import pymysql
+
+DATED_STORES = ["GS25"]
+
+DATED_HASH = ("SHA1(CONCAT_WS(CHAR(31), store_type, event_title, img_url, "
+              "REPLACE(LEFT(start_date, 10), '.', '-'), REPLACE(LEFT(end_date, 10), '.', '-')))")
+
+
+def upgrade(conn):
+    placeholders = ",".join(["%s"] * len(DATED_STORES))
+    with conn.cursor() as cursor:
+        # 다시 계산하는 동안 잠깐 같은 해시가 생길 수 있으므로 unique 인덱스를 내렸다가 다시 만듦
+        try:
+            cursor.execute("DROP INDEX uq_event_img_content_hash ON event_img")
+        except pymysql.err.MySQLError as e:
+            if e.args[0] != 1091:  # 인덱스 없음
+                raise
+
+        cursor.execute(f"UPDATE event_img SET content_hash = {DATED_HASH} WHERE store_type IN ({placeholders})",
+                       DATED_STORES)
+
+        # 기간까지 같은 행이 여러 개면 0002 와 같이 가장 이른 시작일 행 하나만 해시를 남김
+        cursor.execute("SELECT content_hash, COUNT(*) FROM event_img "
+                       f"WHERE content_hash IS NOT NULL AND store_type IN ({placeholders}) "
+                       "GROUP BY content_hash HAVING COUNT(*) > 1", DATED_STORES)
+        duplicates = cursor.fetchall()
+        for content_hash, count in duplicates:
+            cursor.execute("UPDATE event_img SET content_hash = NULL WHERE content_hash = %s "
+                           f"ORDER BY start_date DESC LIMIT {count - 1}", (content_hash,))
+        conn.commit()
+        if duplicates:
+            print(f"  ⚠️ 중복 이벤트 {sum(count - 1 for _, count in duplicates)}개 행은 해시 없이 남겨 둠")
+
+        cursor.execute("CREATE UNIQUE INDEX uq_event_img_content_hash ON event_img (content_hash)")
@@ -0,0 +1,43 @@
+# event_plus 에 row_hash(행 전체 값의 SHA1) 컬럼과 unique 인덱스 추가
+#
+# plus_schedule.py 가 중간에 멈췄다가 다시 크롤링할 때 이미 저장한 행을 INSERT IGNORE 로 건너뛰기 위한 키.
+# 기존 행은 SQL 로 채우고, 같은 값의 행이 여러 개면 하나만 해시를 남긴다 (나머지는 NULL → unique 인덱스에 걸리지 않음).
+# 해시 계산식은 plus_schedule.row_hash 와 같아야 한다.
+import pymysql
+
+BACKFILL_BATCH = 5000
+
+ROW_HASH = ("SHA1(CONCAT_WS(CHAR(31), store_type, update_date, plus_title, plus_price, plus_event_price, "
+            "plus_type))")
+
+
+def upgrade(conn):
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute("ALTER TABLE event_plus ADD COLUMN row_hash CHAR(40) NULL")
+        except pymysql.err.MySQLError as e:
+            if e.args[0] != 1060:  # 이미 컬럼이 있음
+                raise
+
+        while True:
+            cursor.execute(f"UPDATE event_plus SET row_hash = {ROW_HASH} WHERE row_hash IS NULL "
+                           f"LIMIT {BACKFILL_BATCH}")
+            conn.commit()
+            if cursor.rowcount < BACKFILL_BATCH:
+                break
+
+        cursor.execute("SELECT row_hash, COUNT(*) FROM event_plus WHERE row_hash IS NOT NULL "
+                       "GROUP BY row_hash HAVING COUNT(*) > 1")
+        duplicates = cursor.fetchall()
+        for row_hash, count in duplicates:
+            cursor.execute(f"UPDATE event_plus SET row_hash = NULL WHERE row_hash = %s LIMIT {count - 1}",
+                           (row_hash,))
+        conn.commit()
+        if duplicates:
+            print(f"  ⚠️ 같은 값의 행 {sum(count - 1 for _, count in duplicates)}개는 해시 없이 남겨 둠")
+
+        try:
+            cursor.execute("CREATE UNIQUE INDEX uq_event_plus_row_hash ON event_plus (row_hash)")
+        except pymysql.err.MySQLError as e:
+            if e.args[0] != 1061:  # 이미 인덱스가 있음
+                raise
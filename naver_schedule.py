@@ -10,39 +10,50 @@ logging.basicConfig(filename='/home/ubuntu/market/naver_schedule.log',
                     level=logging.DEBUG, 
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
-# 데이터프레임 불러오기
-try:
-    df_new = pd.read_csv('./trend_data2.csv', header=0)  # 첫 번째 행을 컬럼 이름으로 사용
-    logging.info("Data loaded successfully.")
-except Exception as e:
-    logging.error(f"Error loading data from CSV: {e}")
-    raise  # 예외 발생 시 스크립트 중지
-
-# 수동으로 컬럼 이름 지정
-df_new.columns = ['DATE', 'seven', 'GS25', 'CU', 'cs']
-
-# 날짜 컬럼을 datetime 형식으로 변환 (시간은 날려버림)
-try:
-    df_new['DATE'] = pd.to_datetime(df_new['DATE']).dt.date  # 시간 부분 제거하고 날짜만 추출
-    logging.info("DATE column converted to datetime format.")
-except Exception as e:
-    logging.error(f"Error converting DATE column: {e}")
-    raise  # 예외 발생 시 스크립트 중지
-
-# MySQL 연결
-try:
-    db = mysql.connector.connect(
-        host='3.35.236.56',
-        user='kdy',
-        password='0710',
-        database='crawling',
-        charset='utf8mb4'
-    )
-    cursor = db.cursor()
-    logging.info("Connected to MySQL database successfully.")
-except mysql.connector.Error as e:
-    logging.error(f"Error connecting to MySQL: {e}")
-    raise  # 예외 발생 시 스크립트 중지
+# 데이터프레임 (처음 insert_data 를 실행할 때 불러옴)
+df_new = None
+
+def load_data():
+    global df_new
+    if df_new is not None:
+        return df_new
+
+    try:
+        data = pd.read_csv('./trend_data2.csv', header=0)  # 첫 번째 행을 컬럼 이름으로 사용
+        logging.info("Data loaded successfully.")
+    except Exception as e:
+        logging.error(f"Error loading data from CSV: {e}")
+        raise  # 예외 발생 시 스크립트 중지
+
+    # 수동으로 컬럼 이름 지정
+    data.columns = ['DATE', 'seven', 'GS25', 'CU', 'cs']
+
+    # 날짜 컬럼을 datetime 형식으로 변환 (시간은 날려버림)
+    try:
+        data['DATE'] = pd.to_datetime(data['DATE']).dt.date  # 시간 부분 제거하고 날짜만 추출
+        logging.info("DATE column converted to datetime format.")
+    except Exception as e:
+        logging.error(f"Error converting DATE column: {e}")
+        raise  # 예외 발생 시 스크립트 중지
+
+    df_new = data
+    return df_new
+
+# MySQL 연결 (실행할 때마다 연결하고 끝나면 닫음)
+def connect_db():
+    try:
+        db = mysql.connector.connect(
+            host='3.35.236.56',
+            user='kdy',
+            password='0710',
+            database='crawling',
+            charset='utf8mb4'
+        )
+        logging.info("Connected to MySQL database successfully.")
+        return db
+    except mysql.connector.Error as e:
+        logging.error(f"Error connecting to MySQL: {e}")
+        raise  # 예외 발생 시 스크립트 중지
 
 # 마지막 삽입 날짜 파일 경로
 last_insert_file = "last_insert_date_naver.txt"
@@ -73,7 +84,9 @@ def update_last_insert_date(date):
 
 # 데이터 삽입 함수
 def insert_data():
+    db = None
     try:
+        df_new = load_data()
         last_insert_date = get_last_insert_date()  # 마지막 삽입 날짜 가져오기
 
         # last_insert_date 이후 하루씩 데이터를 가져옵니다.
@@ -81,6 +94,9 @@ def insert_data():
 
         # 데이터가 존재하면 삽입
         if not next_day_data.empty:
+            db = connect_db()
+            cursor = db.cursor()
+
             # 데이터 삽입
             for index, row in next_day_data.iterrows():
                 date_value = row['DATE']
@@ -100,17 +116,23 @@ def insert_data():
             logging.info(f"No new data to insert for {last_insert_date + timedelta(days=1)}.")  # 새로운 데이터가 없을 경우
     except Exception as e:
         logging.error(f"Error inserting data: {e}")
-        db.rollback()  # 오류 발생 시 롤백
+        if db is not None:
+            db.rollback()  # 오류 발생 시 롤백
         raise  # 예외 발생 시 스크립트 중지
-
-# 매일 1시에 실행
-schedule.every().day.at("09:40").do(insert_data)
-
-# 계속 실행
-while True:
-    try:
-        schedule.run_pending()  # 예약된 작업 실행
-        time.sleep(60)  # 매분 확인
-    except Exception as e:
-        logging.error(f"Error in scheduler loop: {e}")
-        time.sleep(60)  # 오류 발생시에도 계속 실행되도록
+    finally:
+        if db is not None:
+            db.close()
+
+# 단독 실행할 때만 자체 스케줄 루프 사용 (평소에는 scheduler.py 가 insert_data 를 실행)
+if __name__ == "__main__":
+    # 매일 1시에 실행
+    schedule.every().day.at("09:40").do(insert_data)
+
+    # 계속 실행
+    while True:
+        try:
+            schedule.run_pending()  # 예약된 작업 실행
+            time.sleep(60)  # 매분 확인
+        except Exception as e:
+            logging.error(f"Error in scheduler loop: {e}")
+            time.sleep(60)  # 오류 발생시에도 계속 실행되도록
@@ -1,15 +1,21 @@
+import hashlib
 import requests
-from bs4 import BeautifulSoup
 import pymysql
 from datetime import datetime
 import re
 import schedule
 import time
 import logging
+import http_client
+import extract
+import crawl_metrics
+import checkpoint
+import event_store
+from concurrent.futures import ThreadPoolExecutor
 
 # 로그 설정 (로그 파일에 기록)
-logging.basicConfig(filename='/home/ubuntu/market/CU_schedule.log', 
-                    level=logging.DEBUG, 
+logging.basicConfig(filename='/home/ubuntu/market/plus_schedule.log', 
+                    level=logging.INFO, 
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
 # 브랜드별 기본 URL 설정
@@ -19,6 +25,15 @@ base_urls = {
     "Seven": "https://pyony.com/brands/seven/?page="
 }
 
+# 브랜드별로 미리 받아 둘 페이지 수 / pyony.com 동시 요청 수 (세 브랜드 합산)
+PREFETCH_PAGES = 3
+PYONY_MAX_CONCURRENCY = 4
+# 이만큼 모이면 DB 에 저장하고 checkpoint 기록 (메모리에 쌓아 두는 행 수 제한)
+FLUSH_EVERY = 500
+# event_plus.row_hash unique 키를 만드는 마이그레이션 (이미 저장한 행은 INSERT IGNORE 로 건너뜀)
+ROW_HASH_MIGRATION = "0007"
+http_client.set_host_limit(base_urls["CU"], PYONY_MAX_CONCURRENCY)
+
 # HTTP 요청 헤더
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -55,122 +70,193 @@ def get_latest_update_date(brand):
     conn.close()
     return latest_date.strftime("%Y-%m-%d") if latest_date else "2000-01-01"
 
+# 페이지 한 장 요청 → HTML
+def fetch_page(url):
+    response = http_client.get(url, headers=headers)
+    response.raise_for_status()
+    return response.text
+
+# 행 값 전체의 SHA1 (migrations/0007 의 SHA1(CONCAT_WS(CHAR(31), ...)) 와 같은 값)
+def row_hash(row):
+    return hashlib.sha1("\x1f".join(str(v) for v in row).encode("utf-8")).hexdigest()
+
+# 모은 행을 DB 에 저장 (이미 있는 행은 row_hash 로 무시) → 새로 넣은 행 수
+# 다시 크롤링할 때 쓸 기준 날짜를 checkpoint 로 남김
+def flush_rows(conn, brand, rows, latest_update_date):
+    insert_sql = """
+    INSERT IGNORE INTO event_plus (store_type, update_date, plus_title, plus_price, plus_event_price, plus_type, row_hash)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """
+    cursor = conn.cursor()
+    cursor.executemany(insert_sql, [(*row, row_hash(row)) for row in rows])
+    inserted = cursor.rowcount
+    conn.commit()
+    cursor.close()
+    crawl_metrics.add_items(inserted)
+    # 이어서 할 때도 처음 읽은 기준 날짜를 써야 함 (DB 의 MAX(update_date) 는 방금 넣은 행으로 바뀜)
+    checkpoint.save(f"plus_{brand}", {"latest_update_date": latest_update_date})
+    print(f"💾 {brand} {inserted}개 저장 (이미 있는 행 {len(rows) - inserted}개 무시)")
+    rows.clear()
+    return inserted
+
 # 크롤링 실행
 def run_crawling(brand):
     print(f"🔍 {brand} 크롤링 시작...")
 
     base_url = base_urls[brand]
-    latest_update_date = get_latest_update_date(brand)
+    state = checkpoint.load(f"plus_{brand}")
+    if state:
+        # 지난 실행이 중간에 멈춤 → 저장해 둔 기준 날짜로 1 페이지부터 다시
+        # (그 사이 새 상품이 올라오면 페이지가 밀리므로 페이지 번호로 이어 가지 않음, 이미 넣은 행은 INSERT IGNORE 로 건너뜀)
+        latest_update_date = state["latest_update_date"]
+        print(f"♻️ {brand} checkpoint 의 기준 날짜로 다시 크롤링 (기준 날짜 {latest_update_date})")
+    else:
+        latest_update_date = get_latest_update_date(brand)
+    page = 1
     print(f"📅 {brand} 최신 업데이트 날짜: {latest_update_date}")
 
-    page = 1
-    previous_page_content = None
-    new_data = []
+    previous_page_fingerprint = None
+    new_data = []  # 아직 저장하지 않은 행 (FLUSH_EVERY 개를 넘으면 페이지 단위로 저장)
+    total = 0
+    conn = None
+    spec = extract.pyony_card_spec(brand)
+    done = False
+    completed = False  # 끝까지 크롤링했으면 True (요청 실패로 멈추면 checkpoint 를 남겨 둠)
 
-    while True:
-        print(f"📄 {brand} {page} 페이지 크롤링 중...")
-        url = f"{base_url}{page}"
+    try:
+        # 지금 파싱하는 페이지 뒤로 PREFETCH_PAGES 장을 미리 요청해 둠
+        with ThreadPoolExecutor(max_workers=PREFETCH_PAGES) as executor:
+            pages = {}  # 페이지 번호 -> future
 
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"❌ 요청 실패: {e}")
-            break
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        items = soup.find_all("div", class_="col-md-6")
-
-        if not items:
-            print(f"🚨 {brand} 마지막 페이지입니다. 크롤링 종료.")
-            break
-
-        current_page_products = "".join(str(item) for item in items)
-        if previous_page_content == current_page_products:
-            print(f"🚨 {brand} 현재 페이지는 이전 페이지와 동일합니다. 크롤링 완료!")
-            break
-
-        for item in items:
-            update_date = item.find("small", class_="float-right text-white mr-3")
-            title = item.find("strong")
-            price_tag = item.find("i", class_="fa-coins")
-            price = price_tag.next_sibling.strip() if price_tag else "0원"
-            event_price_tag = item.find("span", class_="text-muted small")
-
-            # 브랜드별 이벤트 타입 클래스 설정
-            if brand == "GS25":
-                plus_type_tag = item.find("span", class_="badge bg-gs25 text-white")
-            elif brand == "CU":
-                plus_type_tag = item.find("span", class_="badge bg-cu text-white")
-            else:
-                plus_type_tag = item.find("span", class_="badge bg-seven text-white")
-
-            update_date_text = update_date.get_text(strip=True) if update_date else "날짜 없음"
-            formatted_update_date = format_update_date(update_date_text)
-
-            if formatted_update_date <= latest_update_date:
-                print(f"✅ {brand} 이미 저장된 최신 업데이트 날짜 이후 데이터가 없습니다. 크롤링 종료.")
-                return
-
-            formatted_price = format_price(price)
-            formatted_event_price = format_price(event_price_tag.get_text(strip=True).strip("() ")) if event_price_tag else 0
-
-            new_data.append((
-                brand,
-                formatted_update_date,
-                title.get_text(strip=True) if title else "제목 없음",
-                formatted_price,
-                formatted_event_price,
-                plus_type_tag.get_text(strip=True) if plus_type_tag else "이벤트 없음"
-            ))
-
-        previous_page_content = current_page_products
-        page += 1
-
-    if new_data:
-        print(f"📌 {brand} 새로운 데이터 {len(new_data)}개를 DB에 저장합니다.")
-        conn = pymysql.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        insert_sql = """
-        INSERT INTO event_plus (store_type, update_date, plus_title, plus_price, plus_event_price, plus_type)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        cursor.executemany(insert_sql, new_data)
-        conn.commit()
-        cursor.close()
-        conn.close()
-        print(f"✅ {brand} DB 업데이트 완료!")
+            while not done:
+                for ahead in range(page, page + PREFETCH_PAGES + 1):
+                    if ahead not in pages:
+                        pages[ahead] = executor.submit(crawl_metrics.propagate(fetch_page), f"{base_url}{ahead}")
+
+                print(f"📄 {brand} {page} 페이지 크롤링 중...")
+                try:
+                    html = pages.pop(page).result()
+                except requests.exceptions.RequestException as e:
+                    print(f"❌ 요청 실패: {e}")
+                    break
+
+                items = extract.extract_items(html, spec)
+                crawl_metrics.add_pages()
+
+                if not items:
+                    print(f"🚨 {brand} 마지막 페이지입니다. 크롤링 종료.")
+                    completed = True
+                    break
+
+                current_page_fingerprint = extract.fingerprint(items)
+                if previous_page_fingerprint == current_page_fingerprint:
+                    print(f"🚨 {brand} 현재 페이지는 이전 페이지와 동일합니다. 크롤링 완료!")
+                    completed = True
+                    break
+
+                for item in items:
+                    formatted_update_date = format_update_date(item["update_date"] or "날짜 없음")
+
+                    # 이미 저장된 날짜까지 왔으면 종료 (그 전까지 모은 데이터는 아래에서 저장)
+                    if formatted_update_date <= latest_update_date:
+                        print(f"✅ {brand} 이미 저장된 최신 업데이트 날짜 이후 데이터가 없습니다. 크롤링 종료.")
+                        done = completed = True
+                        break
+
+                    formatted_price = format_price(item["price"] or "0원")
+                    formatted_event_price = format_price(item["event_price"].strip("() ")) if item["event_price"] else 0
+
+                    new_data.append((
+                        brand,
+                        formatted_update_date,
+                        item["title"] or "제목 없음",
+                        formatted_price,
+                        formatted_event_price,
+                        item["plus_type"] or "이벤트 없음"
+                    ))
+
+                previous_page_fingerprint = current_page_fingerprint
+                page += 1
+
+                if len(new_data) >= FLUSH_EVERY and not done:
+                    conn = conn or pymysql.connect(**DB_CONFIG)
+                    total += flush_rows(conn, brand, new_data, latest_update_date)
+
+            # 종료 조건에 걸렸으면 미리 요청해 둔 페이지는 버림
+            for future in pages.values():
+                future.cancel()
+
+        if new_data:
+            print(f"📌 {brand} 새로운 데이터 {len(new_data)}개를 DB에 저장합니다.")
+            conn = conn or pymysql.connect(**DB_CONFIG)
+            total += flush_rows(conn, brand, new_data, latest_update_date)
+    finally:
+        if conn is not None:
+            conn.close()
+
+    if completed:
+        checkpoint.clear(f"plus_{brand}")
+    if total:
+        print(f"✅ {brand} DB 업데이트 완료! ({total}개)")
     else:
         print(f"✅ {brand} 새로운 데이터가 없습니다. 업데이트하지 않습니다.")
 
-# 업데이트 확인 후 크롤링 실행
-def check_and_run_crawling():
-    print("🕛 자정 크롤링 확인 시작...")
-    for brand in base_urls.keys():
-        latest_update_date = get_latest_update_date(brand)
-        print(f"🔍 {brand}의 최신 업데이트 날짜: {latest_update_date}")
-
-        # 웹사이트에서 최신 업데이트 날짜 확인
-        url = f"{base_urls[brand]}1"  # 첫 번째 페이지만 확인
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, "html.parser")
-        update_date = soup.find("small", class_="float-right text-white mr-3")
-
-        if update_date:
-            new_update_date = format_update_date(update_date.get_text(strip=True))
-            if new_update_date > latest_update_date:
-                print(f"🚀 {brand} 업데이트 감지됨! 크롤링 시작")
-                run_crawling(brand)
-            else:
-                print(f"✅ {brand} 업데이트 변경 없음.")
+# 브랜드 하나의 업데이트 확인 후 크롤링 실행
+def check_brand(brand):
+    if checkpoint.load(f"plus_{brand}"):
+        print(f"♻️ {brand} 지난 크롤링이 끝나지 않아 이어서 실행")
+        run_crawling(brand)
+        return
+
+    latest_update_date = get_latest_update_date(brand)
+    print(f"🔍 {brand}의 최신 업데이트 날짜: {latest_update_date}")
+
+    # 웹사이트에서 최신 업데이트 날짜 확인
+    url = f"{base_urls[brand]}1"  # 첫 번째 페이지만 확인
+    try:
+        response = http_client.get(url, headers=headers)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"❌ {brand} 요청 실패: {e}")
+        return
+    if response.not_modified:
+        print(f"♻️ {brand} 첫 페이지 변경 없음 (304)")
+    items = extract.extract_items(response.text, extract.pyony_card_spec(brand))
+    crawl_metrics.add_pages()
+    update_date = next((item["update_date"] for item in items if item["update_date"]), None)
+
+    if update_date:
+        new_update_date = format_update_date(update_date)
+        if new_update_date > latest_update_date:
+            print(f"🚀 {brand} 업데이트 감지됨! 크롤링 시작")
+            run_crawling(brand)
         else:
-            print(f"⚠️ {brand}에서 업데이트 날짜를 찾을 수 없음.")
+            print(f"✅ {brand} 업데이트 변경 없음.")
+    else:
+        print(f"⚠️ {brand}에서 업데이트 날짜를 찾을 수 없음.")
 
-# 스케줄 설정 (매일 자정 실행)
-schedule.every().day.at("11:49").do(check_and_run_crawling)
+# 업데이트 확인 후 크롤링 실행 (브랜드별 동시 실행)
+def check_and_run_crawling():
+    print("🕛 자정 크롤링 확인 시작...")
+    # row_hash 마이그레이션 전이면 크롤링하기 전에 멈춤
+    conn = pymysql.connect(**DB_CONFIG)
+    try:
+        event_store.check_schema(conn, ROW_HASH_MIGRATION)
+    finally:
+        conn.close()
+    with ThreadPoolExecutor(max_workers=len(base_urls)) as executor:
+        futures = {brand: executor.submit(crawl_metrics.propagate(check_brand), brand) for brand in base_urls}
+    for brand, future in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            print(f"❌ {brand} 크롤링 실패: {e}")
+            logging.exception(f"{brand} 크롤링 실패")
 
 if __name__ == "__main__":
+    # 스케줄 설정 (매일 자정 실행) — 단독 실행할 때만 (평소에는 scheduler.py 가 실행)
+    schedule.every().day.at("11:49").do(check_and_run_crawling)
+
     print("🚀 크롤링 스케줄러 실행 중...")
     
     while True:
@@ -1,12 +1,16 @@
 from .view_route import view_route
 from .user_route import user_route
+from .asset_route import asset_route
+from .image_route import image_route
 
 
 
 
 blueprints = [
    (view_route,"/"),
-   (user_route,"/api/user")
+   (user_route,"/api/user"),
+   (asset_route,"/assets"),
+   (image_route,"/images")
 ]
 
 
@@ -0,0 +1,76 @@
+import json
+import mimetypes
+import os
+
+from flask import Blueprint, abort, current_app, request, send_from_directory, url_for
+
+asset_route = Blueprint('asset',__name__)
+
+# 해시가 붙은 파일은 내용이 바뀌면 주소도 바뀌므로 1년 동안 다시 묻지 않게 함
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# manifest.json 이나 해시가 없는 파일은 같은 주소로 내용이 바뀌므로 매번 확인(ETag/Last-Modified)
+REVALIDATE_CACHE = "no-cache"
+
+# Accept-Encoding 에 따라 우선 보낼 압축본 (확장자, Content-Encoding)
+ENCODINGS = [(".br", "br"), (".gz", "gzip")]
+
+_manifest = {"mtime": None, "data": {}}
+
+
+def _dist_dir():
+    return os.path.join(current_app.static_folder, "dist")
+
+
+def load_manifest():
+    """build_assets.py 가 만든 manifest.json (파일이 바뀌면 다시 읽음)"""
+    path = os.path.join(_dist_dir(), "manifest.json")
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    if _manifest["mtime"] != mtime:
+        with open(path, encoding="utf-8") as f:
+            _manifest["data"] = json.load(f)
+        _manifest["mtime"] = mtime
+    return _manifest["data"]
+
+
+@asset_route.app_context_processor
+def inject_asset_url():
+    def asset_url(filename):
+        """빌드된 파일이 있으면 해시가 붙은 주소, 없으면 기존 /static 주소"""
+        hashed = load_manifest().get(filename)
+        if hashed:
+            return url_for('asset.serve_asset', filename=hashed)
+        return url_for('static', filename=filename)
+    return {"asset_url": asset_url}
+
+
+def is_fingerprinted(filename):
+    """manifest 에 해시가 붙은 이름으로 올라 있는 파일인지"""
+    return filename in load_manifest().values()
+
+
+@asset_route.route("/<path:filename>")
+def serve_asset(filename):
+    dist_dir = _dist_dir()
+    if not os.path.isfile(os.path.join(dist_dir, filename)):
+        abort(404)
+
+    immutable = is_fingerprinted(filename)
+    max_age = 31536000 if immutable else 0
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    accepted = request.accept_encodings
+
+    for suffix, encoding in ENCODINGS:
+        if accepted[encoding] and os.path.isfile(os.path.join(dist_dir, filename + suffix)):
+            response = send_from_directory(dist_dir, filename + suffix, mimetype=mimetype, max_age=max_age)
+            response.headers["Content-Encoding"] = encoding
+            break
+    else:
+        response = send_from_directory(dist_dir, filename, mimetype=mimetype, max_age=max_age)
+
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE
+    response.vary.add("Accept-Encoding")
+    return response
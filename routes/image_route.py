@@ -0,0 +1,64 @@
+import os
+import re
+
+from flask import Blueprint, abort, redirect, request, send_from_directory, url_for
+
+from db import get_db_connection
+from event_images import IMAGE_DIR, thumb_path, url_hash
+
+image_route = Blueprint('image',__name__)
+
+# 썸네일은 내용 해시가 주소라 바뀌지 않음 → 1년 동안 다시 묻지 않게 함
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# img_url → 썸네일 주소 안내는 이미지 처리 전후로 바뀔 수 있어 짧게 캐시
+LOOKUP_CACHE = "public, max-age=3600"
+PENDING_CACHE = "public, max-age=300"
+
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+@image_route.route("/thumb/<sha256>.jpg")
+def serve_thumb(sha256):
+    if not SHA256_RE.match(sha256) or not os.path.isfile(thumb_path(sha256)):
+        abort(404)
+    response = send_from_directory(os.path.join(IMAGE_DIR, "thumbs"), f"{sha256[:2]}/{sha256}.jpg",
+                                   mimetype="image/jpeg", max_age=31536000)
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE
+    return response
+
+
+@image_route.route("/lookup")
+def lookup_thumb():
+    """?url=<event_img.img_url> → 썸네일로 redirect (아직 처리 전이면 원본 주소로)
+
+    임의의 주소로 보내는 open redirect 가 되지 않도록 event_img 에 있는 img_url 만 받고, 없으면 404.
+    """
+    img_url = request.args.get("url", "")
+    if not img_url.startswith(("http://", "https://")):
+        abort(400)
+
+    conn = get_db_connection()
+    if not conn:
+        abort(503)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT sha256 FROM event_image WHERE url_hash = %s AND status = 'ok'",
+                           (url_hash(img_url),))
+            row = cursor.fetchone()
+            # event_image 는 event_img 의 주소만 내려받으므로, 썸네일이 없을 때만 event_img 를 확인
+            known = row is not None
+            if not known:
+                cursor.execute("SELECT 1 FROM event_img WHERE img_url = %s LIMIT 1", (img_url,))
+                known = cursor.fetchone() is not None
+    finally:
+        conn.close()
+
+    if not known:
+        abort(404)
+    if row and os.path.isfile(thumb_path(row[0])):
+        response = redirect(url_for('image.serve_thumb', sha256=row[0]))
+        response.headers["Cache-Control"] = LOOKUP_CACHE
+    else:
+        response = redirect(img_url)
+        response.headers["Cache-Control"] = PENDING_CACHE
+    return response
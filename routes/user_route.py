@@ -1,6 +1,11 @@
 from flask import render_template,request,jsonify,Blueprint
 import pymysql
 from db import get_db_connection
+from user_cache import user_cache
+from user_bulk import BulkUserError, find_existing_ids, insert_users, load_users, validate_users
+
+# 한 번에 조회할 수 있는 최대 회원 수
+MAX_BATCH_USERS = 500
 
 user_route = Blueprint('user',__name__)
 
@@ -18,7 +23,8 @@ def addUser():
     address = data.get('addr')
 
     conn = get_db_connection()
-    cursor = conn.cursor(pymysql.cursors.DictCursor)
+    if not conn:
+        return jsonify({"message":"Database connection failed"})
 
     query = """
       INSERT INTO user 
@@ -26,31 +32,130 @@ def addUser():
       VALUES 
       (%s,md5(%s),%s,%s,%s,sysdate())
     """
-    cursor.execute(query,(id,pw,nick,type,address))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    # 풀 커넥션이 새지 않도록 실패해도 반드시 반납
+    try:
+        cursor = conn.cursor(pymysql.cursors.DictCursor)
+        cursor.execute(query,(id,pw,nick,type,address))
+        conn.commit()
+
+        # write-through: DB 가 채운 값(user_idx, md5 비밀번호, 가입일)까지 캐시에 올려둠
+        user_idx = cursor.lastrowid
+        cursor.execute("SELECT * FROM user WHERE user_idx=%s",(user_idx,))
+        user = cursor.fetchone()
+        if user:
+            user_cache.put(user_idx, user)
+        cursor.close()
+    finally:
+        conn.close()
     
     return jsonify({"message":"ok"})
 
 
 
+#회원 일괄 추가 (JSON 배열 또는 CSV 파일 업로드)
+@user_route.route("/add-users",methods=['post'])
+def addUsers():
+
+    try:
+        df = load_users(request)
+    except BulkUserError as e:
+        return jsonify({"message": str(e)}), 400
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({"message":"Database connection failed"})
+
+    try:
+        existing_ids = find_existing_ids(conn, [i for i in df['id'].unique().tolist() if i])
+        valid, errors = validate_users(df, existing_ids)
+        inserted, insert_errors = insert_users(conn, valid)
+    finally:
+        conn.close()
+
+    failed = sorted(errors + insert_errors, key=lambda e: e['row'])
+    return jsonify({
+        "message": "ok" if not failed else "partial",
+        "total": len(df),
+        "inserted": inserted,
+        "failed": failed
+    })
+
+
+
 #회원 조회
 @user_route.route("/detail-user")
 def detailUser():
     
     user_idx = request.args.get('user_idx')
 
+    key = int(user_idx) if user_idx and user_idx.isdigit() else None
+    if key is not None:
+        found, user = user_cache.get(key)
+        if found:
+            return jsonify(user)
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({"error": "Database connection failed"})
+
     try:
-        conn = get_db_connection()
         cursor = conn.cursor(pymysql.cursors.DictCursor)
         cursor.execute("SELECT * FROM user WHERE user_idx=%s",(user_idx,))
         users = cursor.fetchone()
+        cursor.close()
+        if users and key is not None:
+            user_cache.put(key, users)
         return jsonify(users)
     except Exception as e:
         return jsonify({"error": str(e)})
     finally:
-        cursor.close()
         conn.close()
 
 
+
+#회원 여러 명 조회 (GET ?user_idx=1,2,3 또는 POST {"user_idx": [1, 2, 3]})
+@user_route.route("/detail-users",methods=['get','post'])
+def detailUsers():
+
+    if request.method == 'POST':
+        body = request.json or {}
+        raw_ids = (body.get('user_idx') or []) if isinstance(body, dict) else None
+        if not isinstance(raw_ids, list):
+            # 문자열을 그대로 돌면 한 글자씩 조회하게 되므로 배열만 허용
+            return jsonify({"error": "user_idx 는 정수 배열이어야 합니다."}), 400
+    else:
+        raw_ids = [v for v in request.args.get('user_idx','').split(',') if v.strip()]
+
+    # 중복 제거 전에 길이부터 제한해서 큰 요청을 변환하느라 시간을 쓰지 않음
+    if len(raw_ids) > MAX_BATCH_USERS:
+        return jsonify({"error": f"한 번에 최대 {MAX_BATCH_USERS}명까지 조회할 수 있습니다."}), 400
+
+    try:
+        user_ids = list(dict.fromkeys(int(v) for v in raw_ids))  # 순서 유지 + 중복 제거
+    except (TypeError, ValueError):
+        return jsonify({"error": "user_idx 는 정수여야 합니다."}), 400
+
+    users, missing = user_cache.get_many(user_ids)
+
+    # 캐시에 없는 회원만 IN (...) 쿼리 한 번으로 조회
+    if missing:
+        conn = get_db_connection()
+        if not conn:
+            return jsonify({"error": "Database connection failed"})
+        try:
+            cursor = conn.cursor(pymysql.cursors.DictCursor)
+            placeholders = ",".join(["%s"] * len(missing))
+            cursor.execute(f"SELECT * FROM user WHERE user_idx IN ({placeholders})", missing)
+            for user in cursor.fetchall():
+                users[user['user_idx']] = user
+                user_cache.put(user['user_idx'], user)
+            cursor.close()
+        except Exception as e:
+            return jsonify({"error": str(e)})
+        finally:
+            conn.close()
+
+    return jsonify({
+        "users": [users[i] for i in user_ids if i in users],
+        "not_found": [i for i in user_ids if i not in users]
+    })
@@ -0,0 +1,135 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, make_response, request
+
+from db import get_db_connection
+
+# all_sale 버전 조회 결과를 재사용하는 시간(초). 대시보드가 몇 초 간격으로 폴링해도 DB 조회는 한 번만 한다.
+VERSION_TTL = 5
+# 보관할 응답 개수 (오래 안 쓴 것부터 버림)
+CACHE_MAX_ENTRIES = 256
+
+_lock = threading.Lock()
+_responses = OrderedDict()       # key -> (etag, body, status, headers)
+_version = {"value": None, "checked_at": 0.0}
+_version_seen_at = {}            # version -> 처음 본 시각 (Last-Modified 로 사용)
+
+
+# 새 행은 PK 인덱스만 보는 MAX(id_sale) 로, 기존 행 수정 / 삭제는 table_version 카운터로 알아냄
+# (COUNT(*) 는 InnoDB 에서 전체 스캔이라 쓰지 않음, table_version 은 migrations/0004_table_version.sql)
+VERSION_SQL = ("SELECT (SELECT MAX(id_sale) FROM all_sale), "
+               "(SELECT version FROM table_version WHERE name = 'all_sale')")
+
+
+def _query_table_version():
+    """all_sale 의 현재 버전. 행을 추가하거나 bump_table_version 을 호출하면 값이 바뀐다."""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(VERSION_SQL)
+            max_id, counter = cursor.fetchone()
+        return f"{max_id}-{counter}"
+    except Exception as e:
+        print(f"all_sale 버전 조회 실패: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def get_table_version():
+    now = time.monotonic()
+    with _lock:
+        if _version["value"] is not None and now - _version["checked_at"] < VERSION_TTL:
+            return _version["value"]
+
+    version = _query_table_version()
+    if version is None:
+        return None
+
+    with _lock:
+        _version["value"] = version
+        _version["checked_at"] = now
+        if version not in _version_seen_at:
+            _version_seen_at.clear()  # 이전 버전의 시각은 더 이상 필요 없음
+            _version_seen_at[version] = time.time()
+    return version
+
+
+def bump_table_version(conn, name="all_sale"):
+    """기존 행을 수정 / 삭제한 작업이 commit 전에 호출 → 다른 프로세스의 캐시도 다음 확인 때 무효화"""
+    with conn.cursor() as cursor:
+        cursor.execute("UPDATE table_version SET version = version + 1 WHERE name = %s", (name,))
+
+
+def invalidate():
+    """새 데이터를 적재한 직후 호출하면 다음 요청에서 바로 버전을 다시 확인한다."""
+    with _lock:
+        _version["value"] = None
+        _responses.clear()
+
+
+def cache_stats():
+    with _lock:
+        return {"entries": len(_responses), "version": _version["value"]}
+
+
+def _cache_key():
+    args = tuple(sorted(request.args.items(multi=True)))
+    return (request.path, args, request.headers.get("Accept", ""))
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since:
+        return int(last_modified) <= request.if_modified_since.timestamp()
+    return False
+
+
+def cached_sale_response(view):
+    """all_sale 버전 + 요청 파라미터 기준으로 응답을 캐시하고 ETag / 304 를 처리하는 데코레이터"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version = get_table_version()
+        if version is None:
+            return view(*args, **kwargs)  # 버전을 모르면 캐시 없이 그대로 처리
+
+        key = _cache_key()
+        etag = hashlib.sha1(f"{key}|{version}".encode()).hexdigest()
+        last_modified = _version_seen_at.get(version, time.time())
+
+        if _not_modified(etag, last_modified):
+            response = Response(status=304)
+        else:
+            with _lock:
+                entry = _responses.get(key)
+                if entry and entry[0] == etag:
+                    _responses.move_to_end(key)
+            if entry and entry[0] == etag:
+                _, body, status, headers = entry
+                response = Response(body, status=status, headers=headers)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    with _lock:
+                        _responses[key] = (etag, response.get_data(), 200,
+                                           {"Content-Type": response.headers["Content-Type"]})
+                        _responses.move_to_end(key)
+                        while len(_responses) > CACHE_MAX_ENTRIES:
+                            _responses.popitem(last=False)
+
+        # 오류 응답에는 검증자를 붙이지 않음 (다음 요청이 304 로 오류를 재사용하지 않도록)
+        if response.status_code in (200, 304):
+            response.set_etag(etag)
+            response.last_modified = int(last_modified)
+            response.headers["Cache-Control"] = "no-cache"  # 매번 재검증 (변경 없으면 304)
+        response.vary.add("Accept")
+        return response
+
+    return wrapper
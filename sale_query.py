@@ -0,0 +1,198 @@
+import base64
+from datetime import datetime
+
+import pymysql
+
+# all_sale 에서 API 로 내보낼 수 있는 컬럼 (기존 /sale 응답 키 순서 그대로)
+SALE_COLUMNS = [
+    "id_sale", "sale_date", "store_count", "sum_amount", "store_type",
+    "man10", "man20", "man30", "man40", "man50", "man60",
+    "woman10", "woman20", "woman30", "woman40", "woman50", "woman60",
+    "day", "kind_day"
+]
+
+# 한 페이지 기본 / 최대 행 수
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+
+class SaleQueryError(ValueError):
+    """잘못된 /sale 요청 파라미터"""
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise SaleQueryError(f"{name} 형식이 올바르지 않습니다. (YYYY-MM-DD)")
+
+
+def encode_cursor(sale_date, id_sale):
+    """(sale_date, id_sale) 을 다음 페이지 요청용 불투명 커서 문자열로 변환"""
+    if hasattr(sale_date, "strftime"):
+        sale_date = sale_date.strftime("%Y-%m-%d")
+    raw = f"{str(sale_date)[:10]}|{id_sale}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sale_date, id_sale = base64.urlsafe_b64decode(padded).decode().split("|")
+        return _parse_date(sale_date, "cursor"), int(id_sale)
+    except (ValueError, UnicodeDecodeError):
+        raise SaleQueryError("cursor 값이 올바르지 않습니다.")
+
+
+def parse_columns(value):
+    """columns=sale_date,sum_amount 형태의 파라미터를 검증된 컬럼 리스트로 변환"""
+    if not value:
+        return list(SALE_COLUMNS)
+
+    columns = []
+    for name in value.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in SALE_COLUMNS:
+            raise SaleQueryError(f"알 수 없는 컬럼입니다: {name}")
+        if name not in columns:
+            columns.append(name)
+    return columns or list(SALE_COLUMNS)
+
+
+def parse_filters(args):
+    """요청 파라미터(store_type, start_date, end_date)를 필터 dict 로 변환"""
+    filters = {}
+
+    store_types = [s.strip() for s in args.get("store_type", "").split(",") if s.strip()]
+    if store_types:
+        filters["store_type"] = store_types
+
+    if args.get("start_date"):
+        filters["start_date"] = _parse_date(args["start_date"], "start_date")
+    if args.get("end_date"):
+        filters["end_date"] = _parse_date(args["end_date"], "end_date")
+
+    if "start_date" in filters and "end_date" in filters and filters["start_date"] > filters["end_date"]:
+        raise SaleQueryError("start_date 가 end_date 보다 늦습니다.")
+
+    return filters
+
+
+def parse_limit(value):
+    if not value:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise SaleQueryError("limit 은 정수여야 합니다.")
+    if limit < 1:
+        raise SaleQueryError("limit 은 1 이상이어야 합니다.")
+    return min(limit, MAX_LIMIT)
+
+
+def build_where(filters, after=None):
+    """필터와 keyset 커서로 WHERE 절과 파라미터를 만듦"""
+    clauses = []
+    params = []
+
+    if "store_type" in filters:
+        clauses.append("store_type IN (" + ", ".join(["%s"] * len(filters["store_type"])) + ")")
+        params.extend(filters["store_type"])
+    if "start_date" in filters:
+        clauses.append("sale_date >= %s")
+        params.append(filters["start_date"])
+    if "end_date" in filters:
+        clauses.append("sale_date <= %s")
+        params.append(filters["end_date"])
+    if after is not None:
+        # (sale_date, id_sale) > (커서) 를 인덱스를 탈 수 있는 형태로 풀어 씀
+        clauses.append("(sale_date > %s OR (sale_date = %s AND id_sale > %s))")
+        params.extend([after[0], after[0], after[1]])
+
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return where, params
+
+
+def select_columns(columns):
+    """커서 계산에 필요한 sale_date, id_sale 을 항상 포함한 SELECT 컬럼 목록"""
+    selected = list(columns)
+    for key in ("sale_date", "id_sale"):
+        if key not in selected:
+            selected.append(key)
+    return selected
+
+
+def build_page_query(columns, filters, after=None, limit=DEFAULT_LIMIT):
+    """keyset 페이지네이션 쿼리 (limit + 1 개를 읽어 다음 페이지 존재 여부 판단)"""
+    where, params = build_where(filters, after)
+    sql = (
+        "SELECT " + ", ".join(f"`{c}`" for c in select_columns(columns)) +
+        " FROM all_sale" + where +
+        " ORDER BY sale_date, id_sale LIMIT %s"
+    )
+    params.append(limit + 1)
+    return sql, params
+
+
+def prepare_page_query(args):
+    """요청 파라미터를 검증하고 페이지 쿼리를 만듦 → (columns, sql, params, limit)"""
+    columns = parse_columns(args.get("columns"))
+    filters = parse_filters(args)
+    after = decode_cursor(args["cursor"]) if args.get("cursor") else None
+    limit = parse_limit(args.get("limit"))
+
+    sql, params = build_page_query(columns, filters, after, limit)
+    return columns, sql, params, limit
+
+
+def finish_page(columns, rows, limit):
+    """조회 결과(limit + 1 행)를 잘라 다음 페이지 커서를 계산 → (rows, next_cursor)"""
+    selected = select_columns(columns)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last[selected.index("sale_date")], last[selected.index("id_sale")])
+
+    # 커서 계산용으로만 붙인 컬럼은 잘라냄 (SELECT 순서상 항상 맨 뒤)
+    if len(selected) > len(columns):
+        rows = [row[:len(columns)] for row in rows]
+    return list(rows), next_cursor
+
+
+def fetch_sale_page(conn, args):
+    """요청 파라미터로 all_sale 한 페이지를 조회
+
+    반환값: (컬럼 리스트, columns 순서의 행 튜플 리스트, 다음 페이지 커서 또는 None)
+    """
+    columns, sql, params, limit = prepare_page_query(args)
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    rows, next_cursor = finish_page(columns, rows, limit)
+    return columns, rows, next_cursor
+
+
+def iter_sale_rows(conn, columns, filters, batch_size=1000):
+    """서버 측 커서(SSCursor)로 all_sale 을 batch_size 행씩 끊어서 읽음
+
+    전체 결과를 메모리에 올리지 않으므로 테이블 크기와 상관없이 메모리 사용량이 일정하다.
+    중간에 멈추면 남은 결과가 커넥션에 걸려 있으므로, 호출한 쪽에서 커넥션을 폐기(invalidate)해야 한다.
+    """
+    where, params = build_where(filters)
+    sql = (
+        "SELECT " + ", ".join(f"`{c}`" for c in columns) +
+        " FROM all_sale" + where +
+        " ORDER BY sale_date, id_sale"
+    )
+    cursor = conn.cursor(pymysql.cursors.SSCursor)
+    cursor.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield rows
+    cursor.close()
@@ -0,0 +1,159 @@
+import sys
+
+from db import get_db_connection
+from sale_cache import bump_table_version
+from sale_query import SaleQueryError, parse_filters
+
+# 합계를 내는 all_sale 컬럼
+ROLLUP_METRICS = [
+    "store_count", "sum_amount",
+    "man10", "man20", "man30", "man40", "man50", "man60",
+    "woman10", "woman20", "woman30", "woman40", "woman50", "woman60"
+]
+
+# 집계 단위별 구간 시작일 계산식 (주: 월요일 시작, 월: 1일)
+PERIODS = {
+    "day": "sale_date",
+    "week": "DATE_SUB(sale_date, INTERVAL WEEKDAY(sale_date) DAY)",
+    "month": "CAST(DATE_FORMAT(sale_date, '%%Y-%%m-01') AS DATE)",
+}
+
+# 집계 테이블은 migrations/0005_sale_rollup.sql 로 만듦
+
+
+def _rollup_sql(period):
+    expr = PERIODS[period]
+    metrics = ", ".join(ROLLUP_METRICS)
+    sums = ", ".join(f"SUM(COALESCE({m}, 0))" for m in ROLLUP_METRICS)
+    updates = ", ".join(f"{m} = {m} + VALUES({m})" for m in ["days"] + ROLLUP_METRICS)
+    return (
+        f"INSERT INTO sale_rollup (period, period_start, store_type, days, {metrics}) "
+        f"SELECT '{period}', {expr}, store_type, COUNT(*), {sums} "
+        f"FROM all_sale WHERE id_sale > %s AND id_sale <= %s "
+        f"GROUP BY {expr}, store_type "
+        f"ON DUPLICATE KEY UPDATE {updates}"
+    )
+
+
+def _apply_new_rows(conn, cursor):
+    """상태 행을 FOR UPDATE 로 잡고 워터마크 이후 행을 집계에 더함 (commit 은 호출한 쪽에서)"""
+    cursor.execute("SELECT last_id_sale FROM sale_rollup_state WHERE name = 'all_sale' FOR UPDATE")
+    last_id = cursor.fetchone()[0]
+
+    cursor.execute("SELECT MAX(id_sale), COUNT(*) FROM all_sale WHERE id_sale > %s", (last_id,))
+    new_max, new_rows = cursor.fetchone()
+    if not new_rows:
+        return 0
+
+    for period in PERIODS:
+        cursor.execute(_rollup_sql(period), (last_id, new_max))
+
+    cursor.execute("UPDATE sale_rollup_state SET last_id_sale = %s WHERE name = 'all_sale'", (new_max,))
+    # /sale/summary 캐시는 all_sale 버전을 키로 쓰므로, 집계가 바뀌면 버전도 같은 트랜잭션에서 올림
+    # (sale 적재 ~ 집계 사이에 캐시된 집계 전 합계가 계속 재사용되지 않도록)
+    bump_table_version(conn)
+    return new_rows
+
+
+def refresh_rollups(conn):
+    """지난 갱신 이후 새로 들어온 all_sale 행(id_sale 기준)만 일/주/월 집계에 더함
+
+    상태 행을 FOR UPDATE 로 잡고 진행하므로 여러 프로세스가 동시에 호출해도 중복 집계되지 않는다.
+    반환값: 이번에 반영한 행 수
+    """
+    try:
+        with conn.cursor() as cursor:
+            new_rows = _apply_new_rows(conn, cursor)
+        if not new_rows:
+            conn.rollback()
+            return 0
+        conn.commit()
+        return new_rows
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def rebuild_rollups(conn):
+    """집계 테이블을 비우고 처음부터 다시 계산 (기존 행 수정/삭제를 반영해야 할 때)
+
+    비우기와 다시 채우기를 한 트랜잭션으로 처리해, 끝나기 전까지 다른 연결은 기존 집계를 그대로 본다.
+    """
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT last_id_sale FROM sale_rollup_state WHERE name = 'all_sale' FOR UPDATE")
+            cursor.execute("DELETE FROM sale_rollup")
+            cursor.execute("UPDATE sale_rollup_state SET last_id_sale = 0 WHERE name = 'all_sale'")
+            new_rows = _apply_new_rows(conn, cursor)
+            if not new_rows:
+                bump_table_version(conn)  # 수정 / 삭제는 MAX(id_sale) 로 알 수 없으므로 /sale 캐시도 무효화
+        conn.commit()
+        return new_rows
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def fetch_summary(conn, args):
+    """집계 테이블에서 요약 조회
+
+    파라미터: period (day | week | month, 기본 week), store_type, start_date, end_date, columns
+    반환값: (컬럼 리스트, columns 순서의 행 튜플 리스트)
+    """
+    period = args.get("period", "week")
+    if period not in PERIODS:
+        raise SaleQueryError(f"period 는 {', '.join(PERIODS)} 중 하나여야 합니다.")
+
+    metrics = ROLLUP_METRICS
+    if args.get("columns"):
+        metrics = [c.strip() for c in args["columns"].split(",") if c.strip()]
+        unknown = [c for c in metrics if c not in ROLLUP_METRICS]
+        if unknown:
+            raise SaleQueryError(f"알 수 없는 컬럼입니다: {', '.join(unknown)}")
+
+    filters = parse_filters(args)
+    clauses = ["period = %s"]
+    params = [period]
+    if "store_type" in filters:
+        clauses.append("store_type IN (" + ", ".join(["%s"] * len(filters["store_type"])) + ")")
+        params.extend(filters["store_type"])
+    if "start_date" in filters:
+        clauses.append("period_start >= %s")
+        params.append(filters["start_date"])
+    if "end_date" in filters:
+        clauses.append("period_start <= %s")
+        params.append(filters["end_date"])
+
+    columns = ["period_start", "store_type", "days"] + metrics
+    sql = (
+        "SELECT " + ", ".join(columns) + " FROM sale_rollup"
+        " WHERE " + " AND ".join(clauses) +
+        " ORDER BY period_start, store_type"
+    )
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return columns, list(rows)
+
+
+def run(rebuild=False):
+    """집계 갱신 (scheduler.py 의 rollup 작업, sale 적재 이후 실행)"""
+    conn = get_db_connection()
+    if not conn:
+        raise RuntimeError("DB 연결 실패로 집계를 갱신하지 못했습니다.")
+    try:
+        count = rebuild_rollups(conn) if rebuild else refresh_rollups(conn)
+        print(f"✅ {count}개 행을 집계에 반영했습니다.")
+        return count
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    # python sale_rollup.py          → 새로 들어온 행만 반영
+    # python sale_rollup.py rebuild  → 전체 재계산
+    try:
+        run(rebuild=len(sys.argv) > 1 and sys.argv[1] == "rebuild")
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,250 @@
+# 수집 작업 스케줄러 (데몬 하나로 모든 *_schedule 작업 실행)
+#
+# - JOBS 에 "모듈:함수" 로 등록한 작업을 매일 지정 시각에 실행 (모듈은 처음 실행할 때 import)
+# - 작업마다 0~jitter 초 늦게 시작, 같은 작업이 아직 돌고 있으면 겹쳐 실행하지 않음
+# - resources 가 같은 작업(예: Chrome 을 쓰는 작업)은 RESOURCE_LIMITS 개까지만 동시에 실행
+# - 마지막 실행 시각을 STATE_FILE 에 남겨 두고, 데몬이 꺼져 있어서 놓친 실행은 catch_up 시간 안이면 바로 실행
+#
+#   python scheduler.py            # 데몬 실행
+#   python scheduler.py list       # 작업 목록 / 마지막 실행 / 다음 실행
+#   python scheduler.py run CU     # 작업 하나를 지금 실행
+#
+# browser 자원의 Chrome 드라이버는 작업이 browser_pool.lease() 로 처음 빌릴 때 띄운다
+# (GS25 처럼 HTTP 로 먼저 받고 Selenium 은 대체 경로로만 쓰는 작업은 Chrome 을 띄우지 않고 끝날 수 있음).
+# 작업 실행마다 crawl_metrics 로 처리량 / 요청 지연 / 받은 바이트를 모아 CRAWL_METRICS_FILE 에 남긴다.
+import argparse
+import datetime
+import fcntl
+import importlib
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import crawl_metrics
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.environ.get("SCHEDULER_STATE", os.path.join(ROOT, "scheduler_state.json"))
+LOCK_FILE = STATE_FILE + ".lock"
+LOG_FILE = os.environ.get("SCHEDULER_LOG", "/home/ubuntu/market/scheduler.log")
+
+# 실행 여부를 확인하는 간격(초) / 동시에 실행할 수 있는 작업 수
+TICK_SECONDS = 30
+MAX_WORKERS = 4
+
+# 자원별 동시 실행 수 (browser: headless Chrome 을 띄우는 작업)
+RESOURCE_LIMITS = {
+    "browser": 1,
+}
+
+# 작업 등록
+#   target   : "모듈:함수"
+#   at       : 매일 실행 시각 (HH:MM)
+#   jitter   : 0~jitter 초 사이로 시작을 늦춤 (같은 시각에 몰리지 않게)
+#   catch_up : 놓친 실행을 이 시간(초) 안이면 데몬이 다시 떴을 때 실행, 0 이면 건너뜀
+#   resources: 함께 쓰는 자원 (RESOURCE_LIMITS 참고)
+JOBS = {
+    "CU": {"target": "CU_schedule:run_script", "at": "13:22", "jitter": 60, "catch_up": 12 * 3600},
+    # GS25 는 HTTP 요청이 실패할 때만 Chrome 을 쓰지만, 그때 seven 과 동시에 띄우지 않도록 browser 자원을 잡음
+    "GS25": {"target": "GS25_schedule:scrape_gs25_events", "at": "11:30", "jitter": 60, "catch_up": 12 * 3600,
+             "resources": ["browser"]},
+    "seven": {"target": "seven_schedule:run_crawling", "at": "00:00", "jitter": 60, "catch_up": 12 * 3600,
+              "resources": ["browser"]},
+    "plus": {"target": "plus_schedule:check_and_run_crawling", "at": "11:49", "jitter": 60, "catch_up": 12 * 3600},
+    "sale": {"target": "sale_schedule:insert_data", "at": "11:14", "jitter": 0, "catch_up": 20 * 3600},
+    # /sale/summary 집계 갱신 (sale 적재 이후)
+    "rollup": {"target": "sale_rollup:run", "at": "11:30", "jitter": 0, "catch_up": 20 * 3600},
+    "naver": {"target": "naver_schedule:insert_data", "at": "09:40", "jitter": 0, "catch_up": 20 * 3600},
+    # 크롤러들이 저장한 이벤트 이미지 내려받기 / 썸네일 (GS25 · CU 수집 이후)
+    "images": {"target": "event_images:run", "at": "14:00", "jitter": 60, "catch_up": 12 * 3600},
+}
+
+log = logging.getLogger("scheduler")
+
+# 데몬 잠금 파일 핸들 (프로세스가 끝날 때까지 열어 둬야 잠금이 유지됨)
+_daemon_lock = None
+
+
+def resolve(target):
+    """"모듈:함수" → 함수 (모듈은 이때 처음 import)"""
+    module_name, func_name = target.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def last_occurrence(at, now):
+    """now 이전(같은 시각 포함) 가장 최근의 at 시각"""
+    hour, minute = map(int, at.split(":"))
+    scheduled = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return scheduled if scheduled <= now else scheduled - datetime.timedelta(days=1)
+
+
+def load_state():
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(state):
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, STATE_FILE)
+
+
+class Scheduler:
+    def __init__(self, jobs=JOBS):
+        self.jobs = jobs
+        self.state = load_state()  # 작업 이름 -> {"scheduled", "started", "finished", "status", "error"}
+        self._lock = threading.Lock()
+        self._running = set()
+        self._resources = {name: 0 for name in RESOURCE_LIMITS}
+        self._start_at = {}  # 작업 이름 -> 지터를 더한 시작 예정 시각
+        self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+
+        # 처음 등록된 작업은 지난 실행을 놓친 것으로 보지 않음
+        now = datetime.datetime.now()
+        for name, job in jobs.items():
+            if name not in self.state:
+                self.state[name] = {"scheduled": last_occurrence(job["at"], now).isoformat()}
+        save_state(self.state)
+
+    def _resources_free(self, job):
+        return all(self._resources[r] < RESOURCE_LIMITS[r] for r in job.get("resources", []))
+
+    def due_jobs(self, now):
+        """지금 시작할 작업 → [(이름, 예정 시각)]"""
+        due = []
+        for name, job in self.jobs.items():
+            scheduled = last_occurrence(job["at"], now)
+            last = datetime.datetime.fromisoformat(self.state[name]["scheduled"])
+            if scheduled <= last:
+                continue
+            if (now - scheduled).total_seconds() > job.get("catch_up", 0) + job.get("jitter", 0):
+                log.warning("%s: %s 실행을 놓쳤고 catch_up 시간이 지나 건너뜀", name, scheduled)
+                self._mark_scheduled(name, scheduled)
+                continue
+            start_at = self._start_at.setdefault(
+                name, scheduled + datetime.timedelta(seconds=random.uniform(0, job.get("jitter", 0))))
+            if now >= start_at:
+                due.append((name, scheduled))
+        return due
+
+    def _mark_scheduled(self, name, scheduled):
+        with self._lock:
+            self.state[name]["scheduled"] = scheduled.isoformat()
+            self._start_at.pop(name, None)
+            save_state(self.state)
+
+    def submit(self, name, scheduled):
+        """겹치지 않고 자원이 남아 있으면 실행 → 실행했으면 True"""
+        job = self.jobs[name]
+        with self._lock:
+            if name in self._running:
+                log.warning("%s: 이전 실행이 아직 끝나지 않아 이번 실행(%s)은 건너뜀", name, scheduled)
+                self.state[name]["scheduled"] = scheduled.isoformat()
+                self._start_at.pop(name, None)
+                save_state(self.state)
+                return False
+            if not self._resources_free(job):
+                return False  # 자원이 비면 다음 tick 에 다시 시도
+            self._running.add(name)
+            for r in job.get("resources", []):
+                self._resources[r] += 1
+            self.state[name].update(scheduled=scheduled.isoformat(), started=datetime.datetime.now().isoformat(),
+                                    status="running")
+            self._start_at.pop(name, None)
+            save_state(self.state)
+
+        self._executor.submit(self._run, name)
+        return True
+
+    def _run(self, name):
+        job = self.jobs[name]
+        start = time.perf_counter()
+        log.info("%s 시작 (%s)", name, job["target"])
+        status, error = "ok", None
+        try:
+            with crawl_metrics.job_run(name):
+                resolve(job["target"])()
+        except Exception as e:  # 작업 하나가 실패해도 데몬은 계속 실행 (Ctrl+C · SystemExit 는 그대로 전달)
+            status, error = "error", f"{type(e).__name__}: {e}"
+            log.exception("%s 실패", name)
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._running.discard(name)
+                for r in job.get("resources", []):
+                    self._resources[r] -= 1
+                self.state[name].update(finished=datetime.datetime.now().isoformat(), status=status,
+                                        error=error, duration_seconds=round(duration, 1))
+                save_state(self.state)
+            log.info("%s 종료: %s (%.1f초)", name, status, duration)
+
+    def tick(self, now=None):
+        for name, scheduled in self.due_jobs(now or datetime.datetime.now()):
+            self.submit(name, scheduled)
+
+    def run_forever(self):
+        log.info("스케줄러 시작: %s", ", ".join(f"{n}@{j['at']}" for n, j in self.jobs.items()))
+        while True:
+            try:
+                self.tick()
+            except Exception:
+                log.exception("스케줄 확인 중 오류")
+            time.sleep(TICK_SECONDS)
+
+
+def acquire_daemon_lock():
+    """데몬이 두 개 뜨지 않도록 잠금 파일을 잡음 (프로세스가 끝나면 자동 해제)"""
+    handle = open(LOCK_FILE, "w")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print("❌ 이미 스케줄러가 실행 중입니다.")
+        sys.exit(1)
+    handle.write(str(os.getpid()))
+    handle.flush()
+    return handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 작업 스케줄러")
+    parser.add_argument("command", nargs="?", choices=["daemon", "list", "run"], default="daemon")
+    parser.add_argument("job", nargs="?", help="run 할 작업 이름")
+    args = parser.parse_args()
+
+    # 작업들이 ./all.xlsx, last_insert_date.txt 같은 상대 경로를 쓰므로 저장소 위치에서 실행
+    os.chdir(ROOT)
+    logging.basicConfig(filename=LOG_FILE if os.path.isdir(os.path.dirname(LOG_FILE)) else None,
+                        level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+    if args.command == "list":
+        state = load_state()
+        now = datetime.datetime.now()
+        for name, job in JOBS.items():
+            info = state.get(name, {})
+            next_run = last_occurrence(job["at"], now) + datetime.timedelta(days=1)
+            print(f"{name:<6} {job['target']:<40} 매일 {job['at']}  다음 {next_run:%m-%d %H:%M}  "
+                  f"마지막 {info.get('finished', '-')} ({info.get('status', '-')})")
+        return
+
+    if args.command == "run":
+        if args.job not in JOBS:
+            parser.error(f"작업 이름은 {', '.join(JOBS)} 중 하나여야 합니다.")
+        with crawl_metrics.job_run(args.job):
+            resolve(JOBS[args.job]["target"])()
+        return
+
+    global _daemon_lock
+    _daemon_lock = acquire_daemon_lock()
+    Scheduler().run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,35 +2,43 @@ import pymysql
 import time
 import schedule  # 스케줄 라이브러리
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import os
 import re
 import logging
-
-# ✅ ChromeDriver 경로 설정
-CHROMEDRIVER_PATH = "/home/ubuntu/chromedriver-linux64/chromedriver"
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import browser_pool
+import http_client
+import extract
+import event_store
+import crawl_metrics
+
+# ✅ 세븐일레븐 이벤트 목록 (모바일)
+EVENT_LIST_URL = "http://m.7-eleven.co.kr/product/eventList.asp"
+# ✅ 이벤트 상세 URL 형식 (예: ".../eventView.asp?seqNo={id}")
+#    설정하면 상세 페이지를 HTTP 로 받고, 없거나 실패하면 브라우저 탭에서 fncGoView(id) 로 연다
+DETAIL_URL_TEMPLATE = os.environ.get("SEVEN_DETAIL_URL_TEMPLATE")
+DETAIL_WORKERS = 4  # HTTP 상세 페이지 동시 요청 수
+TAB_BATCH = 4       # 브라우저에서 동시에 여는 탭 수
+
+# ✅ 목록의 이벤트를 한 번에 읽어 오는 스크립트 (href, 제목, 기간)
+LIST_SCRIPT = """
+return Array.from(document.querySelectorAll('#listUl li a')).map(function (a) {
+    var title = a.querySelector('strong'), period = a.querySelector('span');
+    return {
+        href: a.getAttribute('href') || '',
+        title: title ? title.textContent.trim() : '',
+        period: period ? period.textContent.trim() : ''
+    };
+});
+"""
 
 # 로그 설정 (로그 파일에 기록)
 logging.basicConfig(filename='/home/ubuntu/market/seven_schedule.log', 
-                    level=logging.DEBUG, 
+                    level=logging.INFO, 
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
-# 로그 설정 (로그 파일에 기록)
-logging.basicConfig(filename='/home/ubuntu/market/CU_schedule.log', 
-                    level=logging.DEBUG, 
-                    format='%(asctime)s - %(levelname)s - %(message)s')
-
-# ✅ ChromeDriver 실행 설정 (HEADLESS 모드 활성화)
-service = Service(CHROMEDRIVER_PATH)
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")  # GUI 없이 실행
-options.add_argument("--disable-gpu")  # GPU 사용 안 함 (Linux 서버에서 필수)
-options.add_argument("--no-sandbox")  # 보안 모드 비활성화 (일부 환경에서 필요)
-options.add_argument("--disable-dev-shm-usage")  # /dev/shm 파티션 문제 해결
-
 # ✅ MariaDB 연결 설정
 DB_CONFIG = {   
     "host": "3.35.236.56",  
@@ -40,111 +48,136 @@ DB_CONFIG = {
     "charset": "utf8mb4"
 }
 
-# ✅ MariaDB 연결 및 기존 데이터 조회
+# ✅ MariaDB 연결
 def connect_db():
-    """MariaDB 연결 및 기존 저장된 이벤트 데이터 조회"""
+    """MariaDB 연결 (중복 확인은 event_store 가 새 이벤트만 골라서 조회)"""
     try:
-        conn = pymysql.connect(**DB_CONFIG)
-        cursor = conn.cursor()
-        
-        # 기존 저장된 이벤트 제목과 이미지 URL 가져오기 (중복 방지)
-        cursor.execute("SELECT event_title, img_url FROM event_img")
-        existing_data = {(row[0], row[1]) for row in cursor.fetchall()}  # (title, img_url) 형태로 저장
-
-        return conn, cursor, existing_data
+        return pymysql.connect(**DB_CONFIG)
     except Exception as e:
         print(f"❌ MariaDB 연결 오류: {e}")
-        return None, None, set()
-
-def open_event_page():
-    """ 세븐일레븐 이벤트 페이지를 새로 엶 (HEADLESS 모드) """
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.get("http://m.7-eleven.co.kr/product/eventList.asp")
-    time.sleep(3)  # 페이지 로딩 대기
-    return driver
-
-def scrape_events(driver, existing_data):
-    """ 현재 페이지의 이벤트를 크롤링 """
-    wait = WebDriverWait(driver, 10)  # 최대 10초까지 대기
-    event_details = []  # 새로운 데이터 저장 리스트
-
+        return None
+
+def open_event_page(driver):
+    """ 세븐일레븐 이벤트 목록을 열고 목록이 나타날 때까지 대기 """
+    with crawl_metrics.timed("fetch"):
+        driver.get(EVENT_LIST_URL)
+    browser_pool.wait_css(driver, "#listUl li a")  # 이벤트 목록이 로드될 때까지 대기
+    crawl_metrics.add_pages()
+
+def collect_events(driver):
+    """ 목록을 한 번만 읽어서 [{id, title, start_date, end_date}] 반환 """
+    events = []
+    for item in driver.execute_script(LIST_SCRIPT):
+        # ✅ 이벤트 ID 추출 (fncGoView(1143) 형태에서 1143 추출)
+        event_id_match = re.search(r"fncGoView\((\d+)\)", item["href"])
+        if not event_id_match:
+            continue
+
+        # ✅ 이벤트 기간 (YYYY-MM-DD ~ YYYY-MM-DD)
+        dates = item["period"].split(" ~ ")
+        if len(dates) != 2:
+            print(f"⚠️ 기간을 읽을 수 없는 이벤트 무시: {item['title']} ({item['period']})")
+            continue
+
+        events.append({"id": event_id_match.group(1), "title": item["title"],
+                       "start_date": dates[0].strip(), "end_date": dates[1].strip()})
+    return events
+
+def fetch_detail_image(event_id):
+    """ HTTP 로 상세 페이지를 받아 이미지 URL 반환 (실패하면 None) """
+    url = DETAIL_URL_TEMPLATE.format(id=event_id)
     try:
-        # ✅ 이벤트 목록이 로드될 때까지 대기
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#listUl li a")))
-
-        # ✅ 이벤트 목록 가져오기 (매번 새로 가져옴)
-        events = driver.find_elements(By.CSS_SELECTOR, "#listUl li a")
-        print(f"🔍 총 {len(events)}개의 이벤트 발견!")
-
-        for event in events:
+        response = http_client.get(url)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"❌ 상세 페이지 요청 실패: {url} ({e})")
+        return None
+    crawl_metrics.add_pages()
+    img_url = extract.extract_one(response.text, extract.SEVEN_EVENT_DETAIL)["img_url"]
+    return urljoin(url, img_url) if img_url else None
+
+def resolve_by_tabs(driver, event_ids):
+    """ 브라우저 탭 여러 개에서 fncGoView(id) 로 상세 페이지를 동시에 열어 {id: 이미지 URL} 반환 """
+    images = {}
+    list_tab = driver.current_window_handle
+    for start in range(0, len(event_ids), TAB_BATCH):
+        batch = event_ids[start:start + TAB_BATCH]
+        handles = browser_pool.open_tabs(driver, [EVENT_LIST_URL] * len(batch))
+
+        # 탭마다 목록 스크립트가 준비되면 상세 페이지로 이동시킴 (이동 완료는 아래에서 한꺼번에 기다림)
+        for handle, event_id in zip(handles, batch):
+            driver.switch_to.window(handle)
             try:
-                # ✅ 이벤트 ID 추출 (fncGoView(1143) 형태에서 1143 추출)
-                event_id_match = re.search(r"fncGoView\((\d+)\)", event.get_attribute("href"))
-                if not event_id_match:
-                    continue
-                event_id = event_id_match.group(1)
-
-                # ✅ 이벤트 제목 가져오기
-                title_element = event.find_element(By.TAG_NAME, "strong")
-                title = title_element.text.strip()
-
-                # ✅ 이벤트 기간 (YYYY-MM-DD ~ YYYY-MM-DD)
-                date_element = event.find_element(By.TAG_NAME, "span")
-                date_range = date_element.text.strip()
-                start_date, end_date = date_range.split(" ~ ")
-
-                # ✅ 이벤트 상세 페이지 이동
-                driver.execute_script("arguments[0].click();", event)
-                time.sleep(2)  # 상세 페이지 로딩 대기
-                
-                # ✅ 상세 페이지에서 이미지 URL 가져오기
-                img_url = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".event_wrap_view img"))).get_attribute("src")
-                convenience_store = "seven"  # ✅ "세븐일레븐"
-
-                # ✅ **중복 체크 (event_title + img_url)**
-                if (title, img_url) in existing_data:
-                    print(f"⚠️ 중복 이벤트 무시: {title} (이미 존재하는 이미지 URL 포함)")
-                    driver.back()
-                    time.sleep(2)  # 로딩 대기
-                    continue
-
-                # ✅ 새로운 데이터 저장
-                event_details.append((img_url, start_date, end_date, title, convenience_store))
-                existing_data.add((title, img_url))  # 저장된 데이터 Set에 추가
-
-                # ✅ 실시간 진행 상황 출력
-                print(f"[{len(event_details)}] 저장: {title}, {start_date}, {end_date}, {img_url}, {convenience_store}")
-
-                # ✅ 상세 페이지에서 돌아가기
-                driver.back()
-                time.sleep(2)  # 로딩 대기
-
-                # ✅ 요소 갱신 (stale element 방지)
-                events = driver.find_elements(By.CSS_SELECTOR, "#listUl li a")
+                browser_pool.wait_for(driver, lambda d: d.execute_script("return typeof fncGoView === 'function'"))
+                driver.execute_script("var id = arguments[0]; setTimeout(function () { fncGoView(id); }, 0);",
+                                      int(event_id))
+            except Exception as e:
+                print(f"❌ 상세 페이지 이동 실패 (id {event_id}): {e}")
 
+        for handle, event_id in zip(handles, batch):
+            driver.switch_to.window(handle)
+            try:
+                images[event_id] = browser_pool.wait_css(driver, ".event_wrap_view img").get_attribute("src")
+                crawl_metrics.add_pages()
             except Exception as e:
-                print(f"❌ 데이터 수집 오류: {e}")
-                continue
+                print(f"❌ 상세 이미지 수집 실패 (id {event_id}): {e}")
 
-    except Exception as e:
-        print(f"❌ 크롤링 중 오류 발생: {e}")
+        browser_pool.close_tabs(driver, handles, list_tab)
+    return images
 
-    return event_details
+def scrape_events(driver, conn):
+    """ 목록에서 새 이벤트만 골라 상세 이미지를 모아서 DB 에 넣을 이벤트 리스트 반환 """
+    event_details = []  # 새로운 데이터 저장 리스트
 
-def save_data_to_db(conn, cursor, event_details):
-    """ MariaDB에 크롤링 데이터를 저장 """
-    insert_sql = """
-    INSERT INTO event_img (img_url, start_date, end_date, event_title, store_type, idx)
-    VALUES (%s, %s, %s, %s, %s, 0)  -- idx 값을 항상 0으로 고정
-    """
+    events = collect_events(driver)
+    print(f"🔍 총 {len(events)}개의 이벤트 발견!")
+
+    # ✅ 이미 저장된 이벤트는 상세 페이지를 열기 전에 제외
+    #    (idx 에 fncGoView id 를 저장, 예전 행은 idx 가 0 이라 제목 + 기간으로 비교)
+    stored_ids = event_store.find_stored_ids(conn, "seven", [e["id"] for e in events])
+    stored_periods = event_store.find_stored_periods(conn, "seven", [e["title"] for e in events])
+    new_events = [e for e in events
+                  if e["id"] not in stored_ids
+                  and (e["title"], e["start_date"], e["end_date"]) not in stored_periods]
+    print(f"🆕 새 이벤트 {len(new_events)}개 (이미 저장된 {len(events) - len(new_events)}개 건너뜀)")
+    if not new_events:
+        return event_details
+
+    event_ids = [e["id"] for e in new_events]
+    images = {}
+    if DETAIL_URL_TEMPLATE:
+        with ThreadPoolExecutor(max_workers=DETAIL_WORKERS) as executor:
+            images = {event_id: img for event_id, img in zip(event_ids, executor.map(crawl_metrics.propagate(fetch_detail_image), event_ids))
+                      if img}
+    missing = [event_id for event_id in event_ids if event_id not in images]
+    if missing:
+        images.update(resolve_by_tabs(driver, missing))
+
+    convenience_store = "seven"  # ✅ "세븐일레븐"
+    for event in new_events:
+        img_url = images.get(event["id"])
+        if not img_url:
+            continue
+
+        # ✅ 새로운 데이터 저장 (title + img_url 중복은 저장할 때 content_hash 로 거름)
+        event_details.append({"img_url": img_url, "start_date": event["start_date"], "end_date": event["end_date"],
+                              "event_title": event["title"], "store_type": convenience_store, "idx": event["id"]})
+
+        # ✅ 실시간 진행 상황 출력
+        print(f"[{len(event_details)}] 수집: {event['title']}, {event['start_date']}, {event['end_date']}, {img_url}, {convenience_store}")
+
+    crawl_metrics.add_items(len(event_details))
+    return event_details
 
+def save_data_to_db(conn, event_details):
+    """ MariaDB에 크롤링 데이터를 저장 (idx 에는 fncGoView id 저장) """
     if event_details:
         try:
-            cursor.executemany(insert_sql, event_details)
-            conn.commit()
-            print(f"✅ {len(event_details)}개의 새로운 이벤트가 DB에 저장되었습니다!")
+            saved = event_store.save_events(conn, event_details)
+            print(f"✅ {len(saved)}개의 새로운 이벤트가 DB에 저장되었습니다!")
+            if len(saved) < len(event_details):
+                print(f"⚠️ 중복 이벤트 {len(event_details) - len(saved)}개 무시 (이미 존재하는 제목 + 이미지 URL)")
         except Exception as e:
-            conn.rollback()
             print(f"❌ DB 저장 오류: {e}")
     else:
         print("⚠️ 새로운 데이터가 없어 DB 업데이트하지 않았습니다.")
@@ -154,34 +187,46 @@ def run_crawling():
     print(f"\n🕛 [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 자동 크롤링 시작...")
     
     # **DB 연결**
-    conn, cursor, existing_data = connect_db()
-    if conn is None or cursor is None:
+    conn = connect_db()
+    if conn is None:
         print("❌ DB 연결 실패로 인해 크롤링을 중단합니다.")
         return
 
-    # **크롤링 실행**
-    driver = open_event_page()
-    event_details = scrape_events(driver, existing_data)
+    # **스키마 확인** (마이그레이션 전이면 브라우저를 띄우기 전에 멈춤)
+    try:
+        event_store.check_schema(conn)
+    except event_store.SchemaNotReady:
+        conn.close()
+        raise
+
+    # **크롤링 실행** (풀에서 빌린 드라이버는 끝나면 반납)
+    with browser_pool.lease() as driver:
+        try:
+            open_event_page(driver)
+            event_details = scrape_events(driver, conn)
+        except Exception as e:
+            print(f"❌ 크롤링 중 오류 발생: {e}")
+            event_details = []
 
     # **DB 저장**
-    save_data_to_db(conn, cursor, event_details)
+    save_data_to_db(conn, event_details)
 
     # **연결 종료**
-    cursor.close()
     conn.close()
-    driver.quit()
 
     print(f"✅ [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 크롤링 완료!\n")
 
-# ✅ 매일 00시에 실행
-schedule.every().day.at("00:00").do(run_crawling)
+# ✅ 단독 실행할 때만 자체 스케줄 루프 사용 (평소에는 scheduler.py 가 run_crawling 을 실행)
+if __name__ == "__main__":
+    # ✅ 매일 00시에 실행
+    schedule.every().day.at("00:00").do(run_crawling)
 
-# ✅ 스케줄 강제 실행 (테스트용) → 이 한 줄을 실행하면 바로 크롤링이 실행됨
-# schedule.run_all()
+    # ✅ 스케줄 강제 실행 (테스트용) → 이 한 줄을 실행하면 바로 크롤링이 실행됨
+    # schedule.run_all()
 
-print("✅ 자동 크롤링 스케줄러가 설정되었습니다. (매일 00:00 실행)")
+    print("✅ 자동 크롤링 스케줄러가 설정되었습니다. (매일 00:00 실행)")
 
-# **무한 루프로 스케줄 실행 유지**
-while True:
-    schedule.run_pending()
-    time.sleep(60)  # 1분마다 체크
+    # **무한 루프로 스케줄 실행 유지**
+    while True:
+        schedule.run_pending()
+        time.sleep(60)  # 1분마다 체크
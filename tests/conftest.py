@@ -0,0 +1,26 @@
+# 공용 테스트 설정
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fakes import FakeConnection  # noqa: E402
+
+
+@pytest.fixture
+def fake_conn():
+    return FakeConnection()
+
+
+@pytest.fixture
+def import_crawler(monkeypatch):
+    """크롤러 스크립트 import (모듈 맨 위 basicConfig 가 운영 서버 로그 경로를 열지 않게)"""
+    import importlib
+    import logging
+
+    def load(name):
+        monkeypatch.setattr(logging, "basicConfig", lambda **kwargs: None)
+        return importlib.import_module(name)
+    return load
@@ -0,0 +1,70 @@
+# DB 없이 쿼리를 기록하고 정해 둔 결과를 돌려주는 가짜 pymysql 커넥션
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        result = self.conn.handler(sql, params) if self.conn.handler else None
+        self._rows = list(result or [])
+        self.rowcount = len(self._rows)
+
+    def executemany(self, sql, seq):
+        seq = list(seq)
+        self.conn.executed.append((sql, seq))
+        self.rowcount = len(seq)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """handler(sql, params) → 결과 행 리스트 (None 이면 빈 결과)"""
+
+    def __init__(self, handler=None):
+        self.handler = handler
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+        self.invalidated = False
+
+    def cursor(self, cursor_class=None):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+    def invalidate(self):
+        self.invalidated = True
+
+    def sql(self):
+        return [sql for sql, _ in self.executed]
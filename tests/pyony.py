@@ -0,0 +1,17 @@
+# pyony.com 상품 목록 페이지 모양의 테스트용 HTML
+
+
+def card(date, title, price="1,500원", event_price="(750원)", badge="1+1", brand_class="bg-cu"):
+    return (
+        '<div class="col-md-6"><div class="card">'
+        f'<small class="float-right text-white mr-3">{date}</small>'
+        f'<strong>{title}</strong>'
+        f'<i class="fas fa-coins"></i> {price}'
+        f'<span class="text-muted small">{event_price}</span>'
+        f'<span class="badge {brand_class} text-white">{badge}</span>'
+        '</div></div>'
+    )
+
+
+def page(*cards):
+    return '<html><body><div class="row">' + "".join(cards) + "</div></body></html>"
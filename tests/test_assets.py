@@ -0,0 +1,48 @@
+import gzip
+import sys
+
+import pytest
+
+import app as app_module
+import build_assets
+
+asset_route = sys.modules["routes.asset_route"]
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "style.css").write_text("body { background: url(../img/a.png); }")
+    monkeypatch.setattr(build_assets, "STATIC_DIR", str(tmp_path))
+    monkeypatch.setattr(build_assets, "DIST_DIR", str(tmp_path / "dist"))
+    monkeypatch.setattr(build_assets, "MANIFEST_PATH", str(tmp_path / "dist" / "manifest.json"))
+    monkeypatch.setattr(app_module.app, "static_folder", str(tmp_path))
+    monkeypatch.setattr(asset_route, "_manifest", {"mtime": None, "data": {}})
+    return tmp_path
+
+
+def test_build_writes_hashed_files_and_manifest(static_dir):
+    manifest = build_assets.build()
+    hashed = manifest["css/style.css"]
+    assert hashed.startswith("css/style.") and hashed.endswith(".css")
+    content = (static_dir / "dist" / hashed).read_bytes()
+    assert b"url(/static/img/a.png)" in content
+    assert gzip.decompress((static_dir / "dist" / (hashed + ".gz")).read_bytes()) == content
+
+
+def test_only_fingerprinted_files_are_immutable(static_dir):
+    hashed = build_assets.build()["css/style.css"]
+    (static_dir / "dist" / "plain.js").write_text("1")
+    client = app_module.app.test_client()
+
+    response = client.get(f"/assets/{hashed}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Cache-Control"] == asset_route.IMMUTABLE_CACHE
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+    for name in ("manifest.json", "plain.js"):
+        response = client.get(f"/assets/{name}")
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "no-cache"
+
+    assert client.get("/assets/missing.css").status_code == 404
@@ -0,0 +1,67 @@
+import asyncio
+import datetime
+
+import pytest
+
+pytest.importorskip("quart")
+import async_app  # noqa: E402
+
+
+def test_pool_uses_autocommit(monkeypatch):
+    captured = {}
+
+    async def create_pool(**kwargs):
+        captured.update(kwargs)
+        return object()
+    monkeypatch.setattr(async_app.aiomysql, "create_pool", create_pool)
+    asyncio.run(async_app.create_pool())
+    # 트랜잭션이 열린 채 반납되면 aiomysql 이 커넥션을 닫으므로 조회 커넥션은 autocommit
+    assert captured["autocommit"] is True
+
+
+class FakeAsyncCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql, params=None):
+        self.sql = sql
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeAsyncPool:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                class Conn:
+                    def cursor(self, cursor_class=None):
+                        return FakeAsyncCursor(pool.rows)
+                return Conn()
+
+            async def __aexit__(self, *exc):
+                return False
+        return Acquire()
+
+
+def test_sale_route_pages_with_fake_pool():
+    async_app.app.pool = FakeAsyncPool([(100, datetime.date(2024, 1, 1), 1)])
+
+    async def call():
+        client = async_app.app.test_client()
+        response = await client.get("/sale?columns=sum_amount&limit=5")
+        return response.status_code, await response.get_json()
+    status, body = asyncio.run(call())
+    assert status == 200
+    assert body == {"status": "success", "next_cursor": None, "sale_data": [{"sum_amount": 100}]}
@@ -0,0 +1,50 @@
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("aiohttp")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+import common  # noqa: E402
+import load_test  # noqa: E402
+
+
+def test_percentile_and_summary():
+    assert common.percentile([], 50) is None
+    assert common.percentile([1, 2, 3, 4, 5], 50) == 3
+    summary = common.summarize([0.010, 0.020, 0.030], ["500"], 0.5)
+    assert summary["requests"] == 4 and summary["errors"] == 1
+    assert summary["rps"] == 6.0 and summary["p50_ms"] == 20.0
+
+
+def test_scenarios_build_requests():
+    scenarios = load_test.scenarios("http://x", user_rows=10)
+    method, url, body = scenarios["add_user"](3)
+    assert method == "POST" and url == "http://x/api/user/add-user" and body["nick"] == "부하3"
+    assert scenarios["sale_page"](0) == ("GET", "http://x/sale?limit=100", None)
+
+
+@pytest.fixture
+def server():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = 500 if self.path == "/fail" else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_port}"
+    srv.shutdown()
+
+
+def test_run_load_counts_latencies_and_errors(server):
+    latencies, errors, elapsed = common.run_load(
+        lambda i: ("GET", server + ("/fail" if i % 5 == 0 else "/ok"), None), concurrency=4, total=20)
+    assert len(latencies) == 16 and errors == [500] * 4 and elapsed > 0
@@ -0,0 +1,32 @@
+import importlib.util
+import os
+
+import pytest
+
+SEED_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "seed.py")
+spec = importlib.util.spec_from_file_location("bench_seed", SEED_PATH)
+seed = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(seed)
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+    monkeypatch.setattr(seed, "get_db_connection", lambda: opened.append(1))
+    return opened
+
+
+@pytest.mark.parametrize("db_name", [None, "", "crawling"])
+def test_refuses_default_or_production_database(monkeypatch, connections, db_name):
+    if db_name is None:
+        monkeypatch.delenv("DB_NAME", raising=False)
+    else:
+        monkeypatch.setenv("DB_NAME", db_name)
+    with pytest.raises(seed.UnsafeSeedTarget):
+        seed.seed(10, 10)
+    assert connections == []  # 연결도 하지 않음
+
+
+def test_allows_explicit_benchmark_database(monkeypatch):
+    monkeypatch.setenv("DB_NAME", "bench")
+    assert seed.check_target() == "bench"
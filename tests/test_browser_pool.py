@@ -0,0 +1,74 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import browser_pool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.window_handles = ["main"]
+        self.visited = []
+        self.switch_to = self
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return self.window_handles[0]
+
+    def window(self, handle):
+        pass
+
+    def close(self):
+        self.window_handles.pop()
+
+    def get(self, url):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    drivers = []
+
+    def launch():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+    monkeypatch.setattr(browser_pool, "_launch", launch)
+    return drivers
+
+
+def test_warm_launches_up_to_pool_size_once(launched):
+    pool = browser_pool.BrowserPool(size=2)
+    pool.warm()
+    pool.warm()
+    assert len(launched) == 2
+
+    with pool.lease() as driver:
+        assert driver in launched
+    assert len(launched) == 2 and driver.visited[-1] == "about:blank"
+
+
+def test_dead_driver_is_replaced(launched):
+    pool = browser_pool.BrowserPool(size=1)
+    pool.warm()
+    launched[0].alive = False
+    with pool.lease() as driver:
+        assert driver is launched[1]
+    assert launched[0].quit_called
+
+
+def test_lease_launches_driver_on_first_use(launched):
+    pool = browser_pool.BrowserPool(size=2)
+    assert launched == []
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert launched == [first] and second is first  # 한 번 띄운 드라이버는 풀에 남아 재사용
@@ -0,0 +1,42 @@
+import json
+import os
+
+import pytest
+
+import checkpoint
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    return tmp_path / "checkpoints"
+
+
+def test_save_load_clear(checkpoint_dir):
+    assert checkpoint.load("CU") is None
+    checkpoint.save("CU", {"next_idx": 10})
+    state = checkpoint.load("CU")
+    assert state["next_idx"] == 10 and "saved_at" in state
+    assert os.listdir(checkpoint_dir) == ["CU.json"]  # 임시 파일이 남지 않음
+    checkpoint.clear("CU")
+    checkpoint.clear("CU")
+    assert checkpoint.load("CU") is None
+
+
+def test_failed_write_keeps_previous_state(checkpoint_dir, monkeypatch):
+    checkpoint.save("CU", {"next_idx": 10})
+
+    def crash(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(checkpoint.os, "replace", crash)
+    with pytest.raises(OSError):
+        checkpoint.save("CU", {"next_idx": 20})
+    assert checkpoint.load("CU")["next_idx"] == 10
+
+
+def test_unreadable_checkpoint_starts_over(checkpoint_dir):
+    checkpoint_dir.mkdir()
+    (checkpoint_dir / "CU.json").write_text('{"next_idx": 1')  # 반쯤 쓰인 파일
+    assert checkpoint.load("CU") is None
+    (checkpoint_dir / "CU.json").write_text(json.dumps({"next_idx": 3}))
+    assert checkpoint.load("CU") == {"next_idx": 3}
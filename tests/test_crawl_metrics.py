@@ -0,0 +1,64 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import crawl_metrics
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl_metrics, "CRAWL_METRICS_FILE", str(tmp_path / "metrics.jsonl"))
+    monkeypatch.setattr(crawl_metrics, "CRAWL_METRICS_PROM", str(tmp_path / "metrics.prom"))
+    return tmp_path
+
+
+def fetch(i):
+    crawl_metrics.observe_request("a.test", 0.01 * (i + 1), nbytes=100, not_modified=i == 0)
+    crawl_metrics.add_pages()
+
+
+def test_job_run_collects_thread_work_and_writes_summary(files):
+    with crawl_metrics.job_run("unit") as run:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(crawl_metrics.propagate(fetch), range(10)))
+        crawl_metrics.observe_request("b.test", 0.5, error=True)
+        crawl_metrics.add_items(3)
+        crawl_metrics.add_time("parse", 0.25)
+    assert crawl_metrics.current_run() is None
+    assert run.pages == 10
+
+    summary = json.loads((files / "metrics.jsonl").read_text().splitlines()[-1])
+    assert summary["job"] == "unit" and summary["status"] == "ok"
+    assert summary["pages"] == 10 and summary["items"] == 3 and summary["bytes"] == 1000
+    assert summary["hosts"]["a.test"] == {"requests": 10, "p50_ms": 50.0, "p95_ms": 100.0, "max_ms": 100.0,
+                                          "bytes": 1000, "not_modified": 1, "errors": 0}
+    assert summary["hosts"]["b.test"]["errors"] == 1
+    assert summary["phase_seconds"]["parse"] == 0.25
+    assert summary["phase_seconds"]["fetch"] == pytest.approx(0.55 + 0.5)
+
+    prom = (files / "metrics.prom").read_text()
+    assert 'crawl_runs_total{job="unit",status="ok"}' in prom
+    assert 'crawl_request_duration_seconds_count{job="unit",host="a.test"}' in prom
+
+
+def test_without_propagate_threads_do_not_record_into_the_run(files):
+    with crawl_metrics.job_run("unit") as run:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(fetch, 0).result()
+    assert run.pages == 0
+
+
+def test_failed_run_is_recorded_and_reraised(files):
+    with pytest.raises(RuntimeError):
+        with crawl_metrics.job_run("unit"):
+            raise RuntimeError("down")
+    summary = json.loads((files / "metrics.jsonl").read_text().splitlines()[-1])
+    assert summary["status"] == "error"
+
+
+def test_metrics_outside_a_run_are_ignored_by_runs():
+    crawl_metrics.add_pages()
+    with crawl_metrics.timed("wait"):
+        pass
+    assert crawl_metrics.current_run() is None
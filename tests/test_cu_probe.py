@@ -0,0 +1,134 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import checkpoint
+import crawl_metrics
+from tests.fakes import FakeConnection
+
+
+@pytest.fixture
+def cu(import_crawler, monkeypatch):
+    module = import_crawler("CU_schedule")
+    notices = {10: ("a", "http://img/10"), 11: ("b", "http://img/11"), 14: ("c", "http://img/14")}
+    requested = []
+    lock = threading.Lock()
+
+    def fetch_notice(idx):
+        with lock:
+            requested.append(idx)
+        return notices.get(idx)
+    monkeypatch.setattr(module, "fetch_notice", fetch_notice)
+    module.requested = requested
+    return module
+
+
+def test_probe_skips_gaps_shorter_than_max_gap(cu):
+    found = list(cu.probe_new_notices(10, workers=4, window=5, max_gap=3))
+    assert found == [(10, "a", "http://img/10"), (11, "b", "http://img/11"), (14, "c", "http://img/14")]
+    # 15~17 이 연속으로 비어서 종료, window 밖으로는 요청하지 않음
+    assert {15, 16, 17} <= set(cu.requested)
+    assert max(cu.requested) < 17 + 5
+
+
+def test_probe_stops_when_nothing_new(cu):
+    assert list(cu.probe_new_notices(100, workers=2, window=4, max_gap=4)) == []
+    assert len(cu.requested) <= 4 + 4
+
+
+def test_probe_yields_in_idx_order_when_responses_arrive_out_of_order(cu, monkeypatch):
+    events = {i: threading.Event() for i in range(10, 12)}
+
+    def fetch_notice(idx):
+        if idx == 10:
+            events[11].wait(1)  # 11 이 먼저 끝나도록
+        if idx == 11:
+            events[11].set()
+        return {10: ("a", "u10"), 11: ("b", "u11")}.get(idx)
+    monkeypatch.setattr(cu, "fetch_notice", fetch_notice)
+    assert [idx for idx, _, _ in cu.probe_new_notices(10, workers=4, window=4, max_gap=2)] == [10, 11]
+
+
+def test_probe_stops_before_idx_that_failed_to_fetch(cu, monkeypatch):
+    notices = {10: ("a", "u10"), 12: cu.FETCH_FAILED, 13: ("c", "u13")}
+    monkeypatch.setattr(cu, "fetch_notice", notices.get)
+    # 13 은 찾았지만 12 를 확인하지 못했으므로 그 앞까지만
+    assert list(cu.probe_new_notices(10, workers=4, window=4, max_gap=3)) == [(10, "a", "u10")]
+
+
+@pytest.mark.parametrize("outcome, expected", [
+    (404, None),
+    (503, "failed"),
+    (429, "failed"),
+    (requests.Timeout("timeout"), "failed"),
+])
+def test_fetch_notice_separates_missing_from_failed(import_crawler, monkeypatch, outcome, expected):
+    cu = import_crawler("CU_schedule")
+
+    def get(url):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(status_code=outcome, text="")
+    monkeypatch.setattr(cu.http_client, "get", get)
+    result = cu.fetch_notice(10)
+    assert result is (cu.FETCH_FAILED if expected == "failed" else None)
+
+
+
+def test_duplicate_notices_advance_the_probe_watermark(cu, monkeypatch, tmp_path):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(cu.event_store, "_checked_migrations", set())
+
+    def handler(sql, params):
+        if "MAX(idx)" in sql:
+            return [(9,)]
+        if "schema_migrations" in sql:
+            return [(1,)]
+        if "content_hash IN" in sql:
+            return [(h,) for h in params]  # 전부 이미 저장된 공지 (다른 idx 로)
+    monkeypatch.setattr(cu.pymysql, "connect", lambda **kwargs: FakeConnection(handler))
+
+    starts = []
+    probe = cu.probe_new_notices
+
+    def recording_probe(start_idx):
+        starts.append(start_idx)
+        return probe(start_idx, workers=2, window=4, max_gap=3)
+    monkeypatch.setattr(cu, "probe_new_notices", recording_probe)
+
+    cu.run_script()
+    assert checkpoint.load("CU")["next_idx"] == 15
+    cu.run_script()
+    # MAX(idx) 는 그대로 9 지만 두 번째 실행은 이미 확인한 공지 다음부터
+    assert starts == [10, 15]
+
+
+def test_failed_fetch_keeps_checkpoint_before_unresolved_idx(cu, monkeypatch, tmp_path):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(cu.event_store, "_checked_migrations", set())
+    monkeypatch.setattr(cu, "fetch_notice", {10: ("a", "u10"), 11: cu.FETCH_FAILED, 12: ("b", "u12")}.get)
+
+    def handler(sql, params):
+        if "MAX(idx)" in sql:
+            return [(9,)]
+        if "schema_migrations" in sql:
+            return [(1,)]
+        if "content_hash IN" in sql:
+            return []
+    monkeypatch.setattr(cu.pymysql, "connect", lambda **kwargs: FakeConnection(handler))
+
+    cu.run_script()
+    assert checkpoint.load("CU")["next_idx"] == 11
+
+
+def test_flush_counts_only_saved_notices(cu, monkeypatch, tmp_path):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(cu.event_store, "save_events", lambda conn, batch: batch[:1])
+    counted = []
+    monkeypatch.setattr(crawl_metrics, "add_items", counted.append)
+    batch = [{"idx": 10}, {"idx": 11}, {"idx": 12}]
+    cu.flush_notices(None, batch, 13)
+    assert counted == [1] and batch == []
+    assert checkpoint.load("CU")["next_idx"] == 13
@@ -0,0 +1,75 @@
+import pymysql
+import pytest
+
+import db
+
+
+class RawConnection:
+    def __init__(self):
+        self.open = True
+        self.rollbacks = 0
+        self.pings = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+
+    def close(self):
+        self.open = False
+
+    def cursor(self, cursor=None):
+        return None
+
+
+@pytest.fixture
+def raw_connections(monkeypatch):
+    created = []
+
+    def connect(**config):
+        created.append(RawConnection())
+        return created[-1]
+    monkeypatch.setattr(db.pymysql, "connect", connect)
+    return created
+
+
+def test_released_connection_is_rolled_back_and_reused(raw_connections):
+    pool = db.ConnectionPool({}, max_size=2)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()  # 두 번 닫아도 한 번만 반납
+    again = pool.acquire()
+    assert len(raw_connections) == 1
+    assert raw_connections[0].rollbacks == 1
+    assert pool.stats()["reused"] == 1 and pool.stats()["in_use"] == 1
+    again.close()
+
+
+def test_checkout_times_out_when_pool_is_full(raw_connections):
+    pool = db.ConnectionPool({}, max_size=1, checkout_timeout=0.01)
+    held = pool.acquire()
+    with pytest.raises(pymysql.OperationalError):
+        pool.acquire()
+    assert pool.stats()["checkout_timeouts"] == 1
+    held.close()
+
+
+def test_expired_connection_is_recycled(raw_connections):
+    pool = db.ConnectionPool({}, max_size=1, max_lifetime=0)
+    pool.acquire().close()
+    pool.acquire().close()
+    assert len(raw_connections) == 2
+    assert not raw_connections[0].open
+
+
+def test_invalidate_discards_connection(raw_connections):
+    pool = db.ConnectionPool({}, max_size=1)
+    conn = pool.acquire()
+    conn.invalidate()
+    assert not raw_connections[0].open
+    conn.invalidate()
+    conn.close()  # 폐기한 뒤 닫아도 다시 반납하지 않음
+    assert pool.stats()["recycled"] == 0 and pool.stats()["in_use"] == 0
+    pool.acquire().close()
+    assert len(raw_connections) == 2
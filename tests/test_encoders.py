@@ -0,0 +1,64 @@
+import datetime
+import decimal
+import json
+
+import msgpack
+import pyarrow as pa
+import pytest
+from flask import Flask
+
+import encoders
+from encoders import UnsupportedFormat
+
+COLUMNS = ["sale_date", "sum_amount"]
+ROWS = [(datetime.date(2024, 1, 1), decimal.Decimal("10.5")), (datetime.date(2024, 1, 2), decimal.Decimal("20"))]
+META = {"status": "success", "next_cursor": None}
+
+
+def negotiate(query="", accept=None):
+    app = Flask(__name__)
+    headers = {"Accept": accept} if accept else {}
+    with app.test_request_context("/sale" + query, headers=headers):
+        return encoders.negotiate_format()
+
+
+def test_negotiation_prefers_format_parameter_then_accept():
+    assert negotiate() == "json"
+    assert negotiate(accept="application/x-msgpack") == "msgpack"
+    assert negotiate("?format=columnar", accept="application/msgpack") == "columnar"
+    with pytest.raises(UnsupportedFormat):
+        negotiate("?format=xml")
+
+
+def test_missing_optional_library_is_unsupported(monkeypatch):
+    monkeypatch.setattr(encoders, "pa", None)
+    with pytest.raises(UnsupportedFormat):
+        negotiate("?format=arrow")
+
+
+def test_json_keeps_row_objects_and_flask_date_format():
+    body, mimetype = encoders.encode_rows("json", META, "sale_data", COLUMNS, ROWS)
+    data = json.loads(body)
+    assert mimetype == "application/json"
+    assert data["sale_data"][0] == {"sale_date": "Mon, 01 Jan 2024 00:00:00 GMT", "sum_amount": "10.5"}
+
+
+def test_columnar_and_msgpack_are_column_oriented():
+    body, _ = encoders.encode_rows("columnar", META, "sale_data", COLUMNS, ROWS)
+    assert json.loads(body)["sale_data"]["sum_amount"] == ["10.5", "20"]
+
+    body, _ = encoders.encode_rows("msgpack", META, "sale_data", COLUMNS, ROWS)
+    data = msgpack.unpackb(body)
+    assert data["columns"] == COLUMNS
+    assert data["sale_data"]["sale_date"] == ["2024-01-01", "2024-01-02"]
+    assert data["sale_data"]["sum_amount"] == [10.5, 20.0]
+
+
+def test_arrow_stream_round_trip_including_empty_result():
+    body, _ = encoders.encode_rows("arrow", META, "sale_data", COLUMNS, ROWS)
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.column_names == COLUMNS and table.num_rows == 2
+    assert table.schema.metadata[b"status"] == b"success"
+
+    body, _ = encoders.encode_rows("arrow", META, "sale_data", COLUMNS, [])
+    assert pa.ipc.open_stream(body).read_all().num_rows == 0
@@ -0,0 +1,93 @@
+import hashlib
+import io
+
+import pytest
+
+import event_images
+from tests.fakes import FakeConnection
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def banner(shift=0, size=(200, 100)):
+    """왼쪽이 밝고 오른쪽이 어두운 그라데이션 (shift 만큼 밝기를 바꾼 비슷한 배너)"""
+    image = Image.new("RGB", size)
+    image.putdata([(max(0, 255 - x - shift),) * 3 for y in range(size[1]) for x in range(size[0])])
+    return image
+
+
+def store(image, fmt="PNG"):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt)
+    data = buffer.getvalue()
+    sha256 = hashlib.sha256(data).hexdigest()
+    event_images._write_once(event_images.original_path(sha256), data)
+    return sha256
+
+
+@pytest.fixture
+def image_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_images, "IMAGE_DIR", str(tmp_path))
+    monkeypatch.setenv("EVENT_IMAGE_DIR", str(tmp_path))  # spawn 으로 뜬 프로세스도 같은 경로
+    return tmp_path
+
+
+def test_make_thumbnails_in_spawned_processes(image_dir, monkeypatch):
+    monkeypatch.setattr(event_images, "THUMB_PROCESSES", 2)
+    good = store(banner())
+    broken = hashlib.sha256(b"not an image").hexdigest()
+    event_images._write_once(event_images.original_path(broken), b"not an image")
+
+    results = event_images.make_thumbnails([good, broken])
+    assert list(results) == [good]
+    width, height, value = results[good]
+    assert (width, height) == (200, 100) and value == event_images.dhash(banner())
+    with Image.open(event_images.thumb_path(good)) as thumb:
+        assert thumb.format == "JPEG" and max(thumb.size) <= max(event_images.THUMB_SIZE)
+
+
+def test_dhash_is_close_for_similar_banners_and_far_otherwise():
+    value = event_images.dhash(banner())
+    assert event_images.hamming(value, event_images.dhash(banner(shift=10))) <= event_images.DHASH_DISTANCE
+    assert event_images.hamming(value, event_images.dhash(banner().rotate(180))) > event_images.DHASH_DISTANCE
+    assert 0 <= value < 2 ** 64
+
+
+def test_find_duplicate_prefers_earliest_other_file():
+    known = [("same", 0b1111), ("old", 0b0111), ("newer", 0b0011)]
+    assert event_images.find_duplicate(known, "same", 0b1111) == "old"
+    assert event_images.find_duplicate(known, "x", (2 ** 64) - 1) is None
+
+
+def test_run_marks_near_duplicates_against_stored_and_batch_images(image_dir, monkeypatch):
+    monkeypatch.setattr(event_images, "THUMB_PROCESSES", 1)
+    stored_value = event_images.dhash(banner(size=(180, 90)))
+    urls = ["https://img/a.png", "https://img/b.png", "https://img/c.png", "https://img/broken"]
+    files = {urls[0]: banner(shift=5), urls[1]: banner().rotate(180), urls[2]: banner().rotate(180)}
+
+    def handler(sql, params):
+        if "LEFT JOIN event_image" in sql:
+            return [(u,) for u in urls]
+        if "GROUP BY sha256, dhash" in sql:
+            return [("stored", stored_value)]
+    conn = FakeConnection(handler)
+    monkeypatch.setattr(event_images.pymysql, "connect", lambda **kwargs: conn)
+
+    def download(img_url):
+        row = {"url_hash": event_images.url_hash(img_url), "img_url": img_url, "sha256": None, "status": "error"}
+        if img_url in files:
+            fmt = "PNG" if img_url != urls[2] else "GIF"  # b 와 c 는 같은 그림, 다른 파일
+            row.update(sha256=store(files[img_url], fmt), status="ok")
+        return row
+    monkeypatch.setattr(event_images, "download", download)
+
+    event_images.run()
+    queries = conn.sql()
+    assert sum("GROUP BY sha256, dhash" in q for q in queries) == 1  # 이미지마다 조회하지 않음
+    rows = {row[1]: row for _, rows in conn.executed if _.startswith("INSERT") for row in rows}
+    assert rows[urls[0]][8] == "stored"                 # duplicate_of
+    # b 와 c 는 같은 실행에서 처리한 비슷한 이미지 → 먼저 처리한 쪽을 가리킴
+    b, c = rows[urls[1]], rows[urls[2]]
+    assert sorted([b[8] or "", c[8] or ""]) == sorted(["", min(b[2], c[2])])
+    assert rows[urls[3]][9] == "error"
+    assert conn.closed
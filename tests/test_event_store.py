@@ -0,0 +1,96 @@
+import datetime
+import hashlib
+import importlib.util
+
+import pymysql
+import pytest
+
+import event_store
+import migrate
+from tests.fakes import FakeConnection
+
+
+def event(title="1+1", img="http://img/a.jpg", store="CU", start="2024-10-01", end="2024-10-31", **extra):
+    return {"event_title": title, "img_url": img, "store_type": store, "start_date": start, "end_date": end,
+            **extra}
+
+
+@pytest.fixture(autouse=True)
+def schema_unchecked(monkeypatch):
+    monkeypatch.setattr(event_store, "_checked_migrations", set())
+
+
+def migrated(existing=()):
+    def handler(sql, params):
+        if "schema_migrations" in sql:
+            return [(1,)]
+        if "content_hash IN" in sql:
+            return [(h,) for h in params if h in existing]
+    return FakeConnection(handler)
+
+
+def test_content_hash_matches_sql_formula():
+    expected = hashlib.sha1("CU\x1f1+1\x1fhttp://img/a.jpg".encode("utf-8")).hexdigest()
+    assert event_store.event_hash(event()) == expected
+    # CONCAT_WS 처럼 NULL 은 건너뜀
+    assert event_store.content_hash("CU", None, "u") == hashlib.sha1(b"CU\x1fu").hexdigest()
+
+
+def test_save_events_inserts_only_new_unique_events():
+    stored = event(title="old")
+    conn = migrated(existing={event_store.event_hash(stored)})
+    saved = event_store.save_events(conn, [event(), event(), stored, event(title="new", idx=7)], chunk_size=1)
+
+    assert [e["event_title"] for e in saved] == ["1+1", "new"]
+    inserts = [(sql, params) for sql, params in conn.executed if sql.startswith("INSERT")]
+    assert len(inserts) == 2 and all("ON DUPLICATE KEY" in sql for sql, _ in inserts)
+    assert inserts[0][1][5] == 0 and inserts[1][1][5] == 7  # idx 가 없으면 0
+    assert inserts[1][1][-1] == event_store.event_hash(saved[1])
+    assert conn.commits == 1
+
+
+def test_save_events_refuses_unmigrated_database():
+    def handler(sql, params):
+        raise pymysql.err.ProgrammingError(1146, "Table 'crawling.schema_migrations' doesn't exist")
+
+    with pytest.raises(event_store.SchemaNotReady, match="migrate.py"):
+        event_store.save_events(FakeConnection(handler), [event()])
+    with pytest.raises(event_store.SchemaNotReady):
+        event_store.check_schema(FakeConnection(lambda sql, params: []))
+
+
+def test_schema_is_checked_once_per_process():
+    conn = migrated()
+    event_store.check_schema(conn)
+    event_store.check_schema(conn)
+    assert len(conn.executed) == 1
+
+
+def test_gs25_hash_includes_normalized_dates():
+    reopened = event(store="GS25", start="2024.11.01", end="2024.11.30")
+    first = event(store="GS25", start="2024.10.01", end="2024.10.31")
+    assert event_store.event_hash(first) != event_store.event_hash(reopened)
+    # 크롤러의 2024.10.01 과 DB 에서 읽은 date 가 같은 해시
+    assert event_store.event_hash(first) == event_store.content_hash(
+        "GS25", "1+1", "http://img/a.jpg", datetime.date(2024, 10, 1), datetime.date(2024, 10, 31))
+    expected = hashlib.sha1("GS25\x1f1+1\x1fhttp://img/a.jpg\x1f2024-10-01\x1f2024-10-31".encode()).hexdigest()
+    assert event_store.event_hash(first) == expected
+    # 날짜를 쓰지 않는 편의점은 기간이 달라도 같은 이벤트
+    assert event_store.event_hash(event(start="2024-11-01")) == event_store.event_hash(event())
+
+
+def test_dated_hash_migration_rebuilds_gs25_hashes():
+    path = next(p for v, _, p in migrate.discover() if v == "0006")
+    spec = importlib.util.spec_from_file_location("migration_0006", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert set(module.DATED_STORES) == event_store.DATED_STORES
+
+    conn = FakeConnection(lambda sql, params: [("h", 3)] if sql.startswith("SELECT content_hash") else [])
+    module.upgrade(conn)
+    statements = conn.sql()
+    assert statements[0].startswith("DROP INDEX uq_event_img_content_hash")
+    assert "REPLACE(LEFT(start_date, 10), '.', '-')" in statements[1] and conn.executed[1][1] == ["GS25"]
+    assert conn.executed[3] == ("UPDATE event_img SET content_hash = NULL WHERE content_hash = %s "
+                                "ORDER BY start_date DESC LIMIT 2", ("h",))
+    assert statements[-1].startswith("CREATE UNIQUE INDEX")
@@ -0,0 +1,69 @@
+import pytest
+
+import extract
+from tests.pyony import card, page
+
+
+@pytest.fixture(params=["lxml", "bs4"])
+def backend(request, monkeypatch):
+    if request.param == "bs4":
+        monkeypatch.setattr(extract, "lxml", None)
+    return request.param
+
+
+def test_pyony_cards(backend):
+    html = page(card("10.05", "우유 <b>1L</b>", price="1,500원"),
+                card("10.04", "빵", event_price="", badge="2+1", brand_class="bg-gs25"))
+    items = extract.extract_items(html, extract.pyony_card_spec("CU"))
+    assert items == [
+        {"update_date": "10.05", "title": "우유1L", "price": "1,500원", "event_price": "(750원)", "plus_type": "1+1"},
+        {"update_date": "10.04", "title": "빵", "price": "1,500원", "event_price": "", "plus_type": None},
+    ]
+    assert extract.extract_items("<html><body></body></html>", extract.pyony_card_spec("CU")) == []
+
+
+def test_empty_document_has_no_items(backend):
+    assert extract.extract_items("", extract.pyony_card_spec("CU")) == []
+
+
+def test_lxml_input_errors_are_not_treated_as_empty_document():
+    if extract.lxml is None:
+        pytest.skip("lxml 없음")
+    html = '<?xml version="1.0" encoding="utf-8"?>' + page(card("10.05", "우유"))
+    # 빈 결과로 돌려주면 plus 크롤링이 마지막 페이지로 보고 checkpoint 를 지움
+    with pytest.raises(ValueError):
+        extract.extract_items(html, extract.pyony_card_spec("CU"))
+
+
+def test_nested_items_are_not_counted_twice(backend):
+    html = page('<div class="col-md-6"><strong>바깥</strong><div class="col-md-6"><strong>안</strong></div></div>')
+    assert [item["title"] for item in extract.extract_items(html, extract.pyony_card_spec("CU"))] == ["바깥"]
+
+
+def test_cu_news_view(backend):
+    html = ('<table><thead><tr><th> 1+1 행사 </th></tr></thead><tbody><tr>'
+            '<td colspan="2"><img border="0" src="/upload/event.jpg"></td></tr></tbody></table>')
+    assert extract.extract_one(html, extract.CU_NEWS_VIEW) == {"event_title": "1+1 행사",
+                                                               "img_url": "/upload/event.jpg"}
+    assert extract.extract_one("<p>없는 공지</p>", extract.CU_NEWS_VIEW) == {"event_title": None, "img_url": None}
+
+
+def test_gs25_list_and_detail(backend):
+    html = ('<div class="tblwrap"><table><tbody>'
+            '<tr><td class="ft_lt"><a href="/event/1">행사 A</a></td><td>2024.10.01 ~ 2024.10.31</td></tr>'
+            '</tbody></table></div>')
+    assert extract.extract_items(html, extract.GS25_EVENT_LIST) == [
+        {"href": "/event/1", "title": "행사 A", "row_text": "행사 A2024.10.01 ~ 2024.10.31"}]
+
+    detail = ('<div class="tit_sect"><h3 class="tit"><strong>행사 A</strong></h3></div>'
+              '<span id="event-start-date">2024-10-01</span><span id="event-end-date">2024-10-31</span>'
+              '<div class="event-web-contents"><p><img src="https://img/a.jpg"></p></div>')
+    assert extract.extract_one(detail, extract.GS25_EVENT_DETAIL) == {
+        "title": "행사 A", "start_date": "2024-10-01", "end_date": "2024-10-31", "img_url": "https://img/a.jpg"}
+
+
+def test_fingerprint_changes_with_values():
+    items = [{"a": "1", "b": None}]
+    assert extract.fingerprint(items) == extract.fingerprint([{"a": "1", "b": ""}])
+    assert extract.fingerprint(items) != extract.fingerprint([{"a": "1", "b": "2"}])
+    assert extract.fingerprint([{"a": "12"}]) != extract.fingerprint([{"a": "1"}, {"a": "2"}])
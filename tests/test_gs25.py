@@ -0,0 +1,65 @@
+import pytest
+import requests
+
+from tests.fakes import FakeConnection
+
+
+def html_response(url, html, status=200):
+    response = requests.Response()
+    response.status_code = status
+    response._content = html.encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+LIST_HTML = ('<div class="tblwrap"><table><tbody>'
+             '<tr><td class="ft_lt"><a href="/event/1">A</a></td><td>2024.10.01 ~ 2024.10.31</td></tr>'
+             '<tr><td class="ft_lt"><a href="javascript:goDetail(2)">B</a></td><td>2024.10.02 ~ 2024.10.30</td></tr>'
+             '<tr><td class="ft_lt"><a href="/event/3">C</a></td><td>2024.10.03 ~ 2024.10.29</td></tr>'
+             '</tbody></table></div>')
+DETAIL_HTML = ('<div class="tit_sect"><h3 class="tit"><strong>A</strong></h3></div>'
+               '<div class="event-web-contents"><img src="/img/a.jpg"></div>')
+
+
+@pytest.fixture
+def gs25(import_crawler, monkeypatch):
+    module = import_crawler("GS25_schedule")
+    pages = {module.base_url: LIST_HTML, "http://gs25.gsretail.com/event/1": DETAIL_HTML,
+             "http://gs25.gsretail.com/event/3": "<p>준비 중</p>"}
+    monkeypatch.setattr(module.http_client, "get", lambda url, **kwargs: html_response(url, pages[url]))
+    module.selenium_rows = []
+    module.saved = []
+
+    def selenium(rows=None):
+        module.selenium_rows.append(rows)
+        return [{"이벤트 제목": f"selenium {i}"} for i in rows or []]
+    monkeypatch.setattr(module, "scrape_gs25_events_selenium", selenium)
+    monkeypatch.setattr(module, "save_to_db", module.saved.extend)
+    monkeypatch.setattr(module, "connect_db", lambda: FakeConnection(lambda sql, params: [(1,)]))
+    monkeypatch.setattr(module.event_store, "_checked_migrations", set())
+    return module
+
+
+def test_detail_url_and_list_dates(gs25):
+    assert gs25.detail_url("/event/1") == "http://gs25.gsretail.com/event/1"
+    assert gs25.detail_url("javascript:void(0)") is None and gs25.detail_url("#") is None
+    assert gs25.list_dates("행사 2024.10.01 ~ 2024-10-31") == ("2024.10.01", "2024-10-31")
+    assert gs25.list_dates("기간 없음") == (None, None)
+
+
+def test_http_first_with_selenium_only_for_unreadable_rows(gs25):
+    gs25.scrape_gs25_events()
+    assert gs25.saved[0] == {"이벤트 제목": "A", "이벤트 시작 날짜": "2024.10.01", "이벤트 끝 날짜": "2024.10.31",
+                             "이미지 주소": "http://gs25.gsretail.com/img/a.jpg", "편의점": "GS25"}
+    # javascript: 링크(1) 와 상세 페이지를 읽지 못한 행(2) 만 Selenium 으로
+    assert gs25.selenium_rows == [[1, 2]]
+    assert [e["이벤트 제목"] for e in gs25.saved[1:]] == ["selenium 1", "selenium 2"]
+
+
+def test_falls_back_to_selenium_when_list_fails(gs25, monkeypatch):
+    def fail(url, **kwargs):
+        raise requests.ConnectionError("down")
+    monkeypatch.setattr(gs25.http_client, "get", fail)
+    gs25.scrape_gs25_events()
+    assert gs25.selenium_rows == [None]
@@ -0,0 +1,107 @@
+import http.server
+import threading
+
+import pytest
+
+import crawl_metrics
+import http_client
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = http_client.MetadataStore(str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(http_client, "metadata_store", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def server():
+    hits = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append((self.path, self.headers.get("If-None-Match")))
+            if self.path == "/flaky" and len([h for h in hits if h[0] == "/flaky"]) < 3:
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = "안녕".encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.hits = hits
+    srv.url = f"http://127.0.0.1:{srv.server_port}"
+    yield srv
+    srv.shutdown()
+    http_client.close_all()
+
+
+def test_etag_revalidation_returns_cached_body(store, server):
+    first = http_client.get(server.url + "/page")
+    assert first.status_code == 200 and not first.not_modified
+    second = http_client.get(server.url + "/page")
+    assert second.status_code == 200 and second.not_modified
+    assert second.text == "안녕"
+    assert server.hits == [("/page", None), ("/page", '"v1"')]
+
+    third = http_client.get(server.url + "/page", conditional=False)
+    assert not third.not_modified and server.hits[-1] == ("/page", None)
+
+
+def test_retries_retryable_status_with_backoff(store, server, monkeypatch):
+    slept = []
+    monkeypatch.setattr(crawl_metrics, "sleep", slept.append)
+    response = http_client.get(server.url + "/flaky")
+    assert response.status_code == 200
+    assert slept == [0, 0]  # Retry-After: 0
+    assert [path for path, _ in server.hits] == ["/flaky"] * 3
+
+
+def test_backoff_is_capped():
+    for attempt in range(20):
+        assert 0 <= http_client._backoff(attempt) <= http_client.BACKOFF_MAX
+
+
+def test_prune_drops_expired_and_least_recently_used(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(http_client.time, "time", lambda: now[0])
+    store = http_client.MetadataStore(str(tmp_path / "cache.sqlite3"), max_entries=2, ttl_days=1)
+    for i in range(4):
+        store.put(f"u{i}", f"e{i}", None, "utf-8", b"x")
+        now[0] += 60
+    store.touch("u0")  # 다시 쓴 항목은 최근 항목
+    now[0] += 60
+
+    assert store.prune() == 2
+    assert store.get("u0") and store.get("u3")
+    assert store.get("u1") is None and store.get("u2") is None
+
+    now[0] += 2 * 86400
+    assert store.prune() == 2 and store.get("u0") is None
+    store.close()
+
+
+def test_put_prunes_periodically(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_client, "PRUNE_EVERY", 5)
+    store = http_client.MetadataStore(str(tmp_path / "cache.sqlite3"), max_entries=3)
+    for i in range(5):
+        store.put(f"u{i}", "e", None, "utf-8", b"x")
+    count = store._connect().execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+    assert count == 3
+    store.close()
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+import app as app_module
+import event_images
+from tests.fakes import FakeConnection
+
+image_route = sys.modules["routes.image_route"]
+
+SHA = "ab" + "0" * 62
+KNOWN = "https://cdn.example.com/event.jpg"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_images, "IMAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(image_route, "IMAGE_DIR", str(tmp_path))
+    return app_module.app.test_client()
+
+
+def use_db(monkeypatch, thumbs=(), known=()):
+    def handler(sql, params):
+        if "FROM event_image" in sql:
+            return [(SHA,)] if params[0] in {event_images.url_hash(u) for u in thumbs} else []
+        if "FROM event_img" in sql:
+            return [(1,)] if params[0] in known else []
+    conn = FakeConnection(handler)
+    monkeypatch.setattr(image_route, "get_db_connection", lambda: conn)
+    return conn
+
+
+def write_thumb():
+    os.makedirs(os.path.dirname(event_images.thumb_path(SHA)))
+    with open(event_images.thumb_path(SHA), "wb") as f:
+        f.write(b"\xff\xd8jpeg")
+
+
+def test_lookup_refuses_unknown_urls(client, monkeypatch):
+    conn = use_db(monkeypatch, known={KNOWN})
+    response = client.get("/images/lookup?url=https://evil.example.com/")
+    assert response.status_code == 404
+    assert conn.closed
+    assert client.get("/images/lookup?url=javascript:alert(1)").status_code == 400
+
+
+def test_lookup_redirects_known_url_until_thumbnail_exists(client, monkeypatch):
+    use_db(monkeypatch, known={KNOWN})
+    response = client.get(f"/images/lookup?url={KNOWN}")
+    assert response.status_code == 302 and response.headers["Location"] == KNOWN
+    assert response.headers["Cache-Control"] == image_route.PENDING_CACHE
+
+    write_thumb()
+    conn = use_db(monkeypatch, thumbs={KNOWN})
+    response = client.get(f"/images/lookup?url={KNOWN}")
+    assert response.headers["Location"].endswith(f"/images/thumb/{SHA}.jpg")
+    assert not any("FROM event_img " in sql for sql in conn.sql())
+
+
+def test_thumb_is_served_immutable(client):
+    write_thumb()
+    response = client.get(f"/images/thumb/{SHA}.jpg")
+    assert response.status_code == 200 and response.headers["Cache-Control"] == image_route.IMMUTABLE_CACHE
+    assert client.get("/images/thumb/../../etc.jpg").status_code == 404
+    assert client.get(f"/images/thumb/{'cd' * 32}.jpg").status_code == 404
@@ -0,0 +1,49 @@
+from flask import Flask
+
+import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = metrics.Histogram("t_seconds", "test", ("route",), (0.1, 1))
+    for value in (0.05, 0.5, 5):
+        hist.observe(value, "/a")
+    lines = hist.render()
+    assert 't_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 't_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 't_seconds_count{route="/a"} 3' in lines
+
+
+def test_label_values_are_escaped():
+    counter = metrics.Counter("t_total", "test", ("route",))
+    counter.inc('a"b\n')
+    assert 't_total{route="a\\"b\\n"} 1' in counter.render()
+
+
+def test_slow_query_is_counted_and_logged(monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "SLOW_QUERY_MS", 10)
+    before = metrics.db_slow_queries._series.get(("-",), 0)
+    with caplog.at_level("WARNING", logger="db.slow_query"):
+        metrics.observe_query("SELECT   1\n FROM x", 0.05)
+    assert metrics.db_slow_queries._series[("-",)] == before + 1
+    assert "SELECT 1 FROM x" in caplog.text
+
+
+def test_init_metrics_records_route_template():
+    app = Flask(__name__)
+    metrics.init_metrics(app)
+
+    @app.route("/items/<int:item_id>")
+    def item(item_id):
+        return "ok"
+
+    app.test_client().get("/items/7")
+    assert ("app", "/items/<int:item_id>", "GET", "200") in metrics.request_duration._series
+
+
+def test_gauge_callback_errors_are_skipped():
+    metrics.register_gauges("t_pool", "test", lambda: {"idle": 3, "name": "x"})
+    metrics.register_gauges("t_broken", "test", lambda: 1 / 0)
+    text = metrics.render_prometheus()
+    assert "t_pool_idle 3" in text and "t_pool_name" not in text
+    metrics._gauge_callbacks[:] = [g for g in metrics._gauge_callbacks if not g[0].startswith("t_")]
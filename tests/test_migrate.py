@@ -0,0 +1,75 @@
+import pymysql
+import pytest
+
+import date_utils
+import migrate
+from tests.fakes import FakeConnection
+
+
+def test_day_range_and_invalid_dates():
+    assert date_utils.day_range("2024-02-29") == ("2024-02-29", "2024-03-01")
+    assert date_utils.day_range("2024-12-31") == ("2024-12-31", "2025-01-01")
+    with pytest.raises(ValueError):
+        date_utils.day_range("2024-02-30")
+    assert date_utils.is_valid_date("2024-10-02")
+    assert not date_utils.is_valid_date("2023-02-29")
+
+
+def test_split_statements_skips_comments():
+    sql = "-- 설명; 무시\nCREATE TABLE a (x INT);\n\n  -- 다음\nCREATE INDEX i ON a (x);\n"
+    assert migrate.split_statements(sql) == ["CREATE TABLE a (x INT)", "CREATE INDEX i ON a (x)"]
+
+
+def test_repository_migrations_are_numbered_in_order():
+    versions = [version for version, _, _ in migrate.discover()]
+    assert versions == sorted(versions) and len(versions) == len(set(versions))
+
+
+@pytest.fixture
+def migrations_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrate, "MIGRATIONS_DIR", str(tmp_path))
+    (tmp_path / "0001_first.sql").write_text("CREATE TABLE a (x INT);\nCREATE INDEX i ON a (x);")
+    (tmp_path / "0002_second.py").write_text(
+        "def upgrade(conn):\n    with conn.cursor() as cursor:\n        cursor.execute('UPDATE a SET x = 1')\n")
+    (tmp_path / "README.md").write_text("not a migration")
+    return tmp_path
+
+
+def test_discover_rejects_duplicate_versions(migrations_dir):
+    (migrations_dir / "0002_other.sql").write_text("SELECT 1;")
+    with pytest.raises(RuntimeError, match="0002"):
+        migrate.discover()
+
+
+def test_migrate_applies_pending_files_in_order(migrations_dir):
+    def handler(sql, params):
+        if sql == "SELECT version FROM schema_migrations":
+            return [("0001",)]
+        return []
+
+    conn = FakeConnection(handler)
+    assert migrate.migrate(conn) == ["0002_second.py"]
+    statements = conn.sql()
+    assert "UPDATE a SET x = 1" in statements
+    assert not any(s.startswith("CREATE TABLE a") for s in statements)
+    assert conn.executed[-1][1][:2] == ("0002", "0002_second.py")
+    assert conn.commits == 1
+
+
+def test_apply_tolerates_existing_objects_and_rolls_back_failures(migrations_dir):
+    def exists(sql, params):
+        if sql.startswith("CREATE INDEX"):
+            raise pymysql.err.OperationalError(1061, "Duplicate key name 'i'")
+
+    conn = FakeConnection(exists)
+    migrate.apply(conn, "0001", "0001_first.sql", str(migrations_dir / "0001_first.sql"))
+    assert conn.commits == 1 and conn.sql()[-1].startswith("INSERT INTO schema_migrations")
+
+    def broken(sql, params):
+        if sql.startswith("CREATE TABLE"):
+            raise pymysql.err.ProgrammingError(1064, "syntax error")
+
+    conn = FakeConnection(broken)
+    with pytest.raises(pymysql.err.ProgrammingError):
+        migrate.apply(conn, "0001", "0001_first.sql", str(migrations_dir / "0001_first.sql"))
+    assert conn.rollbacks == 1 and conn.commits == 0
@@ -0,0 +1,98 @@
+import datetime
+import hashlib
+import threading
+
+import pytest
+import requests
+
+import checkpoint
+from tests.fakes import FakeConnection
+from tests.pyony import card, page
+
+
+@pytest.fixture
+def plus(import_crawler, monkeypatch, tmp_path):
+    module = import_crawler("plus_schedule")
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", str(tmp_path))
+    conn = FakeConnection(lambda sql, params: [(datetime.date(2024, 10, 1),)] if "MAX(update_date)" in sql else [])
+    monkeypatch.setattr(module.pymysql, "connect", lambda **kwargs: conn)
+    module.conn = conn
+    module.pages = {}
+    module.requested = []
+    lock = threading.Lock()
+
+    def fetch_page(url):
+        number = int(url.rsplit("=", 1)[1])
+        with lock:
+            module.requested.append(number)
+        result = module.pages.get(number, page())
+        if isinstance(result, Exception):
+            raise result
+        return result
+    monkeypatch.setattr(module, "fetch_page", fetch_page)
+    return module
+
+
+def inserted_rows(conn, with_hash=False):
+    return [row if with_hash else row[:-1]
+            for sql, rows in conn.executed if "INTO event_plus" in sql for row in rows]
+
+
+def test_crawl_stops_at_stored_date_and_prefetches(plus):
+    plus.pages[1] = page(card("2024-10-05", "우유"), card("2024-10-04", "빵"))
+    plus.pages[2] = page(card("2024-10-03", "과자", event_price=""), card("2024-10-01", "이미 저장"))
+    plus.run_crawling("CU")
+
+    assert inserted_rows(plus.conn) == [
+        ("CU", "2024-10-05", "우유", 1500, 750, "1+1"),
+        ("CU", "2024-10-04", "빵", 1500, 750, "1+1"),
+        ("CU", "2024-10-03", "과자", 1500, 0, "1+1"),
+    ]
+    assert set(range(1, 2 + plus.PREFETCH_PAGES + 1)) >= set(plus.requested) >= {1, 2, 3}
+    assert checkpoint.load("plus_CU") is None
+
+
+def test_crawl_stops_on_repeated_page(plus):
+    plus.pages[1] = plus.pages[2] = page(card("2024-10-05", "우유"))
+    plus.run_crawling("CU")
+    assert len(inserted_rows(plus.conn)) == 1
+
+
+def test_failed_request_keeps_checkpoint(plus, monkeypatch):
+    monkeypatch.setattr(plus, "FLUSH_EVERY", 2)
+    plus.pages[1] = page(card("2024-10-05", "우유"), card("2024-10-04", "빵"))
+    plus.pages[2] = requests.ConnectionError("down")
+    plus.run_crawling("CU")
+
+    assert len(inserted_rows(plus.conn)) == 2
+    assert checkpoint.load("plus_CU")["latest_update_date"] == "2024-10-01"
+
+
+def test_resume_recrawls_from_first_page_with_checkpoint_date(plus):
+    # 지난 실행이 10-05 까지 저장하고 멈춤 → DB 의 MAX(update_date) 는 10-05 지만 기준 날짜는 10-01
+    checkpoint.save("plus_CU", {"latest_update_date": "2024-10-01"})
+    plus.conn.handler = lambda sql, params: [(datetime.date(2024, 10, 5),)] if "MAX" in sql else []
+    # 그 사이 새 상품이 올라와 목록이 한 칸씩 밀림
+    plus.pages[1] = page(card("2024-10-06", "새 상품"), card("2024-10-05", "저장됨"))
+    plus.pages[2] = page(card("2024-10-04", "남은 상품"), card("2024-10-01", "기준"))
+    plus.run_crawling("CU")
+
+    assert min(plus.requested) == 1
+    assert [row[2] for row in inserted_rows(plus.conn)] == ["새 상품", "저장됨", "남은 상품"]
+    sql = next(sql for sql in plus.conn.sql() if "event_plus" in sql and "INSERT" in sql)
+    assert "INSERT IGNORE" in sql
+    row = inserted_rows(plus.conn, with_hash=True)[0]
+    assert row[-1] == plus.row_hash(row[:-1])
+    assert checkpoint.load("plus_CU") is None
+
+
+def test_row_hash_matches_sql_formula(plus):
+    row = ("CU", "2024-10-05", "우유", 1500, 750, "1+1")
+    assert plus.row_hash(row) == hashlib.sha1("CU\x1f2024-10-05\x1f우유\x1f1500\x1f750\x1f1+1".encode()).hexdigest()
+
+
+def test_refuses_to_crawl_before_row_hash_migration(plus, monkeypatch):
+    monkeypatch.setattr(plus.event_store, "_checked_migrations", set())
+    monkeypatch.setattr(plus, "check_brand", lambda brand: pytest.fail("crawled without row_hash"))
+    with pytest.raises(plus.event_store.SchemaNotReady, match="0007"):
+        plus.check_and_run_crawling()
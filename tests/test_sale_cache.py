@@ -0,0 +1,68 @@
+import pytest
+from flask import Flask, jsonify
+
+import sale_cache
+from tests.fakes import FakeConnection
+
+
+@pytest.fixture
+def state(monkeypatch):
+    state = {"version": (10, 0), "calls": 0, "status": 200}
+
+    def handler(sql, params):
+        return [state["version"]]
+    monkeypatch.setattr(sale_cache, "get_db_connection", lambda: FakeConnection(handler))
+    monkeypatch.setattr(sale_cache, "VERSION_TTL", 0)
+    sale_cache.invalidate()
+    yield state
+    sale_cache.invalidate()
+
+
+@pytest.fixture
+def client(state):
+    app = Flask(__name__)
+
+    @app.route("/data")
+    @sale_cache.cached_sale_response
+    def data():
+        state["calls"] += 1
+        return jsonify({"calls": state["calls"]}), state["status"]
+    return app.test_client()
+
+
+def test_version_query_avoids_full_count():
+    assert "COUNT(" not in sale_cache.VERSION_SQL.upper()
+    assert "MAX(id_sale)" in sale_cache.VERSION_SQL
+
+
+def test_cached_response_and_304(client, state):
+    first = client.get("/data")
+    assert first.status_code == 200 and first.headers["ETag"]
+    assert client.get("/data").get_json() == {"calls": 1}  # 캐시에서
+
+    revalidated = client.get("/data", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert state["calls"] == 1
+
+
+def test_counter_bump_changes_etag(client, state):
+    etag = client.get("/data").headers["ETag"]
+    state["version"] = (10, 1)  # 같은 MAX(id_sale), 수정 카운터만 증가
+    response = client.get("/data", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+    assert state["calls"] == 2
+
+
+def test_error_responses_get_no_validators(client, state):
+    state["status"] = 500
+    response = client.get("/data")
+    assert response.status_code == 500
+    assert "ETag" not in response.headers and "Last-Modified" not in response.headers
+    assert client.get("/data").status_code == 500
+    assert state["calls"] == 2  # 오류는 캐시하지 않음
+
+
+def test_bump_table_version(fake_conn):
+    sale_cache.bump_table_version(fake_conn)
+    sql, params = fake_conn.executed[0]
+    assert "version = version + 1" in sql and params == ("all_sale",)
@@ -0,0 +1,38 @@
+import datetime
+import json
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_export_returns_503_before_streaming_when_db_is_down(client, monkeypatch):
+    monkeypatch.setattr(app_module, "get_db_connection", lambda: None)
+    response = client.get("/sale/export")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "error"
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/sale/export?format=xml").status_code == 400
+
+
+def test_export_streams_ndjson_and_csv(client, monkeypatch, fake_conn):
+    rows = [(datetime.date(2024, 1, 1), 100), (datetime.date(2024, 1, 2), 200)]
+    monkeypatch.setattr(app_module, "get_db_connection", lambda: fake_conn)
+    monkeypatch.setattr(app_module, "iter_sale_rows", lambda conn, columns, filters: iter([rows]))
+
+    response = client.get("/sale/export?columns=sale_date,sum_amount")
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines == [{"sale_date": "2024-01-01", "sum_amount": 100}, {"sale_date": "2024-01-02", "sum_amount": 200}]
+    assert fake_conn.closed and not fake_conn.invalidated
+
+    response = client.get("/sale/export?format=csv&columns=sale_date,sum_amount")
+    assert response.get_data(as_text=True).splitlines() == ["sale_date,sum_amount", "2024-01-01,100",
+                                                            "2024-01-02,200"]
@@ -0,0 +1,67 @@
+import datetime
+
+import pytest
+
+import sale_query
+from sale_query import SaleQueryError
+
+
+def test_cursor_round_trip():
+    cursor = sale_query.encode_cursor(datetime.date(2024, 3, 1), 42)
+    assert sale_query.decode_cursor(cursor) == (datetime.date(2024, 3, 1), 42)
+
+
+@pytest.mark.parametrize("bad", ["", "!!!", "bm90LWEtY3Vyc29y"])
+def test_decode_cursor_rejects_garbage(bad):
+    with pytest.raises(SaleQueryError):
+        sale_query.decode_cursor(bad)
+
+
+def test_parse_columns_validates_and_dedupes():
+    assert sale_query.parse_columns("sale_date, sum_amount,sale_date") == ["sale_date", "sum_amount"]
+    assert sale_query.parse_columns("") == sale_query.SALE_COLUMNS
+    with pytest.raises(SaleQueryError):
+        sale_query.parse_columns("sale_date,password")
+
+
+def test_parse_filters_rejects_reversed_range():
+    with pytest.raises(SaleQueryError):
+        sale_query.parse_filters({"start_date": "2024-03-02", "end_date": "2024-03-01"})
+
+
+def test_parse_limit_caps_and_validates():
+    assert sale_query.parse_limit(None) == sale_query.DEFAULT_LIMIT
+    assert sale_query.parse_limit("999999") == sale_query.MAX_LIMIT
+    for bad in ("0", "abc"):
+        with pytest.raises(SaleQueryError):
+            sale_query.parse_limit(bad)
+
+
+def test_page_query_uses_keyset_after_cursor():
+    after = (datetime.date(2024, 3, 1), 42)
+    sql, params = sale_query.build_page_query(["sum_amount"], {"store_type": ["CU", "GS25"]}, after, limit=10)
+    assert "store_type IN (%s, %s)" in sql
+    assert "(sale_date > %s OR (sale_date = %s AND id_sale > %s))" in sql
+    assert sql.endswith("ORDER BY sale_date, id_sale LIMIT %s")
+    assert params == ["CU", "GS25", after[0], after[0], 42, 11]
+
+
+def test_finish_page_trims_helper_columns_and_sets_cursor():
+    # columns=["sum_amount"] → SELECT sum_amount, sale_date, id_sale
+    rows = [(100, datetime.date(2024, 3, 1), 1), (200, datetime.date(2024, 3, 1), 2),
+            (300, datetime.date(2024, 3, 2), 3)]
+    page, next_cursor = sale_query.finish_page(["sum_amount"], rows, limit=2)
+    assert page == [(100,), (200,)]
+    assert sale_query.decode_cursor(next_cursor) == (datetime.date(2024, 3, 1), 2)
+
+
+def test_finish_page_last_page_has_no_cursor():
+    page, next_cursor = sale_query.finish_page(sale_query.SALE_COLUMNS, [tuple(range(19))], limit=5)
+    assert next_cursor is None and len(page) == 1
+
+
+def test_fetch_sale_page_runs_built_query(fake_conn):
+    fake_conn.handler = lambda sql, params: [(5, datetime.date(2024, 1, 1), 9)]
+    columns, rows, next_cursor = sale_query.fetch_sale_page(fake_conn, {"columns": "sum_amount", "limit": "5"})
+    assert columns == ["sum_amount"] and rows == [(5,)] and next_cursor is None
+    assert "FROM all_sale" in fake_conn.sql()[0]
@@ -0,0 +1,75 @@
+import pytest
+
+import app as app_module
+import sale_cache
+import sale_rollup
+from sale_query import SaleQueryError
+from tests.fakes import FakeConnection
+
+
+def rollup_db(last_id, new_max, new_rows):
+    def handler(sql, params):
+        if "FROM sale_rollup_state" in sql:
+            return [(last_id,)]
+        if sql.startswith("SELECT MAX(id_sale), COUNT(*)"):
+            return [(new_max, new_rows)]
+        return None
+    return FakeConnection(handler)
+
+
+def test_refresh_without_new_rows_only_reads():
+    conn = rollup_db(100, None, 0)
+    assert sale_rollup.refresh_rollups(conn) == 0
+    assert conn.commits == 0 and conn.rollbacks == 1
+    assert not any(sql.startswith(("INSERT", "UPDATE", "CREATE")) for sql in conn.sql())
+
+
+def test_refresh_adds_only_rows_after_watermark():
+    conn = rollup_db(100, 130, 30)
+    assert sale_rollup.refresh_rollups(conn) == 30
+    inserts = [(sql, params) for sql, params in conn.executed if sql.startswith("INSERT INTO sale_rollup")]
+    assert len(inserts) == len(sale_rollup.PERIODS)
+    assert all(params == (100, 130) for _, params in inserts)
+    assert conn.executed[-2] == ("UPDATE sale_rollup_state SET last_id_sale = %s WHERE name = 'all_sale'", (130,))
+    # 집계가 바뀌면 /sale/summary 캐시 키(all_sale 버전)도 같은 트랜잭션에서 바뀜
+    assert "UPDATE table_version" in conn.executed[-1][0]
+    assert conn.commits == 1
+
+
+def test_rebuild_bumps_cache_version():
+    conn = rollup_db(0, None, 0)
+    sale_rollup.rebuild_rollups(conn)
+    assert any("UPDATE table_version" in sql for sql in conn.sql())
+
+
+def test_rebuild_clears_and_refills_in_one_transaction():
+    conn = rollup_db(0, 130, 130)
+    assert sale_rollup.rebuild_rollups(conn) == 130
+    sqls = conn.sql()
+    assert sqls.index("DELETE FROM sale_rollup") < sqls.index(
+        "UPDATE sale_rollup_state SET last_id_sale = %s WHERE name = 'all_sale'")
+    assert sum("UPDATE table_version" in sql for sql in sqls) == 1
+    assert conn.commits == 1 and conn.rollbacks == 0
+
+
+def test_fetch_summary_validates_period_and_columns(fake_conn):
+    with pytest.raises(SaleQueryError):
+        sale_rollup.fetch_summary(fake_conn, {"period": "year"})
+    with pytest.raises(SaleQueryError):
+        sale_rollup.fetch_summary(fake_conn, {"columns": "sum_amount,password"})
+
+    columns, rows = sale_rollup.fetch_summary(fake_conn, {"period": "month", "store_type": "CU",
+                                                          "columns": "sum_amount"})
+    sql, params = fake_conn.executed[0]
+    assert columns == ["period_start", "store_type", "days", "sum_amount"]
+    assert params == ["month", "CU"]
+
+
+def test_summary_route_is_read_only(monkeypatch):
+    conn = FakeConnection(lambda sql, params: [])
+    monkeypatch.setattr(app_module, "get_db_connection", lambda: conn)
+    monkeypatch.setattr(sale_cache, "get_table_version", lambda: None)
+    response = app_module.app.test_client().get("/sale/summary?period=day")
+    assert response.status_code == 200
+    assert [sql.split()[0] for sql in conn.sql()] == ["SELECT"]
+    assert conn.commits == 0
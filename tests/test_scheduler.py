@@ -0,0 +1,108 @@
+import datetime
+
+import pytest
+
+import browser_pool
+import crawl_metrics
+import scheduler
+
+calls = []
+
+
+def work():
+    calls.append("work")
+
+
+def boom():
+    raise ValueError("bad page")
+
+
+def interrupt():
+    raise KeyboardInterrupt
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, "STATE_FILE", str(tmp_path / "state.json"))
+    monkeypatch.setattr(crawl_metrics, "CRAWL_METRICS_FILE", str(tmp_path / "metrics.jsonl"))
+    monkeypatch.setattr(crawl_metrics, "CRAWL_METRICS_PROM", str(tmp_path / "metrics.prom"))
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: high)
+    calls.clear()
+
+
+def at(hour, minute=0, day=2):
+    return datetime.datetime(2024, 10, day, hour, minute)
+
+
+def make(jobs, now):
+    class Clock(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+    original = scheduler.datetime.datetime
+    scheduler.datetime.datetime = Clock
+    try:
+        return scheduler.Scheduler(jobs)
+    finally:
+        scheduler.datetime.datetime = original
+
+
+def test_last_occurrence():
+    assert scheduler.last_occurrence("11:30", at(12)) == at(11, 30)
+    assert scheduler.last_occurrence("11:30", at(11, 30)) == at(11, 30)
+    assert scheduler.last_occurrence("11:30", at(9)) == at(11, 30, day=1)
+
+
+def test_due_after_jitter_and_only_once():
+    jobs = {"a": {"target": "tests.test_scheduler:work", "at": "10:00", "jitter": 60, "catch_up": 3600}}
+    s = make(jobs, at(9))
+    assert s.due_jobs(at(9, 59)) == []
+    assert s.due_jobs(at(10, 0)) == []  # 지터 60초
+    assert s.due_jobs(at(10, 1)) == [("a", at(10))]
+    s._mark_scheduled("a", at(10))
+    assert s.due_jobs(at(10, 2)) == []
+
+
+def test_missed_run_outside_catch_up_is_skipped():
+    jobs = {"a": {"target": "tests.test_scheduler:work", "at": "10:00", "catch_up": 3600}}
+    s = make(jobs, at(9, day=1))
+    assert s.due_jobs(at(10, 30)) == [("a", at(10))]  # 하루 늦었지만 catch_up 안에는 오늘 실행분만
+    s = make(jobs, at(9, day=1))
+    assert s.due_jobs(at(11, 30)) == []
+    assert s.state["a"]["scheduled"] == at(10).isoformat()
+
+
+def test_overlap_and_resource_limits(monkeypatch):
+    jobs = {"a": {"target": "tests.test_scheduler:work", "at": "10:00", "resources": ["browser"]},
+            "b": {"target": "tests.test_scheduler:work", "at": "10:00", "resources": ["browser"]}}
+    s = make(jobs, at(9))
+    monkeypatch.setattr(s._executor, "submit", lambda fn, name: None)  # 실행은 하지 않고 자리만 차지
+    assert s.submit("a", at(10))
+    assert not s.submit("b", at(10))  # browser 1개 제한
+    assert s.state["b"]["scheduled"] != at(10).isoformat()  # 다음 tick 에 다시 시도
+    assert not s.submit("a", at(10, day=3))  # 아직 돌고 있는 작업은 겹쳐 실행하지 않음
+    assert s.state["a"]["scheduled"] == at(10, day=3).isoformat()
+
+
+def test_run_records_status_and_frees_resources(monkeypatch):
+    # browser 자원을 잡아도 작업이 lease() 하기 전에는 Chrome 을 띄우지 않음
+    monkeypatch.setattr(browser_pool, "_launch", lambda: pytest.fail("Chrome 을 미리 띄우면 안 됨"))
+    jobs = {"ok": {"target": "tests.test_scheduler:work", "at": "10:00", "resources": ["browser"]},
+            "bad": {"target": "tests.test_scheduler:boom", "at": "10:00"}}
+    s = make(jobs, at(9))
+    s._running.add("ok")
+    s._resources["browser"] = 1
+    s._run("ok")
+    assert calls == ["work"] and s.state["ok"]["status"] == "ok"
+    assert s._resources["browser"] == 0 and "ok" not in s._running
+
+    s._run("bad")
+    assert s.state["bad"]["status"] == "error" and s.state["bad"]["error"] == "ValueError: bad page"
+
+
+def test_run_does_not_swallow_keyboard_interrupt():
+    s = make({"stop": {"target": "tests.test_scheduler:interrupt", "at": "10:00"}}, at(9))
+    s._running.add("stop")
+    with pytest.raises(KeyboardInterrupt):
+        s._run("stop")
+    assert "stop" not in s._running
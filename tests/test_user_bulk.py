@@ -0,0 +1,80 @@
+import io
+
+import pymysql
+import pytest
+
+import app as app_module
+import user_bulk
+from tests.fakes import FakeConnection
+
+
+def load(**kwargs):
+    with app_module.app.test_request_context("/api/user/add-users", method="POST", **kwargs):
+        from flask import request
+        return user_bulk.load_users(request)
+
+
+def test_load_users_from_json_and_csv():
+    df = load(json={"users": [{"id": " a ", "pw": "1", "nick": "n", "address": "서울"}]})
+    assert df.to_dict("records") == [{"id": "a", "pw": "1", "nick": "n", "type": "", "addr": "서울"}]
+    assert list(df.index) == [1]
+
+    csv = "﻿id,pw,nick,addr\nb,2,m,부산\n".encode("utf-8")
+    df = load(data={"file": (io.BytesIO(csv), "users.csv")}, content_type="multipart/form-data")
+    assert df.loc[1, "id"] == "b" and df.loc[1, "addr"] == "부산"
+
+
+def test_load_users_rejects_bad_payloads(monkeypatch):
+    with pytest.raises(user_bulk.BulkUserError):
+        load(json={"users": "nope"})
+    monkeypatch.setattr(user_bulk, "MAX_BULK_USERS", 1)
+    with pytest.raises(user_bulk.BulkUserError):
+        load(json=[{"id": "a"}, {"id": "b"}])
+
+
+def test_validate_users_reports_first_error_per_row():
+    df = load(json=[
+        {"id": "a", "pw": "1", "nick": "n", "addr": "x"},
+        {"id": "", "pw": "1", "nick": "n", "addr": "x"},
+        {"id": "a", "pw": "1", "nick": "n", "addr": "x"},
+        {"id": "z", "pw": "", "nick": "n", "addr": "x"},
+        {"id": "taken", "pw": "1", "nick": "n", "addr": "x"},
+    ])
+    valid, errors = user_bulk.validate_users(df, {"taken"})
+    assert list(valid.index) == [1]
+    assert [(e["row"], e["error"]) for e in errors] == [
+        (2, "id 값이 비어 있습니다."),
+        (3, "요청 안에서 아이디가 중복됩니다."),
+        (4, "pw 값이 비어 있습니다."),
+        (5, "이미 사용 중인 아이디입니다."),
+    ]
+
+
+
+def test_validate_users_compares_ids_case_insensitively():
+    df = load(json=[
+        {"id": "Abc", "pw": "1", "nick": "n", "addr": "x"},
+        {"id": "abc", "pw": "1", "nick": "n", "addr": "x"},
+        {"id": "TAKEN", "pw": "1", "nick": "n", "addr": "x"},
+    ])
+    valid, errors = user_bulk.validate_users(df, {"taken"})
+    assert list(valid.index) == [1]
+    assert [(e["row"], e["error"]) for e in errors] == [
+        (2, "요청 안에서 아이디가 중복됩니다."),
+        (3, "이미 사용 중인 아이디입니다."),
+    ]
+
+def test_insert_users_retries_failed_chunk_row_by_row():
+    df = load(json=[{"id": i, "pw": "1", "nick": "n", "addr": "x"} for i in ["a", "b", "bad", "c"]])
+
+    def handler(sql, params):
+        if "bad" in params:
+            raise pymysql.err.IntegrityError(1062, "Duplicate entry 'bad'")
+
+    conn = FakeConnection(handler)
+    inserted, errors = user_bulk.insert_users(conn, df, chunk_size=2)
+    assert inserted == 3
+    assert errors == [{"row": 3, "id": "bad", "error": "(1062, \"Duplicate entry 'bad'\")"}]
+    # 첫 chunk 는 한 문장, 두 번째 chunk 는 실패 후 한 행씩
+    assert [sql.count("md5") for sql in conn.sql()] == [2, 2, 1, 1]
+    assert conn.commits == 2 and conn.rollbacks == 2
@@ -0,0 +1,70 @@
+import sys
+
+import pytest
+
+import app as app_module
+import user_cache
+from tests.fakes import FakeConnection
+
+user_route = sys.modules["routes.user_route"]
+
+
+def test_lru_evicts_least_recently_used():
+    cache = user_cache.LRUCache(max_size=2, ttl=60)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    assert cache.get(1) == (True, "a")  # 1 을 최근 사용으로
+    cache.put(3, "c")
+    assert cache.get(2) == (False, None)
+    assert cache.get_many([1, 3, 4]) == ({1: "a", 3: "c"}, [4])
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 3, "misses": 2}
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(user_cache.time, "monotonic", lambda: now[0])
+    cache = user_cache.LRUCache(max_size=10, ttl=5)
+    cache.put("k", 1)
+    now[0] = 104.0
+    assert cache.get("k") == (True, 1)
+    now[0] = 106.0
+    assert cache.get("k") == (False, None)
+    assert cache.stats()["size"] == 0
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = user_cache.LRUCache(max_size=100, ttl=60)
+    monkeypatch.setattr(user_route, "user_cache", fresh)
+    return fresh
+
+
+def test_detail_users_queries_only_cache_misses(cache, monkeypatch):
+    cache.put(1, {"user_idx": 1, "nick": "a"})
+    conn = FakeConnection(lambda sql, params: [{"user_idx": i, "nick": str(i)} for i in params if i != 3])
+    monkeypatch.setattr(user_route, "get_db_connection", lambda: conn)
+
+    response = app_module.app.test_client().get("/api/user/detail-users?user_idx=2,1,3,2")
+    body = response.get_json()
+    assert [u["user_idx"] for u in body["users"]] == [2, 1]
+    assert body["not_found"] == [3]
+    assert conn.executed == [("SELECT * FROM user WHERE user_idx IN (%s,%s)", [2, 3])]
+    assert conn.closed
+    assert cache.get(2) == (True, {"user_idx": 2, "nick": "2"})
+
+
+def test_detail_users_validates_input(cache):
+    client = app_module.app.test_client()
+    assert client.get("/api/user/detail-users?user_idx=1,x").status_code == 400
+    too_many = ",".join(str(i) for i in range(user_route.MAX_BATCH_USERS + 1))
+    assert client.get(f"/api/user/detail-users?user_idx={too_many}").status_code == 400
+
+
+def test_detail_users_post_requires_bounded_list(cache, monkeypatch):
+    monkeypatch.setattr(user_route, "get_db_connection", lambda: pytest.fail("DB 를 조회하면 안 됨"))
+    client = app_module.app.test_client()
+    assert client.post("/api/user/detail-users", json={"user_idx": "123"}).status_code == 400
+    assert client.post("/api/user/detail-users", json=[1, 2]).status_code == 400
+    # 중복이어도 요청 길이 자체를 제한
+    repeated = [1] * (user_route.MAX_BATCH_USERS + 1)
+    assert client.post("/api/user/detail-users", json={"user_idx": repeated}).status_code == 400
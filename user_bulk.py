@@ -0,0 +1,115 @@
+import io
+
+import pandas as pd
+
+# 필수 입력값 (회원가입 화면과 같은 기준)
+REQUIRED_FIELDS = ["id", "pw", "nick", "addr"]
+USER_FIELDS = ["id", "pw", "nick", "type", "addr"]
+
+# 한 번에 받을 수 있는 최대 행 수 / INSERT 한 문장에 넣을 행 수
+MAX_BULK_USERS = 20000
+INSERT_CHUNK_SIZE = 500
+
+
+class BulkUserError(ValueError):
+    """일괄 가입 요청 자체가 잘못됨 (형식 오류, 행 수 초과 등)"""
+
+
+def load_users(request):
+    """JSON 배열(또는 {"users": [...]}) 이나 업로드한 CSV(file)를 DataFrame 으로 읽음"""
+    if "file" in request.files:
+        try:
+            df = pd.read_csv(io.BytesIO(request.files["file"].read()), dtype=str, keep_default_na=False,
+                             encoding="utf-8-sig")
+        except (ValueError, UnicodeDecodeError) as e:
+            raise BulkUserError(f"CSV 를 읽을 수 없습니다: {e}")
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get("users")
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise BulkUserError("회원 목록은 JSON 배열이나 CSV 파일로 보내야 합니다.")
+        df = pd.DataFrame(data, dtype=object)
+
+    if len(df) > MAX_BULK_USERS:
+        raise BulkUserError(f"한 번에 최대 {MAX_BULK_USERS}명까지 등록할 수 있습니다.")
+
+    # 주소 컬럼은 단건 가입 API 와 같은 addr / address 둘 다 허용
+    if "address" in df.columns:
+        if "addr" in df.columns:
+            df["addr"] = df["addr"].where(df["addr"].notna() & (df["addr"] != ""), df["address"])
+        else:
+            df = df.rename(columns={"address": "addr"})
+    for field in USER_FIELDS:
+        if field not in df.columns:
+            df[field] = ""
+    df = df[USER_FIELDS].fillna("").astype(str).apply(lambda col: col.str.strip())
+    df.index = range(1, len(df) + 1)  # 오류 보고용 행 번호 (1부터)
+    return df
+
+
+def validate_users(df, existing_ids):
+    """전체 행을 한 번에 검사 → (통과한 행 DataFrame, 행별 오류 리스트)"""
+    reasons = pd.Series("", index=df.index)
+
+    for field in REQUIRED_FIELDS:
+        reasons = reasons.mask((df[field] == "") & (reasons == ""), f"{field} 값이 비어 있습니다.")
+
+    # user.id 는 기본 collation(대소문자 무시)으로 비교되므로 Abc / abc 도 같은 아이디로 봄
+    folded = df["id"].str.casefold()
+    duplicated = folded.duplicated(keep="first") & (df["id"] != "")
+    reasons = reasons.mask(duplicated & (reasons == ""), "요청 안에서 아이디가 중복됩니다.")
+
+    taken = folded.isin({str(i).casefold() for i in existing_ids})
+    reasons = reasons.mask(taken & (reasons == ""), "이미 사용 중인 아이디입니다.")
+
+    failed = reasons != ""
+    errors = [{"row": int(row), "id": df.at[row, "id"], "error": reason}
+              for row, reason in reasons[failed].items()]
+    return df[~failed], errors
+
+
+def find_existing_ids(conn, ids, chunk_size=1000):
+    existing = set()
+    with conn.cursor() as cursor:
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            placeholders = ",".join(["%s"] * len(chunk))
+            cursor.execute(f"SELECT id FROM user WHERE id IN ({placeholders})", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+
+def insert_users(conn, df, chunk_size=INSERT_CHUNK_SIZE):
+    """여러 행 INSERT 를 chunk 단위 트랜잭션으로 실행 → (등록 수, 행별 오류 리스트)
+
+    chunk 가 실패하면 그 chunk 만 한 행씩 다시 넣어서 어떤 행이 문제인지 찾는다.
+    """
+    inserted = 0
+    errors = []
+    row_sql = "(%s,md5(%s),%s,%s,%s,sysdate())"
+    rows = list(df[USER_FIELDS].itertuples(index=True, name=None))
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        sql = "INSERT INTO user (id,pw,nick,type,address,created_date) VALUES " + ",".join([row_sql] * len(chunk))
+        params = [value for row in chunk for value in row[1:]]
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+            conn.commit()
+            inserted += len(chunk)
+        except Exception:
+            conn.rollback()
+            for row in chunk:
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute("INSERT INTO user (id,pw,nick,type,address,created_date) VALUES " + row_sql,
+                                       row[1:])
+                    conn.commit()
+                    inserted += 1
+                except Exception as e:
+                    conn.rollback()
+                    errors.append({"row": int(row[0]), "id": row[1], "error": str(e)})
+
+    return inserted, errors
@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+# 캐시에 둘 최대 회원 수 / 항목 유효 시간(초)
+USER_CACHE_SIZE = 10000
+USER_CACHE_TTL = 300
+
+
+class LRUCache:
+    """크기 제한(LRU)과 만료 시간(TTL)이 있는 스레드 안전 캐시"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _get_locked(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if expires_at < now:
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def get(self, key):
+        """(찾음 여부, 값)"""
+        with self._lock:
+            found, value = self._get_locked(key, time.monotonic())
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+            return found, value
+
+    def get_many(self, keys):
+        """({key: 값}, 캐시에 없는 key 리스트)"""
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                ok, value = self._get_locked(key, now)
+                if ok:
+                    found[key] = value
+                else:
+                    missing.append(key)
+            self._hits += len(found)
+            self._misses += len(missing)
+        return found, missing
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._data), "max_size": self.max_size, "hits": self._hits, "misses": self._misses}
+
+
+user_cache = LRUCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+metrics.register_gauges("user_cache", "회원 캐시 상태", user_cache.stats)